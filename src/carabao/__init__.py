@@ -1,43 +1,51 @@
-from .constants import C
-from .core import Core
-from .form import F, Field, Form
-from .settings import Settings
-
-try:
-    from .constants import mongo
-
-except Exception:
-    pass
-
-try:
-    from .constants import redis
-
-except Exception:
-    pass
-
-try:
-    from .constants import es
-
-except Exception:
-    pass
-
-try:
-    from .constants import pg
+# First, so STARTUP_PROFILE can time the other imports.
+from .profiler import startup_profiler
+
+startup_profiler.install_from_environ()
+
+from typing import TYPE_CHECKING  # noqa: E402
+
+from . import constants as _constants  # noqa: E402
+from .constants import C as C  # noqa: E402
+from .core import Core  # noqa: E402
+from .form import F, Field, Form  # noqa: E402
+from .settings import Settings  # noqa: E402
+
+if TYPE_CHECKING:
+    from .constants import aes as aes
+    from .constants import amongo as amongo
+    from .constants import apg as apg
+    from .constants import aredis as aredis
+    from .constants import es as es
+    from .constants import mongo as mongo
+    from .constants import pg as pg
+    from .constants import pgpool as pgpool
+    from .constants import redis as redis
+
+_HUBS = (
+    "mongo",
+    "redis",
+    "es",
+    "pg",
+    "pgpool",
+    "amongo",
+    "aredis",
+    "apg",
+    "aes",
+)
 
-except Exception:
-    pass
 
-try:
-    from .constants import amongo
+def __getattr__(name: str):
+    # The hubs are imported on first access; see `carabao.constants`.
+    if name in _HUBS:
+        value = getattr(_constants, name, None)
 
-except Exception:
-    pass
+        if value is not None:
+            globals()[name] = value
 
-try:
-    from .constants import aredis
+            return value
 
-except Exception:
-    pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def start():
@@ -55,13 +63,9 @@ __all__ = [
     "Core",
     "Settings",
     "start",
-    "mongo",
-    "redis",
-    "es",
-    "pg",
-    "amongo",
-    "aredis",
     "Field",
     "F",
     "Form",
 ]
+# Only the hubs whose drivers are installed; see `carabao.constants`.
+__all__ += [name for name in _HUBS if name in _constants.__all__]
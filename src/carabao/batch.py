@@ -0,0 +1,216 @@
+"""Size- and time-bounded micro-batching.
+
+``BatchLane``/``AsyncBatchLane`` collect the values the previous lane yields
+and hand the next lane lists of up to ``BATCH_SIZE`` of them. A partial list is
+handed over once an item arrives more than ``BATCH_MAX_WAIT`` seconds after the
+list's first one, and whatever is left once the previous lane is done::
+
+    from carabao.batch import BatchLane
+
+
+    class Articles(BatchLane):
+        pass
+
+
+    class Main(Lane):
+        lanes = {
+            1: Payloads,
+            2: Articles,
+            3: BulkWrite,  # process(self, value) gets a list
+        }
+
+The same grouping is available for any iterable with ``batched``/``abatched``.
+"""
+
+from abc import ABC
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from l2l import AsyncLane, Lane
+
+from .constants import C
+
+
+class _BatchLimit(int):
+    """
+    A ``process_mode`` that also cuts a batch short on time.
+
+    l2l groups a lane's input in lists of ``process_mode`` items, checking
+    ``count < process_mode`` as each one arrives, and hands over the last,
+    partial list once the input ends. As an ``int``, this is ``size``; the
+    check is also false once the list's first item has waited ``max_wait``
+    seconds.
+    """
+
+    max_wait: Optional[float]
+    started: float
+
+    def __new__(cls, size: int, max_wait: Optional[float] = None):
+        limit = super().__new__(cls, max(size, 1))
+        limit.max_wait = max_wait if max_wait and max_wait > 0 else None
+        limit.started = 0.0
+
+        return limit
+
+    def full(self, count: int):
+        """
+        Whether a list of ``count`` items is handed over, checked as its last
+        item arrives.
+        """
+
+        if count <= 1:
+            self.started = monotonic()
+
+        if count >= int(self):
+            return True
+
+        return self.max_wait is not None and monotonic() - self.started >= self.max_wait
+
+    def __gt__(self, count):
+        # `count < limit` is evaluated as `limit > count`.
+        if isinstance(count, int):
+            return not self.full(count)
+
+        return super().__gt__(count)
+
+
+def batched(
+    iterable: Iterable[Any],
+    size: int,
+    max_wait: Optional[float] = None,
+) -> Iterator[List[Any]]:
+    """
+    Groups an iterable's items into lists of up to ``size`` items.
+
+    Args:
+        iterable: The items to group.
+        size: The maximum number of items per list.
+        max_wait: A partial list is yielded once an item arrives this many
+            seconds after the list's first one. None or 0 only yields full
+            lists (and the last one).
+
+    Yields:
+        List[Any]: The next group of items.
+    """
+
+    limit = _BatchLimit(size, max_wait)
+    batch: List[Any] = []
+
+    for item in iterable:
+        batch.append(item)
+
+        if limit.full(len(batch)):
+            yield batch
+
+            batch = []
+
+    if batch:
+        yield batch
+
+
+async def abatched(
+    iterable: Union[AsyncIterable[Any], Iterable[Any]],
+    size: int,
+    max_wait: Optional[float] = None,
+) -> AsyncIterator[List[Any]]:
+    """
+    Groups an (async) iterable's items into lists of up to ``size`` items.
+
+    The async counterpart of ``batched``.
+
+    Args:
+        iterable: The items to group; a sync iterable is read as is.
+        size: The maximum number of items per list.
+        max_wait: A partial list is yielded once an item arrives this many
+            seconds after the list's first one. None or 0 only yields full
+            lists (and the last one).
+
+    Yields:
+        List[Any]: The next group of items.
+    """
+
+    if not isinstance(iterable, AsyncIterable):
+        for items in batched(iterable, size, max_wait):
+            yield items
+
+        return
+
+    limit = _BatchLimit(size, max_wait)
+    batch: List[Any] = []
+
+    async for item in iterable:
+        batch.append(item)
+
+        if limit.full(len(batch)):
+            yield batch
+
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class BatchLane(Lane, ABC):
+    """
+    Hands the next lane the previous lane's values in lists.
+
+    Each list holds up to ``batch_size()`` items, or fewer once an item arrives
+    ``max_wait()`` seconds after the list's first one; the rest are handed over
+    once the previous lane is done. Override ``process`` to transform a list
+    (it returns it as is). Being an ``ABC``, the base class itself isn't
+    registered as a lane.
+    """
+
+    # Each item must reach the same list, not a thread of its own.
+    multiprocessing = False
+
+    @classmethod
+    def batch_size(cls) -> int:
+        """The maximum number of items per list. Defaults to BATCH_SIZE."""
+
+        return int(C.BATCH_SIZE)
+
+    @classmethod
+    def max_wait(cls) -> float:
+        """The longest a partial list waits, in seconds. Defaults to
+        BATCH_MAX_WAIT."""
+
+        return float(C.BATCH_MAX_WAIT)
+
+    def init(self):
+        # Per instance, as it tracks when its current list started.
+        self.process_mode = _BatchLimit(self.batch_size(), self.max_wait())
+
+
+class AsyncBatchLane(AsyncLane, ABC):
+    """
+    Hands the next lane the previous lane's values in lists.
+
+    The async counterpart of ``BatchLane``.
+    """
+
+    @classmethod
+    def batch_size(cls) -> int:
+        """The maximum number of items per list. Defaults to BATCH_SIZE."""
+
+        return int(C.BATCH_SIZE)
+
+    @classmethod
+    def max_wait(cls) -> float:
+        """The longest a partial list waits, in seconds. Defaults to
+        BATCH_MAX_WAIT."""
+
+        return float(C.BATCH_MAX_WAIT)
+
+    def init(self):
+        # Per instance, as it tracks when its current list started.
+        self.process_mode = _BatchLimit(self.batch_size(), self.max_wait())
@@ -1,6 +1,7 @@
 import os
 import re
 import sys
+from typing import Optional
 
 import typer
 from typing_extensions import Annotated
@@ -56,6 +57,14 @@ def dev(
             help="Run the pipeline in testing mode.",
         ),
     ] = None,  # type: ignore
+    watch: Annotated[
+        bool,
+        typer.Option(
+            "--watch",
+            "-W",
+            help="Reload changed lanes and run them again (overrides HOT_RELOAD).",
+        ),
+    ] = None,  # type: ignore
 ):
     """
     Run the pipeline in development mode.
@@ -65,6 +74,7 @@ def dev(
 
     Args:
         name: The name of the lane to run.
+        watch: Whether to reload changed lanes without restarting.
     """
 
     sys.path.insert(0, os.getcwd())
@@ -76,6 +86,7 @@ def dev(
             name=name,
             dev_mode=True,
             test_mode=cfg_test_mode,
+            hot_reload=watch,
         )
 
         return
@@ -167,44 +178,53 @@ def dev(
 
     # Run the program again.
 
-    if result.ui:
+    options = dict(
+        name=result.name,
+        dev_mode=True,
+        test_mode=result.test_mode,
+        single_run=result.single_run,
+        sleep_min=result.sleep_min,
+        sleep_max=result.sleep_max,
+        processes=result.processes,
+        hot_reload=watch,
+    )
+    lanes = [result.lane]
+    use_ui = result.ui
+    log_file = result.log_file
+
+    # The selected lane class would outlive a hot reload of its module.
+    del result, _form
+
+    if use_ui:
         from .cmd_dev.ui import UI
 
-        UI(
+        ui = UI(
             runner=lambda: Core.start(
-                name=result.name,
-                dev_mode=True,
-                test_mode=result.test_mode,
+                **options,
                 exit_on_finish=False,
-                single_run=result.single_run,
-                sleep_min=result.sleep_min,
-                sleep_max=result.sleep_max,
-                processes=result.processes,
             ),
-            title=result.name,
-            lanes=[result.lane],
-            test_mode=result.test_mode,
-            log_file=result.log_file,
-        ).run()
+            title=options["name"],
+            lanes=lanes,
+            test_mode=options["test_mode"],
+            log_file=log_file,
+        )
+
+        del lanes
+
+        ui.run()
     else:
         # No UI — still stream to the log file if the toggle is on.
         stream = None
 
-        if result.log_file:
+        if log_file:
             from .log_stream import FileLogStream, next_log_path
 
             stream = FileLogStream(next_log_path()).start()
 
+        del lanes
+
         try:
-            Core.start(
-                name=result.name,
-                dev_mode=True,
-                test_mode=result.test_mode,
-                single_run=result.single_run,
-                sleep_min=result.sleep_min,
-                sleep_max=result.sleep_max,
-                processes=result.processes,
-            )
+            Core.start(**options)
         finally:
             if stream is not None:
                 stream.stop()
@@ -221,17 +241,30 @@ def run(
             is_eager=False,
         ),
     ] = "",
+    workers: Annotated[
+        Optional[int],
+        typer.Option(
+            "--workers",
+            "-w",
+            help="The number of forked worker processes (overrides WORKERS).",
+        ),
+    ] = None,
 ):
     """
     Run the pipeline in production mode.
 
     This starts the Core with the default settings suitable for production.
+
+    Args:
+        name: The name of the lane to run.
+        workers: The number of forked worker processes.
     """
 
     sys.path.insert(0, os.getcwd())
     Core.start(
         name=name if name else None,
         dev_mode=False,
+        workers=workers,
     )
 
 
@@ -942,6 +942,9 @@ class UI(App):
             except Exception:
                 pass
 
+        # Laid out; a hot reload must not find the old classes held here.
+        self._structure_lanes = []
+
         self._render_tree()
 
     def _add_struct_node(self, lane_cls, parent_entry, siblings, seen):
@@ -1,51 +1,165 @@
-from ._constants import C, Constants
+"""The constants and the database hubs.
+
+The hubs are imported on first access — ``from carabao.constants import mongo``
+or ``constants.mongo`` — so an app only pays for the drivers it uses. A hub
+whose driver isn't installed is unavailable, as if it weren't defined:
+importing it raises ``ImportError``, and ``getattr(constants, "mongo", None)``
+is None.
+"""
+
+import importlib
+import sys
+import types
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ._constants import C as C
+from ._constants import Constants as Constants
+
+if TYPE_CHECKING:
+    from .async_elasticsearch import AsyncESMeta as AsyncESMeta
+    from .async_elasticsearch import aes as aes
+    from .async_mongo import AsyncMongoHubMeta as AsyncMongoHubMeta
+    from .async_mongo import amongo as amongo
+    from .async_postgres import APGPool as APGPool
+    from .async_postgres import AsyncPGHubMeta as AsyncPGHubMeta
+    from .async_postgres import apg as apg
+    from .async_redis import AsyncRedisHubMeta as AsyncRedisHubMeta
+    from .async_redis import aredis as aredis
+    from .elasticsearch import ESMeta as ESMeta
+    from .elasticsearch import es as es
+    from .mongo import MongoMeta as MongoMeta
+    from .mongo import mongo as mongo
+    from .mongo_bulk import MongoBulkWriter as MongoBulkWriter
+    from .mongo_bulk import MongoWriteError as MongoWriteError
+    from .pg_copy import CopyReader as CopyReader
+    from .pg_copy import copy_rows as copy_rows
+    from .pg_copy import upsert_rows as upsert_rows
+    from .postgres import PGMeta as PGMeta
+    from .postgres import PGPool as PGPool
+    from .postgres import PGPoolMeta as PGPoolMeta
+    from .postgres import pg as pg
+    from .postgres import pgpool as pgpool
+    from .redis import RedisMeta as RedisMeta
+    from .redis import redis as redis
+
+# Submodule -> what it exports here.
+_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    "mongo": ("MongoMeta", "mongo"),
+    "mongo_bulk": ("MongoBulkWriter", "MongoWriteError"),
+    "redis": ("RedisMeta", "redis"),
+    "elasticsearch": ("ESMeta", "es"),
+    "postgres": ("PGMeta", "PGPool", "PGPoolMeta", "pg", "pgpool"),
+    "pg_copy": ("CopyReader", "copy_rows", "upsert_rows"),
+    "async_mongo": ("AsyncMongoHubMeta", "amongo"),
+    "async_redis": ("AsyncRedisHubMeta", "aredis"),
+    "async_postgres": ("APGPool", "AsyncPGHubMeta", "apg"),
+    "async_elasticsearch": ("AsyncESMeta", "aes"),
+}
+
+# Submodule -> the drivers it needs, checked without importing them.
+_DRIVERS: Dict[str, Tuple[str, ...]] = {
+    "mongo": ("pymongo",),
+    "mongo_bulk": ("pymongo",),
+    "redis": ("redis",),
+    "elasticsearch": ("elasticsearch",),
+    "postgres": ("psycopg2",),
+    "pg_copy": ("psycopg2",),
+    "async_mongo": ("pymongo",),
+    "async_redis": ("redis",),
+    "async_postgres": ("asyncpg",),
+    "async_elasticsearch": ("elasticsearch", "aiohttp"),
+}
+
+_MODULES: Dict[str, str] = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
+
+# Submodules whose import failed; they stay unavailable.
+_FAILED: Dict[str, BaseException] = {}
+
+
+def _installed(module: str):
+    try:
+        return all(
+            find_spec(driver) is not None
+            for driver in ("fun_things", *_DRIVERS[module])
+        )
+
+    except Exception:
+        return False
+
 
 __all__ = ["C", "Constants"]
+__all__ += [
+    name
+    for module, names in _EXPORTS.items()
+    if _installed(module)
+    for name in names
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _MODULES.get(name)
+
+    if module_name is None or module_name in _FAILED:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        importlib.import_module(f"{__name__}.{module_name}")
+
+    except Exception as e:
+        _FAILED[module_name] = e
+
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r} ({e})"
+        ) from e
 
-try:
-    from .mongo import MongoMeta, mongo
+    # Bound by the submodule's import; see `_Package.__setattr__`.
+    return globals()[name]
 
-    __all__ += ["MongoMeta", "mongo"]
 
-except Exception:
-    pass
+def __dir__():
+    return sorted({*globals(), *__all__})
 
-try:
-    from .redis import RedisMeta, redis
 
-    __all__ += ["RedisMeta", "redis"]
+def loaded(name: str) -> Optional[Any]:
+    """
+    The hub (or other export) ``name``, only if it was imported already.
 
-except Exception:
-    pass
+    Used by the cleanup code, which shouldn't import a driver just to find
+    that there's nothing to close.
+    """
 
-try:
-    from .elasticsearch import ESMeta, es
+    value = globals().get(name)
 
-    __all__ += ["ESMeta", "es"]
+    if name not in _MODULES or isinstance(value, types.ModuleType):
+        return None
 
-except Exception:
-    pass
+    return value
 
-try:
-    from .postgres import PGMeta, pg
 
-    __all__ += ["PGMeta", "pg"]
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any):
+        # Importing a submodule binds it here, under its own name — which for
+        # `mongo` and `redis` is also the hub's. Bind its exports instead.
+        if (
+            name in _EXPORTS
+            and isinstance(value, types.ModuleType)
+            and value.__name__ == f"{self.__name__}.{name}"
+        ):
+            super().__setattr__(name, value)
 
-except Exception:
-    pass
+            for export in _EXPORTS[name]:
+                super().__setattr__(export, getattr(value, export))
 
-try:
-    from .async_mongo import AsyncMongoHubMeta, amongo
+            return
 
-    __all__ += ["AsyncMongoHubMeta", "amongo"]
+        super().__setattr__(name, value)
 
-except Exception:
-    pass
 
-try:
-    from .async_redis import AsyncRedisHubMeta, aredis
+sys.modules[__name__].__class__ = _Package
 
-    __all__ += ["AsyncRedisHubMeta", "aredis"]
+from ._fork import register as _register_fork_hooks  # noqa: E402
 
-except Exception:
-    pass
+_register_fork_hooks()
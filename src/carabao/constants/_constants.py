@@ -1,19 +1,32 @@
 import os
 import re
-from typing import Any, Callable, TypeVar
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Set, Tuple, TypeVar
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 from fun_things import lazy, undefined
 from fun_things.environment import env
 
 T = TypeVar("T")
 
+# Cached values that are derived from other variables (or cached values), as
+# the patterns of what they're derived from; see `reload_env`.
+_DERIVED: Dict[str, Tuple[str, ...]] = {
+    "POD_INDEX": ("POD_NAME",),
+    "IN_KUBERNETES": ("*KUBERNETES*",),
+    "TESTING": ("DEPLOY_SAFELY", "IN_KUBERNETES"),
+    "QUEUE_NAMES": ("QUEUE_NAME",),
+}
+
 
 @lazy
 class Constants:
     __env = False
     __values = {}
     __custom = {}
+    # Set by the env files (not by the process environment).
+    __env_keys: Set[str] = set()
+    loaded_env_files: List[str] = []
 
     def __call__(
         self,
@@ -100,21 +113,108 @@ class Constants:
 
         cls.loaded_env_files = []
 
-        from ..core import Core
-
-        is_dev = Core.is_dev()
-
-        for filepath in (
-            ".env.development" if is_dev else ".env.release",
-            ".env",
-        ):
+        for filepath in cls.env_files():
             if not os.path.exists(filepath):
                 continue
 
+            before = set(os.environ)
+
             load_dotenv(filepath)
 
+            cls.__env_keys.update(os.environ.keys() - before)
             cls.loaded_env_files.append(filepath)
 
+    @classmethod
+    def reload_env(cls):
+        """
+        Reads the env files again, then forgets the cached values of the
+        variables that changed, so those resolve again on their next access.
+
+        The variables the files had set are replaced (or removed, if the files
+        don't set them anymore); the process' own environment and the
+        ``C[key] = value`` overrides keep precedence. The other cached values
+        are kept as they are, so a property read meanwhile (from another
+        thread) never sees a half-loaded environment.
+
+        Returns:
+            Set[str]: The variables that changed.
+        """
+
+        cls.load_env()
+
+        # Like load_env: the first file setting a variable wins.
+        values: Dict[str, str] = {}
+        loaded_env_files: List[str] = []
+
+        for filepath in cls.env_files():
+            if not os.path.exists(filepath):
+                continue
+
+            for key, value in dotenv_values(filepath).items():
+                if value is not None:
+                    values.setdefault(key, value)
+
+            loaded_env_files.append(filepath)
+
+        changed: Set[str] = set()
+
+        for key in [*cls.__env_keys]:
+            if key not in values:
+                os.environ.pop(key, None)
+                cls.__env_keys.discard(key)
+                changed.add(key)
+
+        for key, value in values.items():
+            # Set by the process environment, not by a file.
+            if key in os.environ and key not in cls.__env_keys:
+                continue
+
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+                changed.add(key)
+
+            cls.__env_keys.add(key)
+
+        cls.loaded_env_files = loaded_env_files
+
+        stale = set(changed)
+
+        # Until nothing else depends on what's stale.
+        while True:
+            derived = {
+                key
+                for key, patterns in _DERIVED.items()
+                if key not in stale
+                and any(
+                    fnmatchcase(name.upper(), pattern)
+                    for name in stale
+                    for pattern in patterns
+                )
+            }
+
+            if not derived:
+                break
+
+            stale |= derived
+
+        for key in stale:
+            cls.__values.pop(key, None)
+
+        return changed
+
+    @classmethod
+    def env_files(cls):
+        """
+        The env files ``load_env`` reads, whether they exist or not.
+        """
+
+        from ..core import Core
+
+        return (
+            ".env.development" if Core.is_dev() else ".env.release",
+            ".env",
+        )
+
     def load_all_properties(self):
         """
         Loads all property functions to ensure that all environment variables
@@ -198,6 +298,62 @@ class Constants:
 
         return value
 
+    @property
+    def WORKERS(self):
+        """
+        The number of worker processes ``moo run`` forks.
+
+        Returns:
+            int: Number of workers, defaults to 1 (no forking).
+        """
+
+        key = "WORKERS"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=int,
+            default=1,
+        )
+
+        return value
+
+    @property
+    def WORKER_INDEX(self):
+        """
+        The ordinal of this worker process among the forked workers.
+
+        Set by the supervisor in each child; like POD_INDEX, but per process.
+
+        Returns:
+            int: The worker ordinal, or 0 when not forked.
+        """
+
+        key = "WORKER_INDEX"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=int,
+            default=0,
+        )
+
+        return value
+
     @property
     def DEPLOY_SAFELY(self):
         """
@@ -463,6 +619,35 @@ class Constants:
 
         return value
 
+    @property
+    def QUEUE_NAMES(self):
+        """
+        The names of the queues to process, parsed from QUEUE_NAME.
+
+        QUEUE_NAME may list several queues separated by commas or newlines,
+        and each entry may be a glob pattern (e.g. ``SYNC_*``) matched
+        against the primary lane names.
+
+        Returns:
+            list[str]: The queue names or patterns, empty if not specified.
+        """
+
+        key = "QUEUE_NAMES"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        queue_name = self.QUEUE_NAME
+
+        self.__values[key] = value = (
+            [] if queue_name is None else _parse_list(queue_name)
+        )
+
+        return value
+
     @property
     def BATCH_SIZE(self):
         """
@@ -490,6 +675,35 @@ class Constants:
 
         return value
 
+    @property
+    def BATCH_MAX_WAIT(self):
+        """
+        The longest a partial batch waits for more items before it is handed
+        downstream by a ``BatchLane``/``AsyncBatchLane``.
+
+        Returns:
+            float: Maximum wait in seconds, defaults to 1. 0 only hands over
+                full batches (and the last one).
+        """
+
+        key = "BATCH_MAX_WAIT"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=float,
+            default=1,
+        )
+
+        return value
+
     @property
     def SLEEP_MIN(self):
         """
@@ -544,6 +758,153 @@ class Constants:
 
         return value
 
+    @property
+    def PERSISTENT_LOOP(self):
+        """
+        Determines if async lanes share one long-lived event loop.
+
+        When enabled, the event loop and the async hubs (``amongo``,
+        ``aredis``) survive across loop iterations and are only closed when
+        the framework stops, instead of being rebuilt every iteration.
+
+        Returns:
+            bool: True to keep the event loop alive, defaults to False.
+        """
+
+        key = "PERSISTENT_LOOP"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=bool,
+            default=False,
+        )
+
+        return value
+
+    @property
+    def HOT_RELOAD(self):
+        """
+        Determines if ``moo dev`` re-imports the lane modules that change on
+        disk, then runs the queue again, without restarting.
+
+        Returns:
+            bool: True to watch the lane directories, defaults to False.
+        """
+
+        key = "HOT_RELOAD"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=bool,
+            default=False,
+        )
+
+        return value
+
+    @property
+    def SCHEDULER(self):
+        """
+        How the idle time between loop iterations is chosen.
+
+        ``uniform`` sleeps between SLEEP_MIN and SLEEP_MAX after every
+        iteration. ``adaptive`` loops again right after an iteration that did
+        work, and backs off exponentially from SLEEP_MIN to SLEEP_MAX while
+        idle.
+
+        Returns:
+            str: The scheduler name, defaults to "uniform".
+        """
+
+        key = "SCHEDULER"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=str,
+            default="uniform",
+        )
+
+        return value
+
+    @property
+    def BACKOFF_FACTOR(self):
+        """
+        The multiplier applied to the idle time after each empty iteration,
+        when SCHEDULER is "adaptive".
+
+        Returns:
+            float: The backoff multiplier, defaults to 2.
+        """
+
+        key = "BACKOFF_FACTOR"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=float,
+            default=2,
+        )
+
+        return value
+
+    @property
+    def BACKOFF_JITTER(self):
+        """
+        The random spread applied to each adaptive backoff, as a fraction of
+        the idle time. Seeded with POD_INDEX so pods drift apart.
+
+        Returns:
+            float: The jitter fraction, defaults to 0.1.
+        """
+
+        key = "BACKOFF_JITTER"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=float,
+            default=0.1,
+        )
+
+        return value
+
     @property
     def EXIT_ON_FINISH(self):
         """
@@ -598,6 +959,34 @@ class Constants:
 
         return value
 
+    @property
+    def SHUTDOWN_TIMEOUT(self):
+        """
+        How long a stopping worker may keep draining its current iteration
+        after a SIGTERM/SIGINT, before it is interrupted.
+
+        Returns:
+            float: Shutdown deadline in seconds, defaults to 25.
+        """
+
+        key = "SHUTDOWN_TIMEOUT"
+
+        if key in self.__custom:
+            return self.__custom[key]
+
+        if key in self.__values:
+            return self.__values[key]
+
+        self.load_env()
+
+        self.__values[key] = value = env(
+            key,
+            cast=float,
+            default=25,
+        )
+
+        return value
+
     @property
     def LANE_DIRECTORIES(self):
         """
@@ -691,17 +1080,22 @@ class Constants:
         return value
 
 
+def _parse_list(value: str):
+    """
+    Parses a comma/newline-separated list into a list of stripped items.
+    Empty entries are dropped.
+    """
+
+    return [item.strip() for item in re.split(r"[,\n]+", value) if item.strip()]
+
+
 def _parse_levels(value: str):
     """
     Parses a comma/newline-separated list of log level names into a list of
     upper-cased, stripped names. Empty entries are dropped.
     """
 
-    return [
-        item.strip().upper()
-        for item in re.split(r"[,\n]+", value)
-        if item.strip()
-    ]
+    return [item.upper() for item in _parse_list(value)]
 
 
 C = Constants()
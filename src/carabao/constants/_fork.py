@@ -0,0 +1,141 @@
+"""Fork safety for the hubs.
+
+A forked child inherits the parent's hub clients, but not safely: pymongo,
+psycopg2 and the async clients share sockets (and state) with the parent.
+``os.register_at_fork`` hooks drop them in the child, which then builds its own
+on first use. They are dropped, not closed — closing would end the parent's
+sessions on the shared sockets — and kept referenced, so they're never
+finalized either.
+
+With ``HUB_PREWARM``, the child rebuilds the sync clients the parent had, in a
+background thread right after the fork, so its first item doesn't wait for
+them.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, List
+
+from ._constants import C
+
+_HUBS = (
+    "mongo",
+    "redis",
+    "es",
+    "pg",
+    "pgpool",
+    "amongo",
+    "aredis",
+    "apg",
+    "aes",
+)
+
+# Only built again when prewarming; the async ones need the child's event loop.
+_SYNC_HUBS = (
+    "mongo",
+    "redis",
+    "es",
+    "pg",
+    "pgpool",
+)
+
+# The parent's clients, kept alive in the child so they're never finalized.
+_inherited: List[Any] = []
+
+_registered = False
+
+
+def register():
+    """
+    Installs the at-fork hook, once. A no-op where ``fork`` doesn't exist.
+    """
+
+    global _registered
+
+    if _registered or not hasattr(os, "register_at_fork"):
+        return
+
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+    _registered = True
+
+
+def _after_fork_in_child():
+    from carabao import constants
+
+    names: Dict[str, List[str]] = {}
+
+    for hub_name in _HUBS:
+        hub = constants.loaded(hub_name)
+
+        if hub is None:
+            continue
+
+        try:
+            names[hub_name] = _drop(hub)
+
+        except Exception:
+            pass
+
+        after_fork = getattr(hub, "_after_fork", None)
+
+        if after_fork is not None:
+            after_fork()
+
+    # Their threads didn't survive the fork.
+    for module_name, attribute in (
+        ("carabao.helpers.health", "health_monitor"),
+        ("carabao.helpers.kumander", "kumander"),
+    ):
+        module = sys.modules.get(module_name)
+
+        if module is not None:
+            getattr(module, attribute)._after_fork()
+
+    if C(
+        "HUB_PREWARM",
+        cast=bool,
+        default=False,
+    ):
+        threading.Thread(
+            target=_prewarm,
+            args=(names,),
+            name="carabao-prewarm",
+            daemon=True,
+        ).start()
+
+
+def _drop(hub) -> List[str]:
+    """Forgets a hub's clients without closing them.
+
+    Returns:
+        List[str]: The names they were built for.
+    """
+
+    # fun_things' singleton hubs keep them in these (unmangled) attributes.
+    values: Dict[str, Any] = getattr(hub, "__value_cache", None) or {}
+    keys: Dict[str, str] = getattr(hub, "__key_cache", None) or {}
+    names = [name for name, key in keys.items() if key in values]
+
+    _inherited.extend(values.values())
+    values.clear()
+
+    return names
+
+
+def _prewarm(names: Dict[str, List[str]]):
+    from carabao import constants
+
+    for hub_name in _SYNC_HUBS:
+        hub = constants.loaded(hub_name)
+
+        if hub is None:
+            continue
+
+        for name in names.get(hub_name, []):
+            try:
+                hub(name)
+
+            except Exception as e:
+                print(f"Failed to prewarm {hub_name}(`{name}`): {e}")
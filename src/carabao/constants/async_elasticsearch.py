@@ -0,0 +1,65 @@
+"""Async Elasticsearch hub (``aes``) for use inside ``AsyncLane`` lanes.
+
+Resolved from the same env vars as ``es``, with the same transport settings
+(``es._kwargs``) and background Kuma probe. The accessor is sync — only the
+operations are awaited::
+
+    hit = await aes("main").get(index="articles", id="1")
+
+Clients are closed via ``aes.clear_all()`` (an awaitable); the framework calls
+it inside the event loop when async lanes finish. Needs ``aiohttp``.
+"""
+
+import os
+from typing import Any, Dict
+
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from fun_things.singleton_hub import AsyncSingletonHubMeta
+
+from .elasticsearch import ESMeta, _parse_hosts, es
+
+
+class AsyncESMeta(ESMeta, AsyncSingletonHubMeta[AsyncElasticsearch]):  # type: ignore[misc]
+    """Async counterpart of :class:`ESMeta`.
+
+    Builds ``AsyncElasticsearch`` clients. Closing is a coroutine, so teardown
+    is the async ``clear`` / ``clear_all``, awaited inside the running event
+    loop.
+    """
+
+    def _value_selector(cls, name: str):  # type: ignore[override]
+        hosts = _parse_hosts(os.environ.get(name) or "")
+        kwargs = {**es._kwargs, **cls._kwargs}
+
+        client = AsyncElasticsearch(hosts=hosts, **kwargs)
+
+        # The probes run in the background, with their own sync clients.
+        cls._kuma_check(client, lambda: Elasticsearch(hosts=hosts, **kwargs))
+
+        if cls._logger:
+            cls._logger(f"Async Elasticsearch `{name}` instantiated.")
+
+        return client
+
+    def _on_clear(cls, key: str, value: AsyncElasticsearch) -> None:  # type: ignore[override]
+        # Closing is async — use clear/clear_all (see _aon_clear).
+        pass
+
+    async def _aon_clear(cls, key: str, value: AsyncElasticsearch) -> None:
+        try:
+            await value.close()
+
+        except Exception:
+            pass
+
+        if cls._logger:
+            cls._logger(f"Async Elasticsearch `{key}` closed.")
+
+
+class aes(metaclass=AsyncESMeta):
+    # Overrides on top of es._kwargs.
+    _kwargs: Dict[str, Any] = {}
+
+    def __new__(cls, name: str = "") -> AsyncElasticsearch:  # type: ignore[misc]
+        return cls.get(name)  # type: ignore[no-any-return]
+
@@ -0,0 +1,209 @@
+"""Async PostgreSQL hub (``apg``) for use inside ``AsyncLane`` lanes.
+
+Backed by an ``asyncpg`` pool, resolved from the same env vars as ``pg``. The
+accessor is sync — only the operations are awaited::
+
+    rows = await apg("main").fetch("SELECT * FROM articles WHERE id = $1", 1)
+
+    async with apg("main").acquire() as conn:
+        async with conn.transaction():
+            ...
+
+The pool is created on first use, inside the running event loop, and sized by
+``PG_POOL_MIN``/``PG_POOL_MAX`` like ``pgpool``. Pools are closed via
+``apg.clear_all()`` (an awaitable); the framework calls it inside the event loop
+when async lanes finish. asyncpg only takes URI DSNs (``postgresql://...``).
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import asyncpg
+from fun_things.singleton_hub import AsyncSingletonHubMeta
+from fun_things.singleton_hub.environment_hub import EnvironmentHubMeta
+
+from ._constants import C
+
+
+class APGPool:
+    """
+    A lazily created ``asyncpg`` pool for one PostgreSQL database.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int,
+        max_size: int,
+        timeout: float,
+        **kwargs,
+    ):
+        """
+        Args:
+            dsn: The connection URI.
+            min_size: The connections kept open while idle.
+            max_size: The most connections open at once.
+            timeout: How long ``acquire()`` waits for a free connection,
+                in seconds.
+            **kwargs: Passed on to ``asyncpg.create_pool``.
+        """
+
+        max_size = max(max_size, 1)
+
+        self.dsn = dsn
+        self.min_size = min(max(min_size, 0), max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.kwargs = kwargs
+        self.__pool: Optional[asyncpg.Pool] = None
+        self.__lock: Optional[asyncio.Lock] = None
+
+    async def pool(self) -> asyncpg.Pool:
+        """
+        Returns the underlying pool, creating it on first use.
+        """
+
+        if self.__pool is not None:
+            return self.__pool
+
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            if self.__pool is None:
+                self.__pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    **self.kwargs,
+                )
+
+        return self.__pool  # type: ignore[return-value]
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Checks a connection out for the duration of the ``async with`` block.
+
+        asyncpg resets the connection when it goes back to the pool, and
+        discards it if it broke.
+        """
+
+        pool = await self.pool()
+
+        async with pool.acquire(timeout=self.timeout) as connection:
+            yield connection
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None):
+        pool = await self.pool()
+
+        return await pool.execute(query, *args, timeout=timeout)
+
+    async def executemany(
+        self,
+        query: str,
+        args: Any,
+        *,
+        timeout: Optional[float] = None,
+    ):
+        pool = await self.pool()
+
+        return await pool.executemany(query, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None):
+        pool = await self.pool()
+
+        return await pool.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None):
+        pool = await self.pool()
+
+        return await pool.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(
+        self,
+        query: str,
+        *args,
+        column: int = 0,
+        timeout: Optional[float] = None,
+    ):
+        pool = await self.pool()
+
+        return await pool.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def close(self):
+        """
+        Closes the pool, if it was created.
+        """
+
+        pool, self.__pool = self.__pool, None
+
+        if pool is not None:
+            await pool.close()
+
+
+class AsyncPGHubMeta(
+    EnvironmentHubMeta[APGPool],
+    AsyncSingletonHubMeta[APGPool],
+):
+    """Async counterpart of :class:`PGMeta`.
+
+    Builds ``APGPool`` instances. Closing is a coroutine, so teardown is the
+    async ``clear`` / ``clear_all``, awaited inside the running event loop.
+    """
+
+    # Same env var names as PGMeta.
+    _formats = EnvironmentHubMeta._bake_basic_uri_formats(
+        "PG",
+        "POSTGRESQL",
+        "POSTGRES",
+    )
+    _kwargs: Dict[str, Any] = {}
+    _log: bool = True
+
+    def _value_selector(cls, name: str):
+        client = APGPool(
+            os.environ.get(name) or "",
+            min_size=C(
+                "PG_POOL_MIN",
+                cast=int,
+                default=1,
+            ),
+            max_size=C(
+                "PG_POOL_MAX",
+                cast=int,
+                default=10,
+            ),
+            timeout=C(
+                "PG_POOL_TIMEOUT",
+                cast=float,
+                default=30,
+            ),
+            **cls._kwargs,
+        )
+
+        if cls._log:
+            print(f"Async PostgreSQL `{name}` instantiated.")
+
+        return client
+
+    def _on_clear(cls, key: str, value: APGPool) -> None:
+        # Closing is async — use clear/clear_all (see _aon_clear).
+        pass
+
+    async def _aon_clear(cls, key: str, value: APGPool) -> None:
+        try:
+            await value.close()
+
+        except Exception:
+            pass
+
+        if cls._log:
+            print(f"Async PostgreSQL `{key}` closed.")
+
+
+class apg(metaclass=AsyncPGHubMeta):
+    def __new__(cls, name: str = "") -> APGPool:  # type: ignore[misc]
+        return cls.get(name)  # type: ignore[no-any-return]
@@ -1,17 +1,51 @@
 """Async Redis hub (``aredis``) for use inside ``AsyncLane`` lanes.
 
-Thin re-export of fun_things' ``AsyncRedisHub`` (``redis.asyncio``). The accessor
-is sync — only the operations are awaited::
+Built on fun_things' ``AsyncRedisHub`` (``redis.asyncio``). The accessor is
+sync — only the operations are awaited::
 
     await aredis("cache").get("key")
 
-Clients are closed via ``aredis.aclose_all()`` (an awaitable); the framework
+    # Coalesced with the other commands sent through `cache` into one
+    # pipeline; share the proxy between the tasks.
+    cache = aredis.pipelined("cache")
+
+    await cache.get("key")
+
+Clients are closed via ``aredis.clear_all()`` (an awaitable); the framework
 calls it inside the event loop when async lanes finish.
 """
 
-from fun_things.singleton_hub.async_redis_hub import (  # noqa: F401
-    AsyncRedisHub as aredis,
-)
+from typing import Optional
+
+from fun_things.singleton_hub.async_redis_hub import AsyncRedisHub
 from fun_things.singleton_hub.async_redis_hub import (  # noqa: F401
     AsyncRedisHubMeta,
 )
+
+from .redis_pipeline import AsyncAutoPipeline
+
+
+class aredis(AsyncRedisHub):
+    @classmethod
+    def pipelined(
+        cls,
+        name: str = "",
+        max_commands: Optional[int] = None,
+        window: Optional[float] = None,
+    ) -> AsyncAutoPipeline:
+        """
+        A new auto-pipelining proxy of the ``name`` client, like
+        ``redis.pipelined``. Only the commands sent through the same proxy are
+        coalesced, so share it between the tasks (e.g. on the lane).
+
+        ``aredis.pipelined`` is this method, not the client named
+        ``pipelined``; get that one with ``aredis("pipelined")``.
+
+        See ``carabao.constants.redis_pipeline`` for the options.
+        """
+
+        return AsyncAutoPipeline(
+            cls.get(name),
+            max_commands=max_commands,
+            window=window,
+        )
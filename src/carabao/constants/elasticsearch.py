@@ -1,25 +1,35 @@
-from typing import Set
+import os
+import re
+from typing import Any, Callable, Iterable
 
+from elasticsearch import Elasticsearch
 from fun_things.singleton_hub.elasticsearch_hub import (
     ElasticsearchHub,
     ElasticsearchHubMeta,
 )
 
 from ._constants import C
+from .es_bulk import streaming_index
 
 
 class ESMeta(ElasticsearchHubMeta):
-    __cache: Set[str] = set()
-
     def _value_selector(cls, name: str):
         client = super()._value_selector(name)
+        hosts = _parse_hosts(os.environ.get(name) or "")
+
+        cls._kuma_check(client, lambda: Elasticsearch(hosts=hosts, **cls._kwargs))
+
+        return client
+
+    def _kuma_check(cls, client, connect: Callable[[], Elasticsearch]):
+        """Watches the client's nodes; ``connect`` builds a probe client."""
 
         if not C(
             "ES_KUMA",
             cast=bool,
             default=True,
         ):
-            return client
+            return
 
         try:
             nodes = list(client.transport.node_pool.all())
@@ -30,20 +40,18 @@ class ESMeta(ElasticsearchHubMeta):
         address = ",".join(sorted(f"{node.host}:{node.port}" for node in nodes))
 
         if not address:
-            return client
-
-        if address in cls.__cache:
-            return client
+            return
 
         url = C(
             "ES_KUMA_URL",
             default=None,
         )
 
+        from carabao.helpers.health import ClientProbe, health_monitor
         from carabao.helpers.kumander import kumander
 
-        if not url and not kumander.url:
-            return client
+        if not url and not kumander.url and not health_monitor.fast_fail:
+            return
 
         timeout = C(
             "ES_KUMA_PING_TIMEOUT",
@@ -51,24 +59,15 @@ class ESMeta(ElasticsearchHubMeta):
             default=3,
         )
 
-        try:
-            response = client.options(
+        def ping(probe_client: Elasticsearch):
+            if not probe_client.options(
                 request_timeout=timeout,
-            ).ping()
-
-            if not response:
+                max_retries=0,
+            ).ping():
                 raise Exception("ping returned False")
 
-        except Exception:
-            kumander.ping(
-                url,
-                "Elasticsearch",
-                addresses=address,
-            )
-
-            raise
-
-        return client
+        health_monitor.watch("Elasticsearch", address, ClientProbe(connect, ping), url)
+        health_monitor.check("Elasticsearch", address)
 
 
 class es(ElasticsearchHub, metaclass=ESMeta):
@@ -81,3 +80,38 @@ class es(ElasticsearchHub, metaclass=ESMeta):
         retry_on_timeout=True,
         connections_per_node=25,
     )
+
+    @classmethod
+    def bulk(cls, actions: Iterable[Any], name: str = "", **kwargs):
+        """
+        Indexes actions through the ``name`` connection with concurrent,
+        size-bounded bulk requests, retrying 429s.
+
+        See ``carabao.constants.es_bulk.streaming_index`` for the options.
+
+        Yields:
+            Tuple[bool, Dict[str, Any]]: Whether each document was indexed,
+                and its result item.
+        """
+
+        return streaming_index(cls.get(name), actions, **kwargs)
+
+
+def _parse_hosts(value: str):
+    """The host URLs in an ES env var, parsed like fun_things' ``es`` hub."""
+
+    return [
+        "{scheme}://{credentials}{host}{port}".format(
+            scheme=scheme,
+            credentials=f"{username}:{password}@" if username or password else "",
+            host=host,
+            port=":" + port if port else "",
+        )
+        for scheme, username, password, host, port in (
+            match.groups()
+            for match in re.finditer(
+                r"(https?):\/\/(?:([^\s@]+)?:([^\s@]+)@)?([^:\s@]+)(?::(\d+))?",
+                value,
+            )
+        )
+    ]
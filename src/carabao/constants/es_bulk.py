@@ -0,0 +1,251 @@
+"""Streaming bulk indexing for the ``es`` hub.
+
+``es.bulk`` reads actions (in the ``elasticsearch.helpers.bulk`` format) from an
+iterable — typically a generator lane — and sends them in chunks of up to
+``ES_BULK_CHUNK_SIZE`` documents and ``ES_BULK_MAX_CHUNK_BYTES`` bytes::
+
+    for ok, item in es.bulk(
+        ({"_index": "articles", "_id": a["id"], "_source": a} for a in articles),
+        name="main",
+    ):
+        if not ok:
+            print(item)
+
+Up to ``ES_BULK_CONCURRENCY`` chunks are in flight at once, sharing the client's
+connection pool (``connections_per_node``). No more actions are read than those
+chunks hold, so memory stays bounded however long the iterable is. Documents
+rejected with a 429 are retried with exponential backoff, up to
+``ES_BULK_MAX_RETRIES`` times. One ``(ok, item)`` result is yielded per
+document, chunk by chunk in the order the chunks were read.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from elasticsearch import ApiError, Elasticsearch
+from elasticsearch.helpers import expand_action
+
+from ._constants import C
+
+# (header, body) as given by ``expand_action``, and its serialized lines.
+_Chunk = Tuple[List[Tuple[Dict[str, Any], Any]], List[bytes]]
+
+
+def streaming_index(
+    client: Elasticsearch,
+    actions: Iterable[Any],
+    chunk_size: Optional[int] = None,
+    max_chunk_bytes: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    initial_backoff: float = 2,
+    max_backoff: float = 60,
+    **kwargs,
+) -> Iterator[Tuple[bool, Dict[str, Any]]]:
+    """
+    Indexes actions with concurrent bulk requests.
+
+    Args:
+        client: The Elasticsearch client.
+        actions: The actions, as accepted by ``elasticsearch.helpers.bulk``.
+        chunk_size: The most documents per request.
+            Defaults to ES_BULK_CHUNK_SIZE.
+        max_chunk_bytes: The largest request body, in bytes.
+            Defaults to ES_BULK_MAX_CHUNK_BYTES.
+        concurrency: The most requests in flight at once.
+            Defaults to ES_BULK_CONCURRENCY.
+        max_retries: How often a document rejected with a 429 is retried.
+            Defaults to ES_BULK_MAX_RETRIES.
+        initial_backoff: The wait before the first retry, in seconds;
+            doubled for each one after.
+        max_backoff: The longest wait between retries, in seconds.
+        **kwargs: Passed on to ``client.bulk`` (e.g. ``refresh``, ``pipeline``).
+
+    Yields:
+        Tuple[bool, Dict[str, Any]]: Whether the document was indexed, and its
+            result item (``{op_type: {...}}``).
+    """
+
+    chunk_size = max(
+        chunk_size
+        if chunk_size is not None
+        else C(
+            "ES_BULK_CHUNK_SIZE",
+            cast=int,
+            default=500,
+        ),
+        1,
+    )
+    max_chunk_bytes = (
+        max_chunk_bytes
+        if max_chunk_bytes is not None
+        else C(
+            "ES_BULK_MAX_CHUNK_BYTES",
+            cast=int,
+            default=10 * 1024 * 1024,
+        )
+    )
+    concurrency = max(
+        concurrency
+        if concurrency is not None
+        else C(
+            "ES_BULK_CONCURRENCY",
+            cast=int,
+            default=4,
+        ),
+        1,
+    )
+    max_retries = (
+        max_retries
+        if max_retries is not None
+        else C(
+            "ES_BULK_MAX_RETRIES",
+            cast=int,
+            default=5,
+        )
+    )
+    serializer = client.transport.serializers.get_serializer("application/json")
+
+    def _send(chunk: _Chunk):
+        return list(
+            _send_chunk(
+                client,
+                chunk,
+                serializer,
+                max_retries,
+                initial_backoff,
+                max_backoff,
+                kwargs,
+            )
+        )
+
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency,
+        thread_name_prefix="carabao-es-bulk",
+    )
+    in_flight: Deque["Future[List[Tuple[bool, Dict[str, Any]]]]"] = deque()
+
+    try:
+        for chunk in _chunks(actions, chunk_size, max_chunk_bytes, serializer):
+            # Backpressure: wait for the oldest request before reading further.
+            if len(in_flight) >= concurrency:
+                yield from in_flight.popleft().result()
+
+            in_flight.append(executor.submit(_send, chunk))
+
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        executor.shutdown(wait=True)
+
+
+def _chunks(
+    actions: Iterable[Any],
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer,
+) -> Iterator[_Chunk]:
+    """Groups the expanded, serialized actions into bulk requests."""
+
+    data: List[Tuple[Dict[str, Any], Any]] = []
+    lines: List[bytes] = []
+    size = 0
+
+    for action in actions:
+        header, body = expand_action(action)
+        action_lines = _serialize(serializer, header, body)
+        # +1 for each line's newline.
+        action_size = sum(len(line) + 1 for line in action_lines)
+
+        if data and (
+            len(data) >= chunk_size or size + action_size > max_chunk_bytes
+        ):
+            yield data, lines
+
+            data, lines, size = [], [], 0
+
+        data.append((header, body))
+        lines += action_lines
+        size += action_size
+
+    if data:
+        yield data, lines
+
+
+def _serialize(serializer, header: Dict[str, Any], body: Any) -> List[bytes]:
+    lines = [header, body] if body is not None else [header]
+
+    return [
+        line if isinstance(line, bytes) else line.encode("utf-8")
+        for line in map(serializer.dumps, lines)
+    ]
+
+
+def _send_chunk(
+    client: Elasticsearch,
+    chunk: _Chunk,
+    serializer,
+    max_retries: int,
+    initial_backoff: float,
+    max_backoff: float,
+    kwargs: Dict[str, Any],
+) -> Iterator[Tuple[bool, Dict[str, Any]]]:
+    """Sends one bulk request, retrying what was rejected with a 429."""
+
+    data, lines = chunk
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            time.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
+
+        last = attempt >= max_retries
+
+        try:
+            # Already serialized; the NDJSON serializer sends bytes as they are.
+            response = client.bulk(operations=lines, **kwargs)  # type: ignore[arg-type]
+
+        except ApiError as e:
+            if e.status_code == 429 and not last:
+                continue
+
+            # Every document of the request failed the same way.
+            for header, _ in data:
+                op_type, meta = next(iter(header.items()))
+
+                yield False, {
+                    op_type: {
+                        **meta,
+                        "status": e.status_code,
+                        "error": str(e),
+                    }
+                }
+
+            return
+
+        retry_data: List[Tuple[Dict[str, Any], Any]] = []
+
+        for (header, body), item in zip(data, response.body["items"]):
+            op_type, result = next(iter(item.items()))
+            status = result.get("status", 500)
+
+            if status == 429 and not last:
+                retry_data.append((header, body))
+
+            else:
+                yield 200 <= status < 300, {op_type: result}
+
+        if not retry_data:
+            return
+
+        data = retry_data
+        lines = [
+            line
+            for header, body in retry_data
+            for line in _serialize(serializer, header, body)
+        ]
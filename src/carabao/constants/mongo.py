@@ -1,13 +1,72 @@
-from typing import Set
+import os
+import threading
+from typing import Any, Dict, List
 
 import pymongo
 from fun_things.singleton_hub.mongo_hub import MongoHub, MongoHubMeta
 
 from ._constants import C
+from .mongo_bulk import MongoBulkWriter, MongoWriteError
 
 
 class MongoMeta(MongoHubMeta):
-    __cache: Set[str] = set()
+    __bulk_writers: Dict[str, MongoBulkWriter] = {}
+    __bulk_lock = threading.Lock()
+
+    def bulk(cls, name: str = ""):
+        """
+        The buffered bulk writer of a MongoDB connection.
+
+        There's one per name; ``Core`` flushes them all at the end of each
+        iteration and on shutdown. A connection named ``bulk`` is still
+        ``mongo("bulk")``.
+
+        Args:
+            name: The hub name, as in ``mongo(name)``.
+
+        Returns:
+            MongoBulkWriter: The writer.
+        """
+
+        with cls.__bulk_lock:
+            writer = cls.__bulk_writers.get(name)
+
+            if writer is None:
+                writer = cls.__bulk_writers[name] = MongoBulkWriter(name)
+
+        return writer
+
+    def _after_fork(cls):
+        # What the parent queued is the parent's to send.
+        cls.__bulk_writers.clear()
+
+        cls.__bulk_lock = threading.Lock()
+
+    def flush_bulk(cls):
+        """
+        Flushes every bulk writer.
+
+        Each writer is flushed even if an earlier one failed; the first
+        failure is raised afterwards.
+
+        Returns:
+            List[MongoWriteError]: The operations the server rejected.
+        """
+
+        errors: List[MongoWriteError] = []
+        failure = None
+
+        for writer in [*cls.__bulk_writers.values()]:
+            try:
+                errors += writer.flush()
+
+            except Exception as e:
+                failure = failure or e
+
+        if failure is not None:
+            raise failure
+
+        return errors
 
     def _value_selector(cls, name: str):
         client = super()._value_selector(name)
@@ -19,42 +78,52 @@ class MongoMeta(MongoHubMeta):
         ):
             return client
 
-        addresses = addresses = ",".join(
+        addresses = ",".join(
             sorted(
                 f"{hostname}:{port}"
                 for hostname, port in client.topology_description.server_descriptions().keys()
             )
         )
-
-        if addresses in cls.__cache:
-            return client
-
         url = C(
             "MONGO_KUMA_URL",
             default=None,
         )
 
+        from carabao.helpers.health import ClientProbe, health_monitor
         from carabao.helpers.kumander import kumander
 
-        if not url and not kumander.url:
+        if not url and not kumander.url and not health_monitor.fast_fail:
             return client
 
-        try:
-            with pymongo.timeout(
-                C(
-                    "MONGO_KUMA_PING_TIMEOUT",
-                    cast=float,
-                    default=3,
-                )
-            ):
-                client.admin.command("ping")
-
-        except Exception:
-            kumander.ping(
-                url,
-                "MongoDB",
-                addresses=addresses,
+        uri = os.environ.get(name)
+        timeout_ms = int(
+            C(
+                "MONGO_KUMA_PING_TIMEOUT",
+                cast=float,
+                default=3,
             )
+            * 1000
+        )
+
+        probe: ClientProbe[pymongo.MongoClient[Dict[str, Any]]] = ClientProbe(
+            lambda: pymongo.MongoClient(
+                uri,
+                **{
+                    **cls._kwargs,
+                    "serverSelectionTimeoutMS": timeout_ms,
+                    "connectTimeoutMS": timeout_ms,
+                },
+            ),
+            lambda probe_client: probe_client.admin.command("ping"),
+        )
+
+        health_monitor.watch("MongoDB", addresses, probe, url)
+
+        try:
+            health_monitor.check("MongoDB", addresses)
+
+        except ConnectionError:
+            client.close()
 
             raise
 
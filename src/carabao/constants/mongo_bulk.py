@@ -0,0 +1,322 @@
+"""Buffered bulk writes for the ``mongo`` hub.
+
+Lanes queue ``InsertOne``/``UpdateOne``/``ReplaceOne``/``DeleteOne`` operations
+instead of writing one document at a time. Each collection's operations are sent
+as one unordered ``bulk_write`` once ``MONGO_BULK_SIZE`` of them are queued, or
+once the oldest has waited ``MONGO_BULK_MAX_WAIT`` seconds::
+
+    from pymongo import InsertOne
+
+    writer = mongo.bulk("main")
+
+    writer.add("shop.articles", InsertOne(article))
+
+``Core`` flushes every writer at the end of each iteration and before it closes
+the hubs on shutdown, so nothing queued is lost. The age threshold is checked
+when operations are added; there is no background thread.
+
+Failed operations are reported as ``MongoWriteError``s: returned by ``flush``,
+and passed to ``on_error`` (printed, if unset). The writes go out without
+holding the writer's lock, so the lanes can keep queueing while one is sent. If
+the server can't be reached, the operations stay queued; ``add`` backs off
+before trying that collection again, and beyond ``MONGO_BULK_MAX_QUEUED``
+operations per collection the oldest are dropped and reported.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from ._constants import C
+
+
+@dataclass
+class MongoWriteError:
+    """
+    An operation the server rejected in a bulk write, or a write concern
+    error.
+    """
+
+    collection: str
+    """The ``database.collection`` it was sent to."""
+    operation: Any
+    """
+    The queued operation, e.g. the ``InsertOne``. None for a write concern
+    error, which is about the whole bulk write.
+    """
+    code: Optional[int]
+    message: str
+    details: Dict[str, Any] = field(default_factory=dict)
+    """The server's error document."""
+
+    def __str__(self):
+        return f"{self.collection}: {self.message} (code {self.code})"
+
+
+class MongoBulkWriter:
+    """
+    Queues write operations per collection and sends them in bulk.
+
+    Thread safe; get one with ``mongo.bulk(name)``.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        on_error: Optional[Callable[[MongoWriteError], Any]] = None,
+        max_queued: Optional[int] = None,
+    ):
+        """
+        Args:
+            name: The ``mongo`` hub name the collections are resolved against.
+            size: The operations queued per collection before it's flushed.
+                Defaults to MONGO_BULK_SIZE.
+            max_wait: The longest an operation stays queued, in seconds.
+                Defaults to MONGO_BULK_MAX_WAIT.
+            on_error: Called with each operation the server rejected.
+            max_queued: The most operations kept per collection while the
+                server can't be reached. Defaults to MONGO_BULK_MAX_QUEUED,
+                or 10 times ``size``.
+        """
+
+        self.name = name
+        self.size = max(
+            size
+            if size is not None
+            else C(
+                "MONGO_BULK_SIZE",
+                cast=int,
+                default=1000,
+            ),
+            1,
+        )
+        self.max_wait = (
+            max_wait
+            if max_wait is not None
+            else C(
+                "MONGO_BULK_MAX_WAIT",
+                cast=float,
+                default=1,
+            )
+        )
+        self.on_error = on_error
+        self.max_queued = max(
+            max_queued
+            if max_queued is not None
+            else C(
+                "MONGO_BULK_MAX_QUEUED",
+                cast=int,
+                default=self.size * 10,
+            ),
+            self.size,
+        )
+        # "database.collection" -> (first queued at, operations)
+        self.__buffers: Dict[str, Tuple[float, List[Any]]] = {}
+        # "database.collection" -> (failures in a row, not retried by `add`
+        # before)
+        self.__backoffs: Dict[str, Tuple[int, float]] = {}
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(operations) for _, operations in self.__buffers.values())
+
+    def add(self, collection: Union[str, "Collection[Any]"], operation: Any):
+        """
+        Queues an operation, flushing the collection if it's due.
+
+        Args:
+            collection: A ``"database.collection"`` name, or a collection
+                (only its name is used; it's written through this hub).
+            operation: An ``InsertOne``, ``UpdateOne``, ``ReplaceOne``,
+                ``DeleteOne`` (or any other ``bulk_write`` request).
+
+        Returns:
+            List[MongoWriteError]: The errors of the flush this triggered, if any.
+        """
+
+        key = _key(collection)
+
+        with self.__lock:
+            started, operations = self.__buffers.setdefault(key, (monotonic(), []))
+
+            operations.append(operation)
+
+            dropped = self.__trim(key, operations)
+            _, retry_at = self.__backoffs.get(key, (0, 0.0))
+
+            due = monotonic() >= retry_at and (
+                len(operations) >= self.size
+                or monotonic() - started >= self.max_wait
+            )
+
+        self.__report(dropped)
+
+        if not due:
+            return dropped
+
+        return dropped + self.flush(key)
+
+    def flush(self, collection: Union[str, "Collection[Any]", None] = None):
+        """
+        Sends the queued operations.
+
+        If sending a collection's operations fails outright (e.g. the server
+        is unreachable), they are queued again, ahead of newer ones, and the
+        error is raised — after the other collections were sent and the
+        rejected operations reported. Until the backoff for that collection
+        has passed, ``add`` won't flush it again.
+
+        Args:
+            collection: Only flush this collection. Defaults to all of them.
+
+        Returns:
+            List[MongoWriteError]: The operations the server rejected.
+        """
+
+        errors: List[MongoWriteError] = []
+        failure: Optional[Exception] = None
+
+        # Taken out under the lock, then sent without it.
+        with self.__lock:
+            keys = [*self.__buffers] if collection is None else [_key(collection)]
+            batches = [
+                (key, self.__buffers.pop(key)[1])
+                for key in keys
+                if key in self.__buffers
+            ]
+
+        try:
+            for key, operations in batches:
+                if not operations:
+                    continue
+
+                try:
+                    errors += self.__write(key, operations)
+
+                except Exception as e:
+                    errors += self.__requeue(key, operations)
+
+                    # Raised once the rest are sent.
+                    if failure is None:
+                        failure = e
+
+                else:
+                    with self.__lock:
+                        self.__backoffs.pop(key, None)
+
+        finally:
+            self.__report(errors)
+
+        if failure is not None:
+            raise failure
+
+        return errors
+
+    def clear(self):
+        """
+        Drops the queued operations without sending them.
+        """
+
+        with self.__lock:
+            self.__buffers.clear()
+            self.__backoffs.clear()
+
+    def __write(self, key: str, operations: List[Any]):
+        from .mongo import mongo
+
+        database, _, name = key.partition(".")
+
+        try:
+            mongo(self.name)[database][name].bulk_write(operations, ordered=False)
+
+        except BulkWriteError as e:
+            return [
+                MongoWriteError(
+                    collection=key,
+                    operation=operations[error["index"]],
+                    code=error.get("code"),
+                    message=error.get("errmsg", ""),
+                    details=error,
+                )
+                for error in e.details.get("writeErrors", [])
+            ] + [
+                MongoWriteError(
+                    collection=key,
+                    operation=None,
+                    code=error.get("code"),
+                    message=error.get("errmsg", ""),
+                    details=error,
+                )
+                for error in e.details.get("writeConcernErrors", [])
+            ]
+
+        return []
+
+    def __requeue(self, key: str, operations: List[Any]):
+        """
+        Queues operations that couldn't be sent again, ahead of anything
+        queued meanwhile, and backs the collection off.
+
+        Returns:
+            List[MongoWriteError]: The operations dropped to stay within
+                ``max_queued``.
+        """
+
+        with self.__lock:
+            _, newer = self.__buffers.pop(key, (0.0, []))
+            operations = [*operations, *newer]
+            failures, _ = self.__backoffs.get(key, (0, 0.0))
+            # Doubles per failure, from max_wait up to a minute.
+            delay = min(max(self.max_wait, 0.1) * 2**failures, 60.0)
+
+            self.__buffers[key] = (monotonic(), operations)
+            self.__backoffs[key] = (failures + 1, monotonic() + delay)
+
+            return self.__trim(key, operations)
+
+    def __trim(self, key: str, operations: List[Any]):
+        """Drops the oldest operations beyond ``max_queued``, in place."""
+
+        excess = len(operations) - self.max_queued
+
+        if excess <= 0:
+            return []
+
+        dropped = operations[:excess]
+
+        del operations[:excess]
+
+        return [
+            MongoWriteError(
+                collection=key,
+                operation=operation,
+                code=None,
+                message="Dropped; too many operations queued for the server.",
+            )
+            for operation in dropped
+        ]
+
+    def __report(self, errors: List[MongoWriteError]):
+        for error in errors:
+            if self.on_error is not None:
+                self.on_error(error)
+
+            else:
+                print(f"MongoDB bulk write error in `{self.name}`: {error}")
+
+
+def _key(collection: Union[str, "Collection[Any]"]):
+    if isinstance(collection, Collection):
+        return collection.full_name
+
+    if "." not in collection:
+        raise ValueError(f"Expected 'database.collection', got '{collection}'!")
+
+    return collection
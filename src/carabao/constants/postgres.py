@@ -1,10 +1,13 @@
 import os
-from typing import Set
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 import psycopg2
 from fun_things.singleton_hub.environment_hub import EnvironmentHubMeta
 from psycopg2._psycopg import connection
-from psycopg2.extensions import parse_dsn
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN, parse_dsn
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 from ._constants import C
 
@@ -17,10 +20,12 @@ class PGMeta(EnvironmentHubMeta[connection]):
     )
     _kwargs: dict = {}
     _log: bool = True
-    __cache: Set[str] = set()
 
     def _value_selector(cls, name: str):
         dsn = os.environ.get(name)
+
+        cls._kuma_check(dsn)
+
         client = psycopg2.connect(
             dsn,
             **cls._kwargs,
@@ -29,10 +34,20 @@ class PGMeta(EnvironmentHubMeta[connection]):
         if cls._log:
             print(f"PostgreSQL `{name}` instantiated.")
 
-        cls._kuma_check(dsn)
-
         return client
 
+    def dsn(cls, name: str = "") -> Optional[str]:
+        """
+        Resolves ``name`` to its connection string, like ``pg(name)`` does,
+        without connecting. For connections the hub can't share (e.g. one
+        that ``LISTEN``s).
+
+        Raises:
+            KeyError: If no environment variable is set for ``name``.
+        """
+
+        return os.environ.get(cls._name_selector(name))
+
     def _kuma_check(cls, dsn):
         if not C(
             "PG_KUMA",
@@ -57,17 +72,15 @@ class PGMeta(EnvironmentHubMeta[connection]):
         if not host:
             return
 
-        if address in cls.__cache:
-            return
-
         url = C(
             "PG_KUMA_URL",
             default=None,
         )
 
+        from carabao.helpers.health import ClientProbe, health_monitor
         from carabao.helpers.kumander import kumander
 
-        if not url and not kumander.url:
+        if not url and not kumander.url and not health_monitor.fast_fail:
             return
 
         timeout = C(
@@ -76,37 +89,196 @@ class PGMeta(EnvironmentHubMeta[connection]):
             default=3,
         )
 
-        try:
-            probe = psycopg2.connect(
+        def ping(probe_client: connection):
+            with probe_client.cursor() as cur:
+                cur.execute("SELECT 1")
+
+            # Not left idle in a transaction until the next probe.
+            probe_client.rollback()
+
+        probe = ClientProbe(
+            lambda: psycopg2.connect(
                 dsn,
                 connect_timeout=max(int(timeout), 1),
+            ),
+            ping,
+        )
+
+        health_monitor.watch("PostgreSQL", address, probe, url)
+        health_monitor.check("PostgreSQL", address)
+
+    def _on_clear(cls, key: str, value: connection) -> None:
+        value.close()
+
+        if cls._log:
+            print(f"PostgreSQL `{key}` closed.")
+
+
+class pg(metaclass=PGMeta):
+    def __new__(cls, name: str = ""):
+        return cls.get(name)
+
+
+class PGPool:
+    """
+    A bounded, thread-safe pool of connections to one PostgreSQL database.
+
+    Check connections out with ``connection()``. When all of them are in use,
+    callers wait for one to be returned instead of failing.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        minconn: int,
+        maxconn: int,
+        timeout: float,
+        **kwargs,
+    ):
+        """
+        Args:
+            dsn: The connection string.
+            minconn: The connections kept open while idle.
+            maxconn: The most connections open at once.
+            timeout: How long ``connection()`` waits for a free connection,
+                in seconds.
+            **kwargs: Passed on to ``psycopg2.connect``.
+        """
+
+        maxconn = max(maxconn, 1)
+
+        self.timeout = timeout
+        self.__pool = ThreadedConnectionPool(
+            min(max(minconn, 0), maxconn),
+            maxconn,
+            dsn,
+            **kwargs,
+        )
+        # psycopg2's pool raises when exhausted; this makes callers wait.
+        self.__slots = threading.BoundedSemaphore(maxconn)
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.__pool.closed)
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """
+        Checks a connection out for the duration of the ``with`` block.
+
+        An error inside the block rolls the transaction back. A connection
+        that broke (closed, or in an unknown state after a network error) is
+        discarded instead of going back to the pool.
+
+        Raises:
+            PoolError: If no connection frees up within ``timeout`` seconds.
+        """
+
+        if not self.__slots.acquire(timeout=self.timeout):
+            raise PoolError(
+                f"No PostgreSQL connection was free within {self.timeout}s."
             )
 
+        try:
+            conn = self.__pool.getconn()
+
+            # An idle connection may have been closed while it sat in the pool.
+            while conn.closed:
+                self.__pool.putconn(conn, close=True)
+
+                conn = self.__pool.getconn()
+
             try:
-                cur = probe.cursor()
+                yield conn
 
-                cur.execute("SELECT 1")
-                cur.close()
+            except BaseException:
+                if not conn.closed:
+                    try:
+                        conn.rollback()
+
+                    except Exception:
+                        pass
+
+                raise
 
             finally:
-                probe.close()
+                self.__pool.putconn(
+                    conn,
+                    close=conn.closed
+                    or conn.info.transaction_status == TRANSACTION_STATUS_UNKNOWN,
+                )
 
-        except Exception:
-            kumander.ping(
-                url,
-                "PostgreSQL",
-                addresses=address,
-            )
+        finally:
+            self.__slots.release()
 
-            raise
+    def close(self):
+        """
+        Closes every connection of the pool.
+        """
 
-    def _on_clear(cls, key: str, value: connection) -> None:
+        if not self.__pool.closed:
+            self.__pool.closeall()
+
+
+class PGPoolMeta(PGMeta):
+    __lock = threading.Lock()
+
+    def _value_selector(cls, name: str):
+        dsn = os.environ.get(name)
+
+        cls._kuma_check(dsn)
+
+        client = PGPool(
+            dsn,  # type: ignore[arg-type]
+            minconn=C(
+                "PG_POOL_MIN",
+                cast=int,
+                default=1,
+            ),
+            maxconn=C(
+                "PG_POOL_MAX",
+                cast=int,
+                default=10,
+            ),
+            timeout=C(
+                "PG_POOL_TIMEOUT",
+                cast=float,
+                default=30,
+            ),
+            **cls._kwargs,
+        )
+
+        if cls._log:
+            print(f"PostgreSQL pool `{name}` instantiated.")
+
+        return client
+
+    def _on_clear(cls, key: str, value: PGPool) -> None:  # type: ignore[override]
         value.close()
 
         if cls._log:
-            print(f"PostgreSQL `{key}` closed.")
+            print(f"PostgreSQL pool `{key}` closed.")
 
+    def _get_pool(cls, name: str) -> PGPool:
+        # Lanes share the hub across threads; build each pool only once.
+        with cls.__lock:
+            return cls.get(name)  # type: ignore[no-any-return]
 
-class pg(metaclass=PGMeta):
-    def __new__(cls, name: str = ""):
-        return cls.get(name)
+    def _after_fork(cls):
+        # A thread of the parent might have held it while forking.
+        cls.__lock = threading.Lock()
+
+
+class pgpool(metaclass=PGPoolMeta):
+    """
+    Pooled PostgreSQL connections, resolved from the same env vars as ``pg``::
+
+        with pgpool("NAME").connection() as conn:
+            ...
+
+    ``pg("NAME")`` keeps returning one shared connection; use ``pgpool`` when
+    threaded lanes should query in parallel.
+    """
+
+    def __new__(cls, name: str = "") -> PGPool:  # type: ignore[misc]
+        return cls._get_pool(name)
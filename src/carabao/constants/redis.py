@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Optional
 
 from fun_things.singleton_hub.redis_hub import RedisHub, RedisHubMeta
 from redis import Redis
@@ -7,11 +7,10 @@ from redis.exceptions import ConnectionError, TimeoutError
 from redis.retry import Retry
 
 from ._constants import C
+from .redis_pipeline import AutoPipeline
 
 
 class RedisMeta(RedisHubMeta):
-    __cache: Set[str] = set()
-
     def _value_selector(cls, name: str):
         client = super()._value_selector(name)
 
@@ -30,17 +29,15 @@ class RedisMeta(RedisHubMeta):
         if not host or not port:
             return client
 
-        if address in cls.__cache:
-            return client
-
         url = C(
             "REDIS_KUMA_URL",
             default=None,
         )
 
+        from carabao.helpers.health import ClientProbe, health_monitor
         from carabao.helpers.kumander import kumander
 
-        if not url and not kumander.url:
+        if not url and not kumander.url and not health_monitor.fast_fail:
             return client
 
         timeout = C(
@@ -48,50 +45,41 @@ class RedisMeta(RedisHubMeta):
             cast=float,
             default=3,
         )
-
-        try:
-            probe_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in (
-                    "host",
-                    "port",
-                    "db",
-                    "username",
-                    "password",
-                    "ssl",
-                    "ssl_keyfile",
-                    "ssl_certfile",
-                    "ssl_cert_reqs",
-                    "ssl_ca_certs",
-                    "ssl_ca_data",
-                    "ssl_check_hostname",
-                    "unix_socket_path",
-                    "encoding",
-                    "encoding_errors",
-                    "client_name",
-                )
-            }
-            probe_kwargs["socket_timeout"] = timeout
-            probe_kwargs["socket_connect_timeout"] = timeout
-
-            probe = Redis(**probe_kwargs)
-
-            try:
-                probe.ping()
-
-            finally:
-                probe.close()
-
-        except Exception:
-            kumander.ping(
-                url,
-                "Redis",
-                addresses=address,
+        probe_kwargs = {
+            k: v
+            for k, v in kwargs.items()
+            if k
+            in (
+                "host",
+                "port",
+                "db",
+                "username",
+                "password",
+                "ssl",
+                "ssl_keyfile",
+                "ssl_certfile",
+                "ssl_cert_reqs",
+                "ssl_ca_certs",
+                "ssl_ca_data",
+                "ssl_check_hostname",
+                "unix_socket_path",
+                "encoding",
+                "encoding_errors",
+                "client_name",
             )
+        }
+        probe_kwargs["socket_timeout"] = timeout
+        probe_kwargs["socket_connect_timeout"] = timeout
+        # One attempt; the monitor probes again on its own schedule.
+        probe_kwargs["retry"] = None
+
+        probe = ClientProbe(
+            lambda: Redis(**probe_kwargs),
+            lambda probe_client: probe_client.ping(),
+        )
 
-            raise
+        health_monitor.watch("Redis", address, probe, url)
+        health_monitor.check("Redis", address)
 
         return client
 
@@ -112,3 +100,25 @@ class redis(RedisHub, metaclass=RedisMeta):
         ],
         health_check_interval=60,
     )
+
+    @classmethod
+    def pipelined(
+        cls,
+        name: str = "",
+        max_commands: Optional[int] = None,
+        window: Optional[float] = None,
+    ) -> AutoPipeline:
+        """
+        A new auto-pipelining proxy of the ``name`` client, on each call.
+
+        ``redis.pipelined`` is this method, not the client named
+        ``pipelined``; get that one with ``redis("pipelined")``.
+
+        See ``carabao.constants.redis_pipeline`` for the options.
+        """
+
+        return AutoPipeline(
+            cls.get(name),
+            max_commands=max_commands,
+            window=window,
+        )
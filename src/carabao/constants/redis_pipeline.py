@@ -0,0 +1,359 @@
+"""Auto-pipelining for the ``redis``/``aredis`` hubs.
+
+Each command on a Redis client costs a round trip. The proxies below queue the
+commands instead, and send them together in one (non-transactional) pipeline.
+
+``redis.pipelined(name)`` returns an ``AutoPipeline``: commands return a
+``PipelineResult`` right away, and the pipeline is sent once a result is read,
+once ``REDIS_PIPELINE_MAX`` commands are queued, once the first queued command
+is ``REDIS_PIPELINE_WINDOW`` seconds old (checked as commands are queued), or
+when the ``with`` block ends — e.g. around the work for one lane item::
+
+    with redis.pipelined("cache") as r:
+        hits = [r.get(key) for key in keys]
+        r.incr("lookups")
+
+    values = [hit.value for hit in hits]
+
+``aredis.pipelined(name)`` returns an ``AsyncAutoPipeline``: the commands the
+tasks sharing it issue within ``REDIS_PIPELINE_WINDOW`` seconds (0 coalesces
+those of the same event loop pass) are sent together, and each command returns
+a future of its reply::
+
+    cache = aredis.pipelined("cache")
+
+    values = await asyncio.gather(*(cache.get(key) for key in keys))
+
+Both return a new proxy on each call; keep the one whose commands should be
+sent together.
+
+Commands that don't return a reply (``pubsub``, ``lock``, ``scan_iter``, ...)
+are passed through to the client.
+"""
+
+import asyncio
+from time import monotonic
+from typing import Any, List, Optional, Set
+
+from ._constants import C
+
+# Not pipelined: they return objects or iterators, not a command's reply.
+_PASSTHROUGH = {
+    "close",
+    "aclose",
+    "hscan_iter",
+    "lock",
+    "monitor",
+    "pipeline",
+    "pubsub",
+    "register_script",
+    "scan_iter",
+    "sscan_iter",
+    "transaction",
+    "zscan_iter",
+}
+
+
+def _max_commands(max_commands: Optional[int]):
+    return max(
+        max_commands
+        if max_commands is not None
+        else C(
+            "REDIS_PIPELINE_MAX",
+            cast=int,
+            default=100,
+        ),
+        1,
+    )
+
+
+def _window(window: Optional[float]):
+    return (
+        window
+        if window is not None
+        else C(
+            "REDIS_PIPELINE_WINDOW",
+            cast=float,
+            default=0,
+        )
+    )
+
+
+class PipelineResult:
+    """
+    The reply of a queued command, available once its pipeline was sent.
+    """
+
+    def __init__(self, pipeline: "AutoPipeline"):
+        self.__pipeline = pipeline
+        self.__done = False
+        self.__value: Any = None
+
+    def __repr__(self):
+        if not self.__done:
+            return "<PipelineResult pending>"
+
+        return f"<PipelineResult {self.__value!r}>"
+
+    @property
+    def done(self) -> bool:
+        """Whether the command was sent."""
+
+        return self.__done
+
+    @property
+    def value(self) -> Any:
+        """
+        The command's reply. Sends the pipeline first, if it's still queued.
+
+        Raises:
+            Exception: The command's error.
+        """
+
+        if not self.__done:
+            self.__pipeline.flush()
+
+        if isinstance(self.__value, Exception):
+            raise self.__value
+
+        return self.__value
+
+    def _set(self, value: Any):
+        self.__value = value
+        self.__done = True
+
+
+class AutoPipeline:
+    """
+    Queues the commands of a sync Redis client and sends them in pipelines.
+
+    Not thread safe; get one per thread (or per lane item) with
+    ``redis.pipelined(name)``.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_commands: Optional[int] = None,
+        window: Optional[float] = None,
+    ):
+        """
+        Args:
+            client: The ``redis.Redis`` client.
+            max_commands: The most commands per pipeline.
+                Defaults to REDIS_PIPELINE_MAX.
+            window: The longest a command stays queued, in seconds (as long
+                as commands keep being queued). 0 sets no limit.
+                Defaults to REDIS_PIPELINE_WINDOW.
+        """
+
+        self.client = client
+        self.max_commands = _max_commands(max_commands)
+        self.window = _window(window)
+        self.__pipeline = client.pipeline(transaction=False)
+        self.__results: List[PipelineResult] = []
+        self.__started = 0.0
+
+    def __len__(self):
+        return len(self.__results)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is None:
+            self.flush()
+
+            return False
+
+        # The queued commands are dropped; reading their results must not
+        # look like a nil reply.
+        results, self.__results = self.__results, []
+        dropped = RuntimeError("Not sent; the pipeline's `with` block raised.")
+        dropped.__cause__ = error
+
+        self.__pipeline.reset()
+
+        for result in results:
+            result._set(dropped)
+
+        return False
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+
+        if name.startswith("_") or name in _PASSTHROUGH or not callable(attribute):
+            # Keep the order of what was queued before.
+            self.flush()
+
+            return attribute
+
+        def command(*args, **kwargs) -> PipelineResult:
+            if (
+                self.__results
+                and self.window > 0
+                and monotonic() - self.__started >= self.window
+            ):
+                self.flush()
+
+            getattr(self.__pipeline, name)(*args, **kwargs)
+
+            if not self.__results:
+                self.__started = monotonic()
+
+            result = PipelineResult(self)
+
+            self.__results.append(result)
+
+            if len(self.__results) >= self.max_commands:
+                self.flush()
+
+            return result
+
+        return command
+
+    def flush(self):
+        """
+        Sends the queued commands.
+
+        Each command's error is kept in its result. If the pipeline can't be
+        sent at all, every result gets the error, and it's raised.
+        """
+
+        if not self.__results:
+            return
+
+        results, self.__results = self.__results, []
+
+        try:
+            replies = self.__pipeline.execute(raise_on_error=False)
+
+        except Exception as e:
+            for result in results:
+                result._set(e)
+
+            raise
+
+        for result, reply in zip(results, replies):
+            result._set(reply)
+
+
+class AsyncAutoPipeline:
+    """
+    Coalesces the commands of an async Redis client into pipelines.
+
+    Shared by the tasks of one event loop; get one with
+    ``aredis.pipelined(name)``.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_commands: Optional[int] = None,
+        window: Optional[float] = None,
+    ):
+        """
+        Args:
+            client: The ``redis.asyncio.Redis`` client.
+            max_commands: The most commands per pipeline.
+                Defaults to REDIS_PIPELINE_MAX.
+            window: How long commands are collected before they are sent, in
+                seconds. 0 sends them on the event loop's next pass.
+                Defaults to REDIS_PIPELINE_WINDOW.
+        """
+
+        self.client = client
+        self.max_commands = _max_commands(max_commands)
+        self.window = _window(window)
+        self.__pipeline: Optional[Any] = None
+        self.__futures: List["asyncio.Future[Any]"] = []
+        self.__timer: Optional[asyncio.Handle] = None
+        self.__sending: Set["asyncio.Task[None]"] = set()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+
+        if name.startswith("_") or name in _PASSTHROUGH or not callable(attribute):
+            return attribute
+
+        def command(*args, **kwargs) -> "asyncio.Future[Any]":
+            loop = asyncio.get_running_loop()
+
+            if self.__pipeline is None:
+                self.__pipeline = self.client.pipeline(transaction=False)
+
+                if self.window > 0:
+                    self.__timer = loop.call_later(self.window, self.__send)
+
+                else:
+                    self.__timer = loop.call_soon(self.__send)
+
+            getattr(self.__pipeline, name)(*args, **kwargs)
+
+            future = loop.create_future()
+
+            self.__futures.append(future)
+
+            if len(self.__futures) >= self.max_commands:
+                self.__send()
+
+            return future
+
+        return command
+
+    async def flush(self):
+        """
+        Sends the queued commands now, and waits for every pipeline in flight.
+        """
+
+        self.__send()
+
+        if self.__sending:
+            await asyncio.gather(*self.__sending, return_exceptions=True)
+
+    def __send(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+
+            self.__timer = None
+
+        pipeline, self.__pipeline = self.__pipeline, None
+        futures, self.__futures = self.__futures, []
+
+        if pipeline is None:
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            self.__execute(pipeline, futures)
+        )
+
+        self.__sending.add(task)
+        task.add_done_callback(self.__sending.discard)
+
+    @staticmethod
+    async def __execute(pipeline, futures: List["asyncio.Future[Any]"]):
+        try:
+            replies = await pipeline.execute(raise_on_error=False)
+
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+
+            raise
+
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+            return
+
+        for future, reply in zip(futures, replies):
+            if future.done():
+                continue
+
+            if isinstance(reply, Exception):
+                future.set_exception(reply)
+
+            else:
+                future.set_result(reply)
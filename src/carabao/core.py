@@ -1,14 +1,28 @@
+import _thread
 import asyncio
+import os
+import signal
 import sys
-from typing import Optional, Type, Union, final
+import threading
+import traceback
+from fnmatch import fnmatchcase
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, final
 
 from l2l import AsyncLane, Lane
 from l2l import logger as l2l_logger
-from lazy_main import LazyMain
+from lazy_main import LazyMain, Terminate
 
 from .constants import C
 from .errors import MissingEnvError
+from .manifest import LaneManifest
+from .profiler import startup_profiler
+from .reloader import LaneReloader
+from .scheduler import QueueState, get_scheduler
 from .settings import Settings
+from .stats import RunStats
+from .supervisor import Supervisor
+from .wake import WakeSource
 
 # Set once we've wrapped logging.Logger.handle, so repeated Core.start()
 # calls don't stack the wrapper.
@@ -34,6 +48,26 @@ class Core:
     __sleep_min: Optional[float] = None
     __sleep_max: Optional[float] = None
     __processes: Optional[int] = None
+    __workers: Optional[int] = None
+    __hot_reload: Optional[bool] = None
+    __persistent_loop = False
+    __event_loop: Optional[asyncio.AbstractEventLoop] = None
+    __wake_source: Optional[WakeSource] = None
+    __stats: Optional[RunStats] = None
+    __error_handler: Optional[Callable[[Exception], Any]] = None
+    # Queue name -> matching primaries, as (sync active, sync passive,
+    # async active, async passive). Cleared by clear_lane_cache.
+    __queue_plans: Dict[str, Tuple[Tuple[type, ...], ...]] = {}
+    # Set by SIGTERM/SIGINT; the main loop stops at the next iteration boundary.
+    __stop_event = threading.Event()
+    # Cuts the idle wait short; set on a stop, or when a lane file changes.
+    __idle_event = threading.Event()
+    __shutdown_timer: Optional[threading.Timer] = None
+    __reloader: Optional[LaneReloader] = None
+    # Set by SIGHUP; the env files are read again at the next iteration boundary.
+    __config_event = threading.Event()
+    # Env file -> its modification time, when CONFIG_WATCH is on.
+    __config_mtimes: Optional[Dict[str, Optional[int]]] = None
 
     def __init__(self):
         raise Exception("This is not instantiable!")
@@ -107,6 +141,8 @@ class Core:
         sleep_min: Optional[float] = None,
         sleep_max: Optional[float] = None,
         processes: Optional[int] = None,
+        workers: Optional[int] = None,
+        hot_reload: Optional[bool] = None,
     ):
         """
         Starts the framework with the specified settings.
@@ -125,6 +161,9 @@ class Core:
             sleep_min: Overrides the SLEEP_MIN setting when not None.
             sleep_max: Overrides the SLEEP_MAX setting when not None.
             processes: Overrides the PROCESSES setting when not None.
+            workers: Overrides the WORKERS setting when not None.
+            hot_reload: Overrides the HOT_RELOAD setting when not None. Only
+                used in development mode.
         """
 
         cls.initialize(
@@ -144,6 +183,8 @@ class Core:
         cls.__sleep_min = sleep_min
         cls.__sleep_max = sleep_max
         cls.__processes = processes
+        cls.__workers = workers
+        cls.__hot_reload = hot_reload
 
         cls.__start()
 
@@ -162,106 +203,724 @@ class Core:
             settings: The settings object containing the LANE_DIRECTORIES configuration.
         """
 
-        _ = [
-            lane
-            for lane_directory in settings.value_of("LANE_DIRECTORIES")
-            for lane in Lane.load(lane_directory)
-        ]
+        lane_directories = settings.value_of("LANE_DIRECTORIES")
 
-    @staticmethod
-    def __has_active_primary(root, name: str) -> bool:
-        """Whether the registry has a matching ACTIVE (non-passive) primary.
+        # The dev UI lists every lane, so it always loads them all.
+        if (
+            not cls.__dev_mode
+            and C.QUEUE_NAMES
+            and C(
+                "LANE_MANIFEST",
+                cast=bool,
+                default=False,
+            )
+        ):
+            manifest = LaneManifest(lane_directories)
+
+            if not manifest.load(C.QUEUE_NAMES):
+                manifest.build()
+
+        else:
+            _ = [
+                lane
+                for lane_directory in lane_directories
+                for lane in Lane.load(lane_directory)
+            ]
 
-        Used to decide if the queue name is valid — passive lanes (always-on
-        watchers, condition matches every name) don't count, else a typo'd queue
-        would silently "match" a watcher.
+        cls.clear_lane_cache()
+
+    @classmethod
+    def clear_lane_cache(cls):
         """
+        Forgets which lanes serve each queue, so they are resolved again.
 
-        return any(
-            lane.primary() and not lane.passive() and lane.condition(name)
-            for lane in root.available_lanes()
-        )
+        Called by ``load_lanes``. Call it yourself if a lane's ``primary()``,
+        ``passive()`` or ``condition()`` answer changes at runtime.
+        """
+
+        cls.__queue_plans.clear()
 
     @staticmethod
-    def __has_any_primary(root, name: str) -> bool:
-        """Whether the registry has any matching primary — active or passive."""
+    def __match_primaries(root, name: str):
+        """The registry's primaries matching ``name``, as ``(active, passive)``.
 
-        return any(
-            lane.primary() and lane.condition(name)
-            for lane in root.available_lanes()
-        )
+        Run counts are ignored here, so the result can be cached; see
+        ``__any_available``.
+        """
+
+        active: List[type] = []
+        passive: List[type] = []
+
+        for lane in root.all_lanes():
+            if not lane.primary() or not lane.condition(name):
+                continue
+
+            (passive if lane.passive() else active).append(lane)
+
+        return tuple(active), tuple(passive)
+
+    @classmethod
+    def __queue_plan(cls, name: str):
+        """The primaries matching ``name`` in both registries, resolved once."""
+
+        plan = cls.__queue_plans.get(name)
+
+        if plan is None:
+            cls.__queue_plans[name] = plan = (
+                *cls.__match_primaries(Lane, name),
+                *cls.__match_primaries(AsyncLane, name),
+            )
+
+        return plan
 
     @staticmethod
-    def __run_lanes(
-        name: str,
-        print_lanes: bool = True,
-        processes: Optional[int] = None,
-    ):
-        """Runs matching lanes, auto-detecting sync vs async registries.
+    def __any_available(lanes: Tuple[type, ...]) -> bool:
+        """Whether any of the lanes is still under its ``max_run_count``."""
+
+        for lane in lanes:
+            max_run_count = lane.max_run_count()  # type: ignore[attr-defined]
 
-        Sync lanes run through ``Lane.start``; async lanes are drained inside
-        ``asyncio.run`` via ``AsyncLane.start``. Returns the collected results so
-        ``LazyMain`` can detect whether any work was done. A queue name may match
-        lanes in either registry (or both).
+            if max_run_count <= 0 or lane.get_run_count() < max_run_count:  # type: ignore[attr-defined]
+                return True
+
+        return False
+
+    @classmethod
+    def __resolve_queue(cls, name: str):
+        """Which registries to run for ``name``, as ``(has_sync, has_async)``.
+
+        A queue name may match lanes in either registry (or both). The matching
+        lanes are cached per queue; only their run counts are checked again.
+
+        Raises:
+            ValueError: If no active primary lane matches ``name``.
         """
 
+        sync_active, sync_passive, async_active, async_passive = cls.__queue_plan(
+            name
+        )
+
         # A queue is valid if an ACTIVE primary matches in either registry.
+        # Passive lanes (always-on watchers, condition matches every name)
+        # don't count, else a typo'd queue would silently "match" a watcher.
         if not (
-            Core.__has_active_primary(Lane, name)
-            or Core.__has_active_primary(AsyncLane, name)
+            cls.__any_available(sync_active) or cls.__any_available(async_active)
         ):
             raise ValueError(f"No lanes found for '{name}'!")
 
         # Run whichever registry has ANY match (active or passive) so passive
         # lanes (e.g. watchers) still run even when the active work is in the
         # other registry. require_active=False — validity already checked above.
-        has_sync = Core.__has_any_primary(Lane, name)
-        has_async = Core.__has_any_primary(AsyncLane, name)
+        return (
+            cls.__any_available(sync_active) or cls.__any_available(sync_passive),
+            cls.__any_available(async_active) or cls.__any_available(async_passive),
+        )
+
+    @staticmethod
+    def __resolve_queue_names(names: List[str]):
+        """Expands glob patterns in QUEUE_NAMES into primary lane names.
+
+        Plain names are kept as they are (an unknown one errors when it runs,
+        like a single QUEUE_NAME does). Duplicates are dropped.
+
+        Raises:
+            ValueError: If a pattern matches no active primary lane.
+        """
+
+        lane_names = [
+            lane_name
+            for root in (Lane, AsyncLane)
+            for lane in root.available_lanes()
+            if lane.primary() and not lane.passive()
+            for lane_name in lane.name()
+        ]
+        resolved: List[str] = []
+
+        for name in names:
+            if not any(char in name for char in "*?["):
+                matches = [name]
+
+            else:
+                matches = [
+                    lane_name
+                    for lane_name in lane_names
+                    if fnmatchcase(lane_name, name)
+                ]
+
+                if not matches:
+                    raise ValueError(f"No lanes found for '{name}'!")
+
+            resolved.extend(match for match in matches if match not in resolved)
+
+        return resolved
+
+    @classmethod
+    def __run_queues(
+        cls,
+        queues: List[QueueState],
+        print_lanes: bool = True,
+        processes: Optional[int] = None,
+    ):
+        """Runs the given queues once, auto-detecting sync vs async registries.
+
+        Sync lanes run through ``Lane.start``, one queue after another. Async
+        lanes of every queue run as concurrent tasks of one ``AsyncLane.start``
+        drain, inside ``asyncio.run`` (or on the long-lived loop when
+        PERSISTENT_LOOP is enabled). Results are counted into each queue's
+        ``RunStats`` as they are produced and dropped, so memory stays bounded
+        by the items in flight. An error in one queue is handed to the error
+        handler without stopping the others.
+
+        Once a stop is requested, the queues that have not started yet are
+        skipped, and the running ones stop at the next result their lanes
+        yield (their generators are closed, so ``finally`` blocks run).
+
+        Returns:
+            RunStats: The combined counters of all the queues.
+        """
+
+        total = RunStats()
+        async_queues: List[QueueState] = []
+
+        # A queue skipped by a stop must not report its previous run.
+        for queue in queues:
+            queue.stats = None
+
+        for queue in queues:
+            if cls.__stop_event.is_set():
+                break
+
+            queue.stats = stats = RunStats()
+
+            try:
+                has_sync, has_async = cls.__resolve_queue(queue.name)
 
-        results = []
+                if has_async:
+                    async_queues.append(queue)
 
-        if has_sync:
-            results.extend(
-                Lane.start(
-                    name,
+                if has_sync:
+                    results = Lane.start(
+                        queue.name,
+                        print_lanes=print_lanes,
+                        processes=processes,
+                        require_active=False,
+                    )
+
+                    try:
+                        for result in results:
+                            stats.add(result)
+
+                            if cls.__stop_event.is_set():
+                                break
+
+                    finally:
+                        results.close()
+
+                    # Both registries share (and reset) l2l's global error list.
+                    stats.errors += Lane.global_errors_count()
+
+            except Exception as e:
+                cls.__handle_error(e)
+
+        if async_queues and not cls.__stop_event.is_set():
+
+            async def _drain(queue: QueueState):
+                assert queue.stats is not None
+
+                results = AsyncLane.start(
+                    queue.name,
                     print_lanes=print_lanes,
                     processes=processes,
                     require_active=False,
                 )
-            )
 
-        if has_async:
+                try:
+                    async for result in results:
+                        queue.stats.add(result)
+
+                        if cls.__stop_event.is_set():
+                            break
 
-            async def _drain():
-                collected = []
+                finally:
+                    await results.aclose()
 
+            async def _drain_all(close_clients: bool):
                 try:
-                    async for result in AsyncLane.start(
-                        name,
-                        print_lanes=print_lanes,
-                        processes=processes,
-                        require_active=False,
-                    ):
-                        collected.append(result)
+                    return await asyncio.gather(
+                        *map(_drain, async_queues),
+                        return_exceptions=True,
+                    )
 
-                    return collected
                 finally:
                     # Async clients must close inside the loop (their close is a
                     # coroutine, and the loop is gone once asyncio.run returns).
-                    await Core.__aclose_clients()
+                    if close_clients:
+                        await Core.__aclose_clients()
+
+            if cls.__persistent_loop:
+                # Reuse one loop so the async hubs keep their connections;
+                # they are closed once, in __close_event_loop.
+                errors = cls.__get_event_loop().run_until_complete(
+                    _drain_all(close_clients=False)
+                )
+
+            else:
+                errors = asyncio.run(_drain_all(close_clients=True))
+
+            # The concurrent drains share l2l's global error list, so errors
+            # can only be told apart when a single queue ran.
+            if len(async_queues) == 1:
+                async_queues[0].stats.errors += AsyncLane.global_errors_count()  # type: ignore[union-attr]
+
+            else:
+                total.errors += AsyncLane.global_errors_count()
+
+            for error in errors:
+                if isinstance(error, Exception):
+                    cls.__handle_error(error)
 
-            results.extend(asyncio.run(_drain()))
+        for queue in queues:
+            if queue.stats is not None:
+                total.merge(queue.stats)
 
-        return results
+        return total
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns the counters of the last main loop iteration.
+
+        Returns:
+            Optional[RunStats]: The item, error and byte counts across the
+                queues that ran, or None if no iteration has finished yet.
+        """
+
+        return cls.__stats
+
+    @classmethod
+    def __run_iteration(cls, queues: List[QueueState], **kwargs):
+        """One main loop iteration: runs the due queues and reschedules them.
+
+        Keeps the iteration's ``RunStats`` so the loop knows whether any work
+        was done. A queue whose lane yields ``Terminate`` stops being scheduled;
+        the loop terminates once every queue has.
+        """
+
+        cls.__stats = None
+
+        due = [
+            queue
+            for queue in queues
+            if not queue.finished and queue.due <= monotonic()
+        ]
+
+        started = perf_counter()
+
+        try:
+            stats = cls.__run_queues(due, **kwargs)
+
+        finally:
+            cls.__flush_bulk_writers()
+
+            now = monotonic()
+
+            for queue in due:
+                queue.reschedule(now)
+
+                if queue.stats is not None and queue.stats.terminated:
+                    queue.finished = True
+
+        cls.__stats = stats
+
+        if stats.worked:
+            print(f"Done in {perf_counter() - started:.2f}s ({stats}).")
+
+        # LazyMain only needs to know if there was work, or a Terminate.
+        if all(queue.finished for queue in queues):
+            return (Terminate,)
+
+        return (stats.worked,)
+
+    @classmethod
+    def __handle_error(cls, e: Exception):
+        """Reports an error from a queue run, then calls the error handler."""
+
+        print("An error occurred.", e)
+
+        traceback.print_exception(type(e), e, e.__traceback__)
+
+        if cls.__error_handler is not None:
+            cls.__error_handler(e)
+
+    @classmethod
+    def __flush_bulk_writers(cls):
+        """Sends what the lanes queued in the ``mongo.bulk`` writers.
+
+        A failed flush keeps the operations queued for the next one.
+        """
+
+        from . import constants
+
+        mongo = constants.loaded("mongo")
+
+        if mongo is None:
+            return
+
+        try:
+            mongo.flush_bulk()
+
+        except Exception as e:
+            cls.__handle_error(e)
+
+    @classmethod
+    def __idle(cls, timeout: float):
+        """Waits between iterations, waking early if the wake source signals.
+
+        Falls back to a plain sleep if there is no wake source, or if it fails.
+        The wait ends early when a stop is requested; a wake source notices
+        between its server round trips (see ``WakeSource.interrupt``).
+
+        Returns:
+            bool: True if the wake source signalled before the timeout.
+        """
+
+        if timeout <= 0:
+            return False
+
+        wake_source = cls.__wake_source
+
+        if wake_source is None:
+            cls.__idle_event.wait(timeout)
+            cls.__idle_event.clear()
+
+            return False
+
+        deadline = monotonic() + timeout
+
+        try:
+            if wake_source.wait(timeout):
+                l2l_logger.trace("Woken up by {0}.", type(wake_source).__name__)
+
+                return True
+
+        except Exception as e:
+            print(f"Wake source failed, sleeping instead. {e}")
+
+            cls.__idle_event.wait(max(deadline - monotonic(), 0))
+
+        # The wait may have been cut short by a stop, a reload or a change.
+        cls.__idle_event.clear()
+
+        return False
+
+    @classmethod
+    def __watch_config(cls):
+        """Starts (or stops) watching the env files, as CONFIG_WATCH says."""
+
+        if C(
+            "CONFIG_WATCH",
+            cast=bool,
+            default=False,
+        ):
+            cls.__config_mtimes = cls.__config_files()
+
+        else:
+            cls.__config_mtimes = None
+
+    @staticmethod
+    def __config_files():
+        mtimes: Dict[str, Optional[int]] = {}
+
+        for filepath in C.env_files():
+            try:
+                mtimes[filepath] = os.stat(filepath).st_mtime_ns
+
+            except OSError:
+                mtimes[filepath] = None
+
+        return mtimes
+
+    @classmethod
+    def __reload_config(cls, settings: Type[Settings]):
+        """Reads the env files again, on SIGHUP or if a watched one changed.
+
+        The settings snapshot is refreshed, so SLEEP_MIN/SLEEP_MAX, PROCESSES,
+        LOG_INCLUDE/LOG_EXCLUDE, ... apply from this iteration on; the loop
+        rebuilds the queues' schedulers if SCHEDULER/BACKOFF_FACTOR/
+        BACKOFF_JITTER changed, and replans the queues if QUEUE_NAME did. What was given to
+        ``Core.start`` still wins.
+
+        Returns:
+            bool: True if the configuration was reloaded.
+        """
+
+        if not cls.__config_event.is_set() and (
+            cls.__config_mtimes is None
+            or cls.__config_mtimes == cls.__config_files()
+        ):
+            return False
+
+        cls.__config_event.clear()
+
+        try:
+            C.reload_env()
+            settings.refresh()
+            cls.__watch_config()
+
+        except Exception as e:
+            cls.__handle_error(e)
+
+            return False
+
+        print("Reloaded the configuration.")
+
+        return True
+
+    @classmethod
+    def __replan_queues(
+        cls,
+        settings: Type[Settings],
+        queues: List[QueueState],
+        queue_names: List[str],
+        queue_state: Callable[[str], QueueState],
+    ):
+        """The queues for a QUEUE_NAME changed by a reload.
+
+        The lanes the new names need are loaded first (with LANE_MANIFEST,
+        only some were). The queues still named keep their state; if the new
+        names can't be resolved, the current queues are kept.
+
+        Returns:
+            List[QueueState]: The queues to run from now on.
+        """
+
+        try:
+            cls.load_lanes(settings)
+
+            names = cls.__resolve_queue_names(queue_names)
+
+        except Exception as e:
+            cls.__handle_error(e)
+
+            return queues
+
+        current = {queue.name: queue for queue in queues}
+
+        print(f"Now serving {', '.join(names) or 'no queues'}.")
+
+        return [current.get(name) or queue_state(name) for name in names]
+
+    @classmethod
+    def __reload_lanes(cls):
+        """Re-imports the changed lane modules, if hot reload saw any.
+
+        Returns:
+            bool: True if some lane modules were reloaded.
+        """
+
+        reloader = cls.__reloader
+
+        if reloader is None or not reloader.pending():
+            return False
+
+        # The cached plans hold the old lane classes; drop them first so the
+        # reload can garbage collect those classes out of the registries.
+        cls.clear_lane_cache()
+
+        modules = reloader.reload()
+
+        if not modules:
+            return False
+
+        print(f"Reloaded {', '.join(modules)}.")
+
+        return True
+
+    @classmethod
+    def __wait_for_changes(cls):
+        """Blocks until a lane file changes, or a stop is requested.
+
+        Returns:
+            bool: True if a lane file changed.
+        """
+
+        print("Waiting for changes...")
+
+        while not cls.__stop_event.is_set():
+            if cls.__reloader is not None and cls.__reloader.pending():
+                return True
+
+            # Wakes up to re-check the debounce, and to notice signals.
+            cls.__idle_event.wait(0.1)
+            cls.__idle_event.clear()
+
+        return False
+
+    @classmethod
+    def __install_signal_handlers(cls, timeout: float):
+        """Makes SIGTERM/SIGINT stop the main loop gracefully.
+
+        The first signal stops new iterations from starting, and the running
+        lanes stop at their next result. If the iteration is still running after
+        ``timeout`` seconds, or if a second signal arrives, it is interrupted
+        with a ``KeyboardInterrupt``.
+
+        SIGHUP reloads the configuration at the next iteration boundary.
+
+        Signal handlers can only be installed from the main thread (``moo dev``
+        runs the pipeline in a worker thread); elsewhere this does nothing.
+
+        Returns:
+            dict: The replaced handlers, to restore once the loop is done.
+        """
+
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        def _on_signal(signum, frame):
+            if cls.__stop_event.is_set():
+                # A second signal, or the deadline (see _interrupt).
+                raise KeyboardInterrupt
+
+            print(
+                f"Received {signal.Signals(signum).name}, "
+                f"stopping after the current item (up to {timeout:.2f}s)..."
+            )
+
+            cls.__stop_event.set()
+            cls.__idle_event.set()
+
+            cls.__shutdown_timer = timer = threading.Timer(
+                max(timeout, 0),
+                _interrupt,
+            )
+            timer.daemon = True
+
+            timer.start()
+
+        def _interrupt():
+            # Re-enters _on_signal as a SIGINT. A signal sent to the main thread
+            # also cuts a blocking call short (e.g. a sleep, or a socket read);
+            # interrupt_main only takes effect once it returns.
+            if hasattr(signal, "pthread_kill"):
+                signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)  # type: ignore[arg-type]
+
+            else:
+                _thread.interrupt_main()
+
+        def _on_reload(signum, frame):
+            cls.__config_event.set()
+            cls.__idle_event.set()
+
+        handlers = {
+            signum: signal.signal(signum, _on_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        if hasattr(signal, "SIGHUP"):
+            handlers[signal.SIGHUP] = signal.signal(signal.SIGHUP, _on_reload)
+
+        return handlers
+
+    @classmethod
+    def __restore_signal_handlers(cls, handlers: Dict[int, Any]):
+        """Cancels the shutdown deadline and puts back the replaced handlers."""
+
+        if cls.__shutdown_timer is not None:
+            cls.__shutdown_timer.cancel()
+
+            cls.__shutdown_timer = None
+
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    @staticmethod
+    def __flush_notifications():
+        """Gives queued Uptime Kuma pushes a chance to go out before exiting."""
+
+        try:
+            from .helpers.kumander import kumander
+
+            kumander.flush(timeout=kumander.timeout)
+
+        except Exception:
+            pass
+
+    @staticmethod
+    def __flush_logs():
+        """Writes out any buffered log records before the process exits."""
+
+        try:
+            from loguru import logger
+
+            logger.complete()
+
+        except Exception:
+            pass
+
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+
+            except Exception:
+                pass
+
+    @classmethod
+    def __close_wake_source(cls):
+        """Releases the wake source, if any."""
+
+        if cls.__wake_source is None:
+            return
+
+        try:
+            cls.__wake_source.close()
+
+        except Exception:
+            pass
+
+        cls.__wake_source = None
+
+    @classmethod
+    def __get_event_loop(cls):
+        """The long-lived event loop used when PERSISTENT_LOOP is enabled."""
+
+        if cls.__event_loop is None or cls.__event_loop.is_closed():
+            cls.__event_loop = asyncio.new_event_loop()
+
+            asyncio.set_event_loop(cls.__event_loop)
+
+        return cls.__event_loop
+
+    @classmethod
+    def __close_event_loop(cls):
+        """Closes the async hubs and the long-lived event loop, if any."""
+
+        loop = cls.__event_loop
+
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            loop.run_until_complete(cls.__aclose_clients())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+
+        except Exception:
+            pass
+
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+            cls.__event_loop = None
 
     @staticmethod
     async def __aclose_clients():
         """Awaitable cleanup of async DB hubs, run inside the event loop."""
-        for hub_name in ("amongo", "aredis"):
-            try:
-                from . import constants
+        from . import constants
 
-                hub = getattr(constants, hub_name, None)
+        for hub_name in ("amongo", "aredis", "apg", "aes"):
+            try:
+                hub = constants.loaded(hub_name)
 
                 if hub is not None:
                     await hub.clear_all()
@@ -287,6 +946,8 @@ class Core:
             MissingEnvError: If required environment variables are not set
         """
 
+        startup_profiler.start()
+
         if not C.IN_DEVELOPMENT and not C.TESTING:
 
             def _level_name_allowed(name: str) -> bool:
@@ -345,90 +1006,328 @@ class Core:
         # info otherwise.
         l2l_logger.set_level("TRACE" if C.IN_DEVELOPMENT else "INFO")
 
+        startup_profiler.checkpoint("logging")
+
         settings = Settings.get()
 
+        startup_profiler.checkpoint("Settings.get")
+
         cls.__started = True
 
         cls.load_lanes(settings)
 
+        startup_profiler.checkpoint("load_lanes")
+
         C.load_all_properties()
 
-        if C.QUEUE_NAME is None:
+        startup_profiler.checkpoint("load_all_properties")
+
+        if not C.QUEUE_NAMES:
             raise MissingEnvError("QUEUE_NAME")
 
+        workers = (
+            cls.__workers
+            if cls.__workers is not None
+            else settings.value_of("WORKERS")
+        )
+
+        if workers is not None and workers > 1 and hasattr(os, "fork"):
+            # The supervisor installs signal handlers, which only the main
+            # thread can do; the dev UI runs the loop in a worker thread.
+            if cls.__dev_mode or (
+                threading.current_thread() is not threading.main_thread()
+            ):
+                print(
+                    f"WORKERS={workers} is ignored in development mode and "
+                    "outside the main thread; running a single worker."
+                )
+
+                cls.__serve(settings)
+
+                return
+
+            # Lanes are imported; the children inherit them via fork.
+            Supervisor(
+                workers,
+                lambda index: cls.__serve(settings, index),
+                # The workers forked so far report their own startup; a
+                # restarted one inherits the finished profiler.
+                on_started=lambda: startup_profiler.finish("fork workers"),
+            ).run()
+
+            return
+
+        cls.__serve(settings)
+
+    @classmethod
+    def __serve(
+        cls,
+        settings: Type[Settings],
+        worker_index: Optional[int] = None,
+    ):
+        """
+        Runs the main loop in this process, until it finishes or exits.
+
+        Args:
+            settings: The user-defined Settings class.
+            worker_index: The ordinal given by the supervisor to a forked
+                worker, None when not forked.
+        """
+
+        if worker_index is not None:
+            C["WORKER_INDEX"] = worker_index
+
+        cls.__stop_event.clear()
+        cls.__idle_event.clear()
+        cls.__config_event.clear()
+
         settings.before_start()
 
+        startup_profiler.checkpoint("before_start")
+
+        # Resolved once; the loop reads plain attributes from here on.
+        snapshot = settings.refresh()
+
         exit_on_finish = (
             cls.__exit_on_finish
             if cls.__exit_on_finish is not None
-            else settings.value_of("EXIT_ON_FINISH")
+            else snapshot.EXIT_ON_FINISH
         )
 
         run_once = (
             cls.__single_run
             if cls.__single_run is not None
-            else settings.value_of("SINGLE_RUN")
+            else snapshot.SINGLE_RUN
         )
 
         processes = (
             cls.__processes
             if cls.__processes is not None
-            else settings.value_of("PROCESSES")
+            else snapshot.PROCESSES
         )
 
-        main = LazyMain(
-            main=cls.__run_lanes,
-            run_once=run_once,
-            sleep_min=lambda: (
-                cls.__sleep_min
-                if cls.__sleep_min is not None
-                else settings.value_of("SLEEP_MIN")
-            ),
-            sleep_max=lambda: (
-                cls.__sleep_max
-                if cls.__sleep_max is not None
-                else settings.value_of("SLEEP_MAX")
-            ),
-            exit_on_finish=exit_on_finish,
-            exit_delay=settings.value_of("EXIT_DELAY"),
-            error_handler=settings.error_handler,
+        cls.__persistent_loop = snapshot.PERSISTENT_LOOP
+        cls.__wake_source = settings.wake_source()
+
+        if cls.__wake_source is not None:
+            cls.__wake_source.interrupt = cls.__idle_event
+        cls.__error_handler = settings.error_handler
+
+        hot_reload = (
+            cls.__hot_reload
+            if cls.__hot_reload is not None
+            else snapshot.HOT_RELOAD
         )
 
-        for loop in main:
-            loop(
-                C.QUEUE_NAME,
-                print_lanes=False,
-                processes=processes,
+        if cls.__dev_mode and hot_reload:
+            cls.__reloader = LaneReloader(
+                snapshot.LANE_DIRECTORIES,
+                on_change=cls.__idle_event.set,
+            ).start()
+
+        # Each queue gets its own scheduler, so their backoffs are independent.
+        # The current snapshot, so Settings.refresh() applies.
+        def scheduler():
+            current = settings.snapshot()
+
+            return get_scheduler(
+                current.SCHEDULER,
+                sleep_min=lambda: (
+                    cls.__sleep_min
+                    if cls.__sleep_min is not None
+                    else settings.snapshot().SLEEP_MIN
+                ),
+                sleep_max=lambda: (
+                    cls.__sleep_max
+                    if cls.__sleep_max is not None
+                    else settings.snapshot().SLEEP_MAX
+                ),
+                # Forked workers of one pod must not jitter in lockstep.
+                seed=hash((C.POD_INDEX, C.WORKER_INDEX)),
+                factor=current.BACKOFF_FACTOR,
+                jitter=current.BACKOFF_JITTER,
             )
 
-        try:
-            from .constants import mongo
+        def scheduling():
+            current = settings.snapshot()
 
-            mongo.clear_all()
+            return (
+                current.SCHEDULER,
+                current.BACKOFF_FACTOR,
+                current.BACKOFF_JITTER,
+            )
 
-        except Exception:
-            pass
+        def queue_state(name: str):
+            return QueueState(name, scheduler())
 
-        try:
-            from .constants import redis
+        scheduled_with = scheduling()
+
+        queue_names = [*C.QUEUE_NAMES]
+        queues = [
+            queue_state(name) for name in cls.__resolve_queue_names(queue_names)
+        ]
 
-            redis.clear_all()
+        signal_handlers = cls.__install_signal_handlers(
+            snapshot.SHUTDOWN_TIMEOUT,
+        )
 
-        except Exception:
-            pass
+        cls.__watch_config()
+
+        startup_profiler.checkpoint("setup")
 
         try:
-            from .constants import es
+            while True:
+                # Core idles between iterations itself (see __idle) so a wake
+                # source can cut the wait short; LazyMain only drives the
+                # iterations. Queue errors are reported by __handle_error, so
+                # LazyMain stays quiet. With hot reload, finishing only waits
+                # for the next change, so it never exits.
+                main = LazyMain(
+                    main=cls.__run_iteration,
+                    run_once=run_once,
+                    print_logs=False,
+                    sleep_min=0,
+                    sleep_max=0,
+                    exit_on_finish=exit_on_finish and cls.__reloader is None,
+                    exit_delay=snapshot.EXIT_DELAY,
+                    error_handler=cls.__handle_error,
+                )
 
-            es.clear_all()
+                for loop in main:
+                    if cls.__stop_event.is_set():
+                        break
+
+                    if cls.__reload_config(settings):
+                        if cls.__processes is None:
+                            processes = settings.snapshot().PROCESSES
+
+                        if scheduling() != scheduled_with:
+                            scheduled_with = scheduling()
+
+                            # Invalid settings keep the current schedulers.
+                            try:
+                                schedulers = [scheduler() for _ in queues]
+
+                            except ValueError as e:
+                                cls.__handle_error(e)
+
+                            else:
+                                # A new scheduler also drops the old backoff.
+                                for queue, new in zip(queues, schedulers):
+                                    queue.scheduler = new
+
+                        if C.QUEUE_NAMES != queue_names:
+                            queue_names = [*C.QUEUE_NAMES]
+                            queues[:] = cls.__replan_queues(
+                                settings,
+                                queues,
+                                queue_names,
+                                queue_state,
+                            )
+
+                        # Rescheduled with the new sleep times.
+                        for queue in queues:
+                            queue.due = 0
+
+                    if cls.__reload_lanes():
+                        for queue in queues:
+                            queue.due = 0
+
+                    loop(
+                        queues,
+                        print_lanes=False,
+                        processes=processes,
+                    )
 
-        except Exception:
-            pass
+                    # The lanes build their hub clients on first use.
+                    startup_profiler.finish("first iteration")
 
-        try:
-            from .constants import pg
+                    if cls.__stop_event.is_set():
+                        break
 
-            pg.clear_all()
+                    pending = [queue for queue in queues if not queue.finished]
 
-        except Exception:
-            pass
+                    if run_once or not pending:
+                        continue
+
+                    sleep_time = min(queue.due for queue in pending) - monotonic()
+                    stats = cls.__stats
+
+                    if stats is not None and stats.worked and sleep_time > 0:
+                        if cls.__wake_source is not None:
+                            print(f"Waiting for work (up to {sleep_time:.2f}s)...")
+
+                        else:
+                            print(f"Sleeping for {sleep_time:.2f}s...")
+
+                    if cls.__idle(sleep_time):
+                        # The signal doesn't say which queue has work; check all.
+                        for queue in pending:
+                            queue.due = 0
+
+                if (
+                    cls.__reloader is None
+                    or cls.__stop_event.is_set()
+                    or not cls.__wait_for_changes()
+                ):
+                    break
+
+                # Run the finished queues again, with the new lanes.
+                for queue in queues:
+                    queue.finished = False
+                    queue.due = 0
+
+        except KeyboardInterrupt:
+            # Only swallow the interrupt we raised for the shutdown deadline.
+            if not cls.__stop_event.is_set():
+                raise
+
+            print("Shutdown deadline exceeded, interrupting the iteration.")
+
+        finally:
+            # First, so the deadline can't interrupt the cleanup below.
+            cls.__restore_signal_handlers(signal_handlers)
+
+            # If it stopped before an iteration finished.
+            startup_profiler.finish("first iteration")
+
+            if cls.__reloader is not None:
+                cls.__reloader.stop()
+
+                cls.__reloader = None
+
+            cls.__close_wake_source()
+            cls.__close_event_loop()
+            # The hubs must still be open to send what's left.
+            cls.__flush_bulk_writers()
+            cls.__close_clients()
+
+            if cls.__stop_event.is_set():
+                print("Stopped.")
+
+            cls.__flush_notifications()
+            cls.__flush_logs()
+
+    @staticmethod
+    def __close_clients():
+        """Closes the sync DB hubs once the main loop is done, and stops
+        probing their addresses."""
+
+        from . import constants
+
+        # Only the ones that were used; the others were never imported.
+        for hub_name in ("mongo", "redis", "es", "pg", "pgpool"):
+            try:
+                hub = constants.loaded(hub_name)
+
+                if hub is not None:
+                    hub.clear_all()
+
+            except Exception:
+                pass
+
+        # Imported by the first hub client that's probed.
+        health = sys.modules.get("carabao.helpers.health")
+
+        if health is not None:
+            health.health_monitor.stop()
@@ -0,0 +1,387 @@
+"""Background health checks for the hubs' database addresses.
+
+Creating a hub client registers its address with ``health_monitor`` instead of
+pinging it on the spot. A daemon thread probes every registered address each
+``KUMA_PROBE_INTERVAL`` seconds, remembers whether it was up, and notifies
+Uptime Kuma (through ``kumander``) when a probe fails — all off the lanes' path.
+
+With ``KUMA_FAST_FAIL``, creating a client for an address whose last probe
+failed (less than ``KUMA_PROBE_TTL`` seconds ago) raises ``ConnectionError``
+right away, instead of waiting for the driver's own timeouts. Without it, a
+client is created whatever the address's state; the failures are only
+reported.
+"""
+
+import threading
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from carabao.constants import C
+
+try:
+    from loguru import logger
+
+    LOGGER_ERROR = logger.error
+
+except Exception:
+    LOGGER_ERROR = print
+
+T = TypeVar("T")
+
+
+class ClientProbe(Generic[T]):
+    """
+    A probe that keeps its client between probes.
+
+    The client is built on the first probe, and again after a failed one, so
+    a broken connection isn't reused. ``HealthMonitor`` closes it once the
+    address stops being watched.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], T],
+        ping: Callable[[T], object],
+    ):
+        """
+        Args:
+            connect: Builds the client, with short timeouts.
+            ping: Raises if the address is down.
+        """
+
+        self.connect = connect
+        self.ping = ping
+        self.__client: Optional[T] = None
+        self.__lock = threading.Lock()
+
+    def __call__(self):
+        with self.__lock:
+            if self.__client is None:
+                self.__client = self.connect()
+
+            try:
+                self.ping(self.__client)
+
+            except BaseException:
+                self.__close()
+
+                raise
+
+    def close(self):
+        """
+        Closes the client, if one is open.
+        """
+
+        with self.__lock:
+            self.__close()
+
+    def _after_fork(self):
+        # Its connection belongs to the parent, and the lock may be held.
+        self.__lock = threading.Lock()
+        self.__client = None
+
+    def __close(self):
+        client, self.__client = self.__client, None
+
+        if client is None:
+            return
+
+        try:
+            client.close()  # type: ignore[attr-defined]
+
+        except Exception:
+            pass
+
+
+def _close_probe(probe: Callable[[], object]):
+    close: Any = getattr(probe, "close", None)
+
+    if close is not None:
+        close()
+
+
+@dataclass
+class HealthState:
+    """
+    The last probe of an address.
+    """
+
+    up: bool
+    checked_at: float
+    """When it was probed (``time.monotonic``)."""
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Target:
+    kind: str
+    address: str
+    probe: Callable[[], object]
+    url: Optional[str]
+    due: float = 0.0
+
+
+class HealthMonitor:
+    """
+    Probes the watched addresses on a daemon thread and remembers their state.
+
+    One instance, ``health_monitor``, is shared by the hubs. Its thread starts
+    with the first watched address; ``Core`` stops it, and closes the probe
+    clients, when the main loop is done.
+    """
+
+    @property
+    def interval(self):
+        return C(
+            "KUMA_PROBE_INTERVAL",
+            cast=float,
+            default=30.0,
+        )
+
+    @property
+    def ttl(self):
+        return C(
+            "KUMA_PROBE_TTL",
+            cast=float,
+            default=90.0,
+        )
+
+    @property
+    def fast_fail(self):
+        return C(
+            "KUMA_FAST_FAIL",
+            cast=bool,
+            default=False,
+        )
+
+    def __init__(self):
+        self.__targets: Dict[str, _Target] = {}
+        self.__states: Dict[str, HealthState] = {}
+        self.__lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        # Replaced probes, closed by the thread (one may still be running).
+        self.__retired: List[Callable[[], object]] = []
+
+    def watch(
+        self,
+        kind: str,
+        address: str,
+        probe: Callable[[], object],
+        url: Optional[str] = None,
+    ):
+        """
+        Starts probing an address in the background, if it isn't already.
+
+        Args:
+            kind: What is probed, e.g. ``"MongoDB"``.
+            address: The ``host:port`` (comma separated) it's known by.
+            probe: Raises if the address is down. It should use its own
+                connection, with a timeout (see ``ClientProbe``); a ``close()``
+                method is called once it's replaced or no longer needed.
+            url: The Uptime Kuma push URL. Defaults to UPTIME_KUMA_URL.
+        """
+
+        with self.__lock:
+            target = self.__targets.get(address)
+
+            if target is not None:
+                # The latest client's probe and settings win.
+                replaced, target.probe = target.probe, probe
+                target.url = url
+
+                if replaced is not probe:
+                    self.__retired.append(replaced)
+
+            else:
+                self.__targets[address] = _Target(kind, address, probe, url)
+
+            # Also after a stop, once the hubs build their clients again.
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__stop.clear()
+
+                self.__thread = threading.Thread(
+                    target=self.__run,
+                    name="carabao-health",
+                    daemon=True,
+                )
+
+                self.__thread.start()
+
+        self.__wake.set()
+
+    def state(self, address: str) -> Optional[HealthState]:
+        """
+        The last probe of an address, if it's more recent than the TTL.
+        """
+
+        state = self.__states.get(address)
+
+        if state is None or monotonic() - state.checked_at > self.ttl:
+            return None
+
+        return state
+
+    def check(self, kind: str, address: str):
+        """
+        Fails fast if the address is known to be down and KUMA_FAST_FAIL is on.
+
+        Raises:
+            ConnectionError: If the last probe failed, within the TTL.
+        """
+
+        if not self.fast_fail:
+            return
+
+        state = self.state(address)
+
+        if state is not None and not state.up:
+            raise ConnectionError(
+                f"[{kind}] {address} is down (last probe: {state.error})."
+            )
+
+    def probe(self, address: str) -> Optional[HealthState]:
+        """
+        Probes an address now, in the calling thread.
+
+        Returns:
+            HealthState: The result, or None if the address isn't watched.
+        """
+
+        target = self.__targets.get(address)
+
+        if target is None:
+            return None
+
+        try:
+            target.probe()
+
+            state = HealthState(up=True, checked_at=monotonic())
+
+        except Exception as e:
+            state = HealthState(up=False, checked_at=monotonic(), error=e)
+
+        self.__states[address] = state
+
+        if not state.up:
+            self.__notify(target, state)
+
+        return state
+
+    def stop(self):
+        """
+        Stops the background thread and closes the probes' clients. Watching
+        an address starts it again; the probes reconnect on their next run.
+        """
+
+        self.__stop.set()
+        self.__wake.set()
+
+        thread = self.__thread
+
+        if thread is not None and thread is not threading.current_thread():
+            # Lets a probe in flight finish before its client is closed.
+            thread.join(1)
+
+        with self.__lock:
+            probes = [target.probe for target in self.__targets.values()]
+
+        for probe in probes + self.__take_retired():
+            _close_probe(probe)
+
+    def clear(self):
+        """
+        Forgets every address and its state, closing the probes' clients.
+        """
+
+        with self.__lock:
+            probes = [target.probe for target in self.__targets.values()]
+
+            self.__targets.clear()
+            self.__states.clear()
+
+        for probe in probes + self.__take_retired():
+            _close_probe(probe)
+
+    def _after_fork(self):
+        # The thread didn't survive the fork, and may have held the lock.
+        self.__lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__retired = []
+
+        for target in self.__targets.values():
+            after_fork = getattr(target.probe, "_after_fork", None)
+
+            if after_fork is not None:
+                after_fork()
+
+        if self.__targets:
+            self.__thread = threading.Thread(
+                target=self.__run,
+                name="carabao-health",
+                daemon=True,
+            )
+
+            self.__thread.start()
+
+    def __notify(self, target: _Target, state: HealthState):
+        from .kumander import kumander
+
+        if not target.url and not kumander.url:
+            LOGGER_ERROR(
+                f"[{target.kind}] {target.address} is unreachable! ({state.error})"
+            )
+
+            return
+
+        try:
+            kumander.ping(
+                target.url,
+                target.kind,
+                addresses=target.address,
+            )
+
+        except Exception as e:
+            LOGGER_ERROR(f"[{target.kind}] Uptime Kuma could not be notified! ({e})")
+
+    def __take_retired(self):
+        with self.__lock:
+            retired, self.__retired = self.__retired, []
+
+        return retired
+
+    def __run(self):
+        while not self.__stop.is_set():
+            for probe in self.__take_retired():
+                _close_probe(probe)
+
+            now = monotonic()
+
+            with self.__lock:
+                due = [
+                    target for target in self.__targets.values() if target.due <= now
+                ]
+
+            for target in due:
+                if self.__stop.is_set():
+                    return
+
+                self.probe(target.address)
+
+                target.due = monotonic() + self.interval
+
+            with self.__lock:
+                upcoming = min(
+                    (target.due for target in self.__targets.values()),
+                    default=now + self.interval,
+                )
+
+            self.__wake.wait(max(upcoming - monotonic(), 0))
+            self.__wake.clear()
+
+
+health_monitor = HealthMonitor()
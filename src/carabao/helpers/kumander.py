@@ -1,6 +1,11 @@
+import heapq
+import http.client
+import itertools
+import queue
+import threading
 import urllib.parse
-import urllib.request
-from typing import Optional
+from time import monotonic, sleep
+from typing import Callable, Dict, List, Optional, Tuple
 
 from carabao.constants import C
 
@@ -14,6 +19,16 @@ except Exception:
 
 
 class Kumander:
+    """
+    Pushes "unreachable" notifications to Uptime Kuma.
+
+    ``ping`` never blocks: notifications are queued for a background sender,
+    identical ones within ``UPTIME_KUMA_COALESCE`` seconds are sent once, and
+    each push URL gets at most one push every ``UPTIME_KUMA_MIN_INTERVAL``
+    seconds, over a reused connection. A push held back by that interval
+    waits on its own; the ones behind it, for other URLs, go out meanwhile.
+    """
+
     @property
     def format(self):
         return C(
@@ -43,37 +58,219 @@ class Kumander:
             default="up",
         )
 
+    @property
+    def coalesce(self):
+        return C(
+            "UPTIME_KUMA_COALESCE",
+            cast=float,
+            default=60.0,
+        )
+
+    @property
+    def min_interval(self):
+        return C(
+            "UPTIME_KUMA_MIN_INTERVAL",
+            cast=float,
+            default=1.0,
+        )
+
+    def __init__(
+        self,
+        send: Optional[Callable[[str, str, str], None]] = None,
+    ):
+        """
+        Args:
+            send: Sends a notification, given its push URL, kind and
+                addresses; raises if it failed. Defaults to a GET on the push
+                URL.
+        """
+
+        self.__send = send or self.__push
+        self.__queue: "queue.Queue[Tuple[str, str, str]]" = queue.Queue(maxsize=1000)
+        # (url, kind, addresses) -> when it was last queued.
+        self.__queued: Dict[Tuple[str, str, str], float] = {}
+        # url -> when it was last pushed to.
+        self.__pushed: Dict[str, float] = {}
+        # (scheme, netloc) -> an open connection.
+        self.__connections: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+        self.__lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+
     def ping(
         self,
         url: Optional[str],
         kind: str,
         addresses: str,
     ):
+        """
+        Queues an "unreachable" notification; returns right away.
+
+        Returns:
+            bool: False if an identical notification was queued recently, or
+                the queue is full.
+        """
+
         if not url:
             url = self.url
 
+        if not url:
+            return False
+
+        key = (url, kind, addresses)
+        now = monotonic()
+
+        with self.__lock:
+            last = self.__queued.get(key)
+
+            if last is not None and now - last < self.coalesce:
+                return False
+
+            try:
+                self.__queue.put_nowait(key)
+
+            except queue.Full:
+                return False
+
+            self.__queued[key] = now
+
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(
+                    target=self.__run,
+                    name="carabao-kumander",
+                    daemon=True,
+                )
+
+                self.__thread.start()
+
+        LOGGER_ERROR(f"[{kind}] {addresses} is unreachable!")
+
+        return True
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until the queued notifications were sent, e.g. before exiting.
+
+        Returns:
+            bool: False if some were still queued after ``timeout`` seconds.
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while self.__queue.unfinished_tasks:
+            if deadline is not None and monotonic() >= deadline:
+                return False
+
+            if self.__thread is None or not self.__thread.is_alive():
+                return False
+
+            sleep(0.05)
+
+        return True
+
+    def _after_fork(self):
+        # The sender didn't survive the fork; its queue and sockets are the
+        # parent's.
+        self.__queue = queue.Queue(maxsize=1000)
+        self.__connections = {}
+        self.__lock = threading.Lock()
+        self.__thread = None
+
+    def __run(self):
+        # (due, order, notification): the ones waiting for their URL's
+        # UPTIME_KUMA_MIN_INTERVAL, soonest first.
+        delayed: List[Tuple[float, int, Tuple[str, str, str]]] = []
+        order = itertools.count()
+
+        while True:
+            now = monotonic()
+
+            if delayed and delayed[0][0] <= now:
+                _, _, notification = heapq.heappop(delayed)
+
+            else:
+                try:
+                    notification = self.__queue.get(
+                        timeout=delayed[0][0] - now if delayed else None,
+                    )
+
+                except queue.Empty:
+                    continue
+
+            url, kind, addresses = notification
+            due = self.__pushed.get(url, float("-inf")) + self.min_interval
+
+            if due > monotonic():
+                # Still unfinished, so `flush` waits for it.
+                heapq.heappush(delayed, (due, next(order), notification))
+
+                continue
+
+            try:
+                self.__send(url, kind, addresses)
+
+            except Exception as e:
+                LOGGER_ERROR(f"[{kind}] Uptime Kuma could not be notified! ({e})")
+
+            finally:
+                self.__pushed[url] = monotonic()
+
+                self.__queue.task_done()
+
+    def __push(self, url: str, kind: str, addresses: str):
         parsed_url = urllib.parse.urlparse(url)
-        parsed_url = parsed_url._replace(
-            query=urllib.parse.urlencode(
-                {
-                    "status": self.status,
-                    "msg": self.format.format(
-                        APP_TAG=C.APP_TAG or "unknown",
-                        APP_NAME=C.APP_NAME or "unknown",
-                        POD_NAME=C.POD_NAME,
-                        KIND=kind,
-                        ADDRESSES=addresses,
-                    ),
-                }
-            ),
+        query = urllib.parse.urlencode(
+            {
+                "status": self.status,
+                "msg": self.format.format(
+                    APP_TAG=C.APP_TAG or "unknown",
+                    APP_NAME=C.APP_NAME or "unknown",
+                    POD_NAME=C.POD_NAME,
+                    KIND=kind,
+                    ADDRESSES=addresses,
+                ),
+            }
         )
-
-        urllib.request.urlopen(
-            urllib.parse.urlunparse(parsed_url),
-            timeout=self.timeout,
+        path = urllib.parse.urlunparse(
+            parsed_url._replace(scheme="", netloc="", query=query)
         )
 
-        LOGGER_ERROR(f"[{kind}] {addresses} is unreachable!")
+        # A kept-alive connection may have been closed by the server; retry once.
+        for attempt in range(2):
+            connection = self.__connection(parsed_url.scheme, parsed_url.netloc)
+
+            try:
+                connection.request("GET", path or "/")
+
+                response = connection.getresponse()
+
+                response.read()
+
+                if response.status >= 400:
+                    raise Exception(f"HTTP {response.status}")
+
+                return
+
+            except (http.client.HTTPException, OSError):
+                connection.close()
+
+                self.__connections.pop((parsed_url.scheme, parsed_url.netloc), None)
+
+                if attempt:
+                    raise
+
+    def __connection(self, scheme: str, netloc: str):
+        connection = self.__connections.get((scheme, netloc))
+
+        if connection is None:
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+
+            else:
+                connection = http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+            self.__connections[(scheme, netloc)] = connection
+
+        return connection
 
 
 kumander = Kumander()
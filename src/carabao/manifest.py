@@ -0,0 +1,308 @@
+"""A cached map of the lane modules, so a worker imports only what it runs.
+
+``Lane.load`` imports every module in ``LANE_DIRECTORIES`` — and everything
+they import — though a worker only serves its ``QUEUE_NAME``. With
+``LANE_MANIFEST``, the first start imports them all as usual, then writes down
+which primary lanes each module defines, under which names, and which modules
+their string lane references (``lanes = {1: "OTHER_LANE"}``) point to. Later
+starts read that back and import only the modules whose lanes can match the
+queues, the modules they reference, and the ones that must always run (passive
+primaries, and primaries with their own ``condition()``).
+
+Each module's entry is keyed on the file's modification time and size, and its
+SHA-256 when those changed; the packages' listings are kept too. Any
+difference — an edited, added or removed module — rebuilds the manifest.
+
+Lane names are recorded as ``name()`` returned them when it was built, so they
+shouldn't depend on the environment. Lanes reached only through
+``goto("NAME")`` aren't known either; reference them in ``lanes`` (or import
+their module) to keep them loaded.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from l2l import AsyncLane, Lane
+from l2l.mock import Mock
+
+from .constants import C
+
+_VERSION = 1
+
+
+class LaneManifest:
+    @property
+    def path(self):
+        if self.__path is not None:
+            return self.__path
+
+        return C(
+            "LANE_MANIFEST_PATH",
+            default=".carabao_lanes.json",
+        )
+
+    def __init__(
+        self,
+        lane_directories: Iterable[str],
+        path: Optional[str] = None,
+    ):
+        """
+        Args:
+            lane_directories: The LANE_DIRECTORIES import paths.
+            path: Where the manifest is kept. Defaults to LANE_MANIFEST_PATH.
+        """
+
+        self.lane_directories = [*lane_directories]
+        self.__path = path
+
+    def load(self, queue_names: Iterable[str]):
+        """
+        Imports the lane modules that can serve the queues, if the manifest is
+        up to date.
+
+        Args:
+            queue_names: The queue names; glob patterns are matched against the
+                recorded lane names.
+
+        Returns:
+            bool: False if the manifest is missing or stale; nothing was
+                imported then.
+        """
+
+        manifest = self.__read()
+
+        if manifest is None:
+            return False
+
+        modules: Dict[str, Dict[str, Any]] = manifest["modules"]
+        patterns = [*queue_names]
+        wanted: List[str] = [
+            name
+            for name, entry in modules.items()
+            if entry["always"]
+            or any(
+                fnmatchcase(lane_name, pattern)
+                for lane_name in entry["names"]
+                for pattern in patterns
+            )
+        ]
+        selected: Set[str] = set()
+
+        while wanted:
+            name = wanted.pop()
+
+            if name in selected or name not in modules:
+                continue
+
+            selected.add(name)
+            wanted.extend(modules[name]["requires"])
+
+        # In the order they were loaded, so packages come before their modules.
+        for name in modules:
+            if name in selected:
+                importlib.import_module(name)
+
+        return True
+
+    def build(self):
+        """
+        Imports every lane module, then writes the manifest.
+
+        Returns:
+            dict: The manifest.
+        """
+
+        loaded = [
+            module
+            for lane_directory in self.lane_directories
+            for module in Lane.load(lane_directory)
+        ]
+        lanes = [*Lane.all_lanes(), *AsyncLane.all_lanes()]
+        names = {module.__name__ for module in loaded}
+        modules: Dict[str, Dict[str, Any]] = {}
+
+        for module in loaded:
+            if module.__name__ in modules:
+                continue
+
+            entry = _stat(getattr(module, "__file__", None))
+            entry["listing"] = _listing(getattr(module, "__path__", None))
+            entry["names"] = []
+            entry["always"] = False
+            entry["requires"] = []
+
+            for lane in lanes:
+                if lane.__module__ != module.__name__:
+                    continue
+
+                if lane.primary():
+                    entry["names"].extend(lane.name())
+                    entry["always"] = entry["always"] or (
+                        lane.passive() or _has_condition(lane)
+                    )
+
+                for reference in _references(lane):
+                    target = lane.get_lane(reference)
+
+                    if target is not None and target.__module__ in names:
+                        entry["requires"].append(target.__module__)
+
+            modules[module.__name__] = entry
+
+        manifest = {
+            "version": _VERSION,
+            "lane_directories": self.lane_directories,
+            "modules": modules,
+        }
+
+        try:
+            self.__write(manifest)
+
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Failed to write the lane manifest to `{self.path}`: {e}")
+
+        return manifest
+
+    def __write(self, manifest: Dict[str, Any]):
+        """
+        Replaces the manifest file in one step, so a worker starting meanwhile
+        (or a crash) never leaves it half written.
+        """
+
+        # In the same directory, as os.replace can't cross file systems.
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path)),
+            prefix=".lane_manifest.",
+            suffix=".tmp",
+        )
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=2)
+
+            os.replace(temp_path, self.path)
+
+        except BaseException:
+            try:
+                os.remove(temp_path)
+
+            except OSError:
+                pass
+
+            raise
+
+    def __read(self) -> Optional[Dict[str, Any]]:
+        """The manifest, if it exists and matches the files on disk."""
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                manifest: Dict[str, Any] = json.load(file)
+
+        except (OSError, ValueError):
+            return None
+
+        if (
+            manifest.get("version") != _VERSION
+            or manifest.get("lane_directories") != self.lane_directories
+        ):
+            return None
+
+        for entry in manifest["modules"].values():
+            if not _unchanged(entry):
+                return None
+
+        return manifest
+
+
+def _stat(file: Optional[str]) -> Dict[str, Any]:
+    if not file:
+        return {"file": None}
+
+    stat = os.stat(file)
+
+    return {
+        "file": os.path.abspath(file),
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _hash(file),
+    }
+
+
+def _hash(file: str):
+    with open(file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _listing(paths: Optional[Iterable[str]]):
+    """What a package's folders hold that ``Lane.load`` would import."""
+
+    if paths is None:
+        return None
+
+    return {
+        os.path.abspath(path): sorted(
+            name
+            for name in os.listdir(path)
+            if name.endswith(".py")
+            or (
+                not (name.startswith("__") and name.endswith("__"))
+                and os.path.isdir(os.path.join(path, name))
+            )
+        )
+        for path in paths
+    }
+
+
+def _unchanged(entry: Dict[str, Any]):
+    try:
+        file = entry["file"]
+
+        if file is not None:
+            stat = os.stat(file)
+
+            if stat.st_size != entry["size"]:
+                return False
+
+            # Touched, e.g. by a checkout; the contents decide.
+            if stat.st_mtime_ns != entry["mtime"] and _hash(file) != entry["sha256"]:
+                return False
+
+        listing = entry["listing"]
+
+        return listing is None or _listing(listing) == listing
+
+    except OSError:
+        return False
+
+
+def _has_condition(lane: type):
+    """Whether the lane decides for itself which names it matches."""
+
+    for root in (Lane, AsyncLane):
+        if issubclass(lane, root):
+            return lane.condition.__func__ is not root.condition.__func__  # type: ignore[attr-defined]
+
+    return True
+
+
+def _references(lane: type):
+    """The lane names in a lane's ``lanes``, nested ones included."""
+
+    pending: List[Any] = [*lane.get_lanes().values()]  # type: ignore[attr-defined]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, str):
+            yield value
+
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+
+        elif isinstance(value, Mock):
+            pending.extend(value.lanes.values())
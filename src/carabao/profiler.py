@@ -0,0 +1,420 @@
+"""Startup profile: where the time (and memory) goes before the first item.
+
+With ``STARTUP_PROFILE`` on, ``Core`` splits its startup into phases — the
+imports, ``Settings.get()``, ``load_lanes``, ``C.load_all_properties()``,
+``before_start()``, the first iteration (where the lanes build their first hub
+clients) — and records each one's wall time and RSS growth, along with how
+long each module took to import. Once the first iteration ends, it prints a
+table and writes the same as JSON to ``STARTUP_PROFILE_PATH``.
+
+The imports are only itemized if ``STARTUP_PROFILE`` is in the process'
+environment when ``carabao`` is imported; set in a ``.env`` file, it's read
+after them, and they're one phase. Either way the overhead is a finder lookup
+and two clock reads per imported module, and nothing at all once the report is
+written, so it can stay on in staging.
+"""
+
+import json
+import os
+import sys
+import threading
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+# Imported before everything else in `carabao`, so the import-time knob can't
+# use `C` (nor fun_things, which it'd time).
+_FALSE = ("", "0", "f", "false", "n", "no", "off")
+
+
+def _rss() -> Optional[int]:
+    """The current resident set size in bytes, if the platform tells."""
+
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except Exception:
+        pass
+
+    try:
+        import resource
+
+        # The peak, not the current size; in KiB, except on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    except Exception:
+        return None
+
+
+def _uptime() -> Optional[float]:
+    """How long ago the process started, in seconds (Linux only)."""
+
+    try:
+        with open("/proc/uptime", "rb") as file:
+            uptime = float(file.read().split()[0])
+
+        with open("/proc/self/stat", "rb") as file:
+            # The command may contain spaces; the fields after it don't.
+            fields = file.read().rsplit(b")", 1)[1].split()
+
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+
+    except Exception:
+        return None
+
+
+class _ImportTimer:
+    """
+    A meta path finder that times each module's execution.
+
+    It finds the module's spec through the other finders, then wraps the
+    loader's ``exec_module`` for that one call.
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.__profiler = profiler
+        self.__local = threading.local()
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        spec = None
+
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+
+            if finder is self or find_spec is None:
+                continue
+
+            spec = find_spec(fullname, path, target)
+
+            if spec is not None:
+                break
+
+        loader = getattr(spec, "loader", None)
+
+        # Built-in and frozen modules are loaded by the importer classes
+        # themselves; there's no per-module instance to wrap.
+        if loader is None or isinstance(loader, type):
+            return spec
+
+        exec_module = getattr(loader, "exec_module", None)
+
+        if exec_module is None:
+            return spec
+
+        def timed_exec_module(module):
+            try:
+                del loader.exec_module
+
+            except AttributeError:
+                pass
+
+            stack: List[float] = self.__local.__dict__.setdefault("stack", [])
+
+            stack.append(0.0)
+
+            start = perf_counter()
+
+            try:
+                exec_module(module)
+
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+
+                if stack:
+                    stack[-1] += elapsed
+
+                self.__profiler._add_module(fullname, elapsed - children, elapsed)
+
+        try:
+            loader.exec_module = timed_exec_module
+
+        except Exception:
+            pass
+
+        return spec
+
+
+class StartupProfiler:
+    @property
+    def enabled(self):
+        from .constants import C
+
+        return C(
+            "STARTUP_PROFILE",
+            cast=bool,
+            default=False,
+        )
+
+    @property
+    def path(self):
+        from .constants import C
+
+        return C(
+            "STARTUP_PROFILE_PATH",
+            default="startup_profile.json",
+        )
+
+    @property
+    def top(self):
+        from .constants import C
+
+        return C(
+            "STARTUP_PROFILE_TOP",
+            cast=int,
+            default=20,
+        )
+
+    def __init__(self):
+        self.__active = False
+        self.__finished = False
+        self.__timer: Optional[_ImportTimer] = None
+        self.__started_at = 0.0
+        self.__last_at = 0.0
+        self.__last_rss: Optional[int] = None
+        # How many of the modules have their phase set.
+        self.__labeled = 0
+        self.__phases: List[Dict[str, Any]] = []
+        self.__modules: List[Dict[str, Any]] = []
+
+    @property
+    def active(self):
+        """Whether phases are being recorded."""
+
+        return self.__active
+
+    def install(self):
+        """
+        Starts recording, and times the imports from here on.
+
+        Called when ``carabao`` is imported, if ``STARTUP_PROFILE`` is set in
+        the environment.
+        """
+
+        if self.__active or self.__finished:
+            return
+
+        self.__active = True
+        self.__started_at = self.__last_at = perf_counter()
+        self.__last_rss = _rss()
+        uptime = _uptime()
+
+        if uptime is not None:
+            # The interpreter's own startup, before anything could be timed.
+            self.__phases.append(
+                {
+                    "name": "interpreter",
+                    "seconds": uptime,
+                    "rss_delta": None,
+                    "rss": self.__last_rss,
+                }
+            )
+
+        self.__timer = _ImportTimer(self)
+
+        sys.meta_path.insert(0, self.__timer)
+
+    def install_from_environ(self):
+        if os.environ.get("STARTUP_PROFILE", "").strip().lower() not in _FALSE:
+            self.install()
+
+    def start(self):
+        """
+        Records the imports so far as a phase; ``Core`` calls it first thing.
+
+        Starts recording now if ``STARTUP_PROFILE`` is only set in a ``.env``
+        file, or stops (without a report) if it's off there.
+        """
+
+        if self.__finished:
+            return
+
+        if not self.enabled:
+            self.__stop()
+
+            self.__phases.clear()
+            self.__modules.clear()
+
+            self.__labeled = 0
+
+            self.__finished = True
+
+            return
+
+        if not self.__active:
+            self.install()
+
+        self.checkpoint("import")
+
+    def checkpoint(self, name: str):
+        """
+        Ends a phase: what happened since the previous checkpoint is ``name``.
+        Does nothing unless recording.
+        """
+
+        if not self.__active:
+            return
+
+        now = perf_counter()
+        rss = _rss()
+
+        self.__phases.append(
+            {
+                "name": name,
+                "seconds": now - self.__last_at,
+                "rss_delta": (
+                    rss - self.__last_rss
+                    if rss is not None and self.__last_rss is not None
+                    else None
+                ),
+                "rss": rss,
+            }
+        )
+
+        # The modules imported since the previous checkpoint.
+        for module in self.__modules[self.__labeled :]:
+            module["phase"] = name
+
+        self.__labeled = len(self.__modules)
+        self.__last_at = now
+        self.__last_rss = rss
+
+    def finish(self, name: Optional[str] = None):
+        """
+        Stops recording, then prints and writes the report, once.
+
+        Args:
+            name: If given, a last checkpoint's name.
+        """
+
+        if not self.__active:
+            return
+
+        if name is not None:
+            self.checkpoint(name)
+
+        self.__stop()
+
+        self.__finished = True
+        report = self.report()
+
+        print(self.format(report))
+
+        path = self.path
+
+        if not path:
+            return
+
+        from .constants import C
+
+        # Set for the supervisor's forked workers; one file each. Not the
+        # cached C.WORKER_INDEX, which defaults to 0 in the supervisor.
+        worker_index = C(
+            "WORKER_INDEX",
+            cast=int,
+            default=None,
+            read_cache=False,
+        )
+
+        if worker_index is not None:
+            root, extension = os.path.splitext(path)
+            path = f"{root}.{worker_index}{extension}"
+
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+        except OSError as e:
+            print(f"Failed to write the startup profile to `{path}`: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        The phases and the imported modules (slowest first), as plain data.
+        """
+
+        return {
+            "pid": os.getpid(),
+            "seconds": self.__last_at - self.__started_at,
+            "rss": self.__last_rss,
+            "phases": [*self.__phases],
+            "modules": sorted(
+                self.__modules,
+                key=lambda module: module["self_seconds"],
+                reverse=True,
+            ),
+        }
+
+    def format(self, report: Dict[str, Any]) -> str:
+        """The report as a text table, with the ``top`` slowest imports."""
+
+        lines = [
+            f"Startup profile ({report['seconds']:.2f}s"
+            + (
+                f", RSS {_megabytes(report['rss'])}):"
+                if report["rss"] is not None
+                else "):"
+            ),
+            f"  {'phase':<24} {'wall':>10} {'RSS':>10} {'total':>10}",
+        ]
+
+        for phase in report["phases"]:
+            lines.append(
+                f"  {phase['name']:<24} {phase['seconds'] * 1000:>8.1f}ms"
+                f" {_megabytes(phase['rss_delta'], sign=True):>10}"
+                f" {_megabytes(phase['rss']):>10}"
+            )
+
+        modules = report["modules"][: max(self.top, 0)]
+
+        if modules:
+            lines.append(
+                f"  {'module':<48} {'self':>10} {'cumulative':>10}  phase",
+            )
+
+            for module in modules:
+                lines.append(
+                    f"  {module['name']:<48}"
+                    f" {module['self_seconds'] * 1000:>8.1f}ms"
+                    f" {module['cumulative_seconds'] * 1000:>8.1f}ms"
+                    f"  {module['phase']}"
+                )
+
+        return "\n".join(lines)
+
+    def _add_module(self, name: str, self_seconds: float, cumulative_seconds: float):
+        if not self.__active:
+            return
+
+        self.__modules.append(
+            {
+                "name": name,
+                "self_seconds": self_seconds,
+                "cumulative_seconds": cumulative_seconds,
+                # Set by the checkpoint that ends its phase.
+                "phase": None,
+            }
+        )
+
+    def __stop(self):
+        self.__active = False
+
+        if self.__timer is not None:
+            try:
+                sys.meta_path.remove(self.__timer)
+
+            except ValueError:
+                pass
+
+            self.__timer = None
+
+
+def _megabytes(size: Optional[int], sign=False):
+    if size is None:
+        return "-"
+
+    return f"{size / 1024 / 1024:{'+' if sign else ''}.1f}MB"
+
+
+startup_profiler = StartupProfiler()
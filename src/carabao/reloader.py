@@ -0,0 +1,422 @@
+"""Hot reload of lane modules for ``moo dev --watch``.
+
+A background watcher collects the lane files that changed on disk. At the next
+iteration boundary ``Core`` re-imports only those modules (plus the lane modules
+that imported names from them), so the l2l registries pick up the new classes
+while the settings, the hub connections and the dev UI stay as they are.
+
+Uses ``watchdog`` (inotify on Linux) when it is installed, and polls the files'
+modification times otherwise.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import traceback
+from time import monotonic
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from l2l import AsyncLane, Lane
+
+
+class LaneReloader:
+    """
+    Watches the lane directories and reloads the lane modules that changed.
+    """
+
+    def __init__(
+        self,
+        lane_directories: Iterable[str],
+        on_change: Optional[Callable[[], None]] = None,
+        poll_interval: float = 0.5,
+        debounce: float = 0.2,
+    ):
+        """
+        Args:
+            lane_directories: The LANE_DIRECTORIES import paths, already loaded.
+            on_change: Called from the watcher thread when a change is seen,
+                e.g. to cut the main loop's idle wait short.
+            poll_interval: How often the polling fallback checks the files,
+                in seconds.
+            debounce: How long the files must stay unchanged before they are
+                reloaded, so a half-written file isn't imported.
+        """
+
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.__last_change = 0.0
+        # Root folder -> the import path it corresponds to.
+        self.__roots: Dict[str, str] = {}
+        self.__changed: Set[str] = set()
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        # A watchdog observer, once started.
+        self.__observer: Any = None
+        self.__thread: Optional[threading.Thread] = None
+
+        for lane_directory in lane_directories:
+            module = importlib.import_module(lane_directory)
+
+            if hasattr(module, "__path__"):
+                for path in module.__path__:
+                    self.__roots[os.path.abspath(path)] = lane_directory
+
+            elif module.__file__:
+                self.__roots[os.path.abspath(module.__file__)] = lane_directory
+
+    def start(self):
+        """
+        Starts watching in the background.
+
+        Returns:
+            LaneReloader: This instance, for chaining.
+        """
+
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+
+        except ImportError:
+            self.__thread = threading.Thread(
+                target=self.__poll,
+                name="carabao-reloader",
+                daemon=True,
+            )
+
+            self.__thread.start()
+
+            return self
+
+        mark = self.__mark
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Opening a file for the reload is an event too; skip those.
+                if event.is_directory or event.event_type not in (
+                    "created",
+                    "modified",
+                    "moved",
+                    "deleted",
+                ):
+                    return
+
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    if path:
+                        mark(os.fsdecode(path))
+
+        observer = Observer()
+        observer.daemon = True
+
+        for root in self.__roots:
+            observer.schedule(
+                _Handler(),
+                root if os.path.isdir(root) else os.path.dirname(root),
+                recursive=True,
+            )
+
+        observer.start()
+
+        self.__observer = observer
+
+        return self
+
+    def stop(self):
+        """
+        Stops watching.
+        """
+
+        self.__stop.set()
+
+        if self.__observer is not None:
+            self.__observer.stop()
+
+            self.__observer = None
+
+    def pending(self):
+        """
+        Whether some lane files changed since the last ``reload``, and have
+        settled since.
+        """
+
+        with self.__lock:
+            return (
+                bool(self.__changed)
+                and monotonic() - self.__last_change >= self.debounce
+            )
+
+    def reload(self):
+        """
+        Re-imports the lane modules whose files changed.
+
+        A module that fails to import is reported and keeps its previous
+        version. A deleted file's module is dropped.
+
+        Returns:
+            List[str]: The names of the modules that were reloaded.
+        """
+
+        with self.__lock:
+            changed, self.__changed = self.__changed, set()
+
+        names = {
+            name for name in map(self.__module_name, sorted(changed)) if name
+        }
+
+        return reload_modules(
+            names,
+            prefixes=set(self.__roots.values()),
+        )
+
+    def __mark(self, path: str):
+        if not path.endswith(".py"):
+            return
+
+        path = os.path.abspath(path)
+
+        if self.__module_name(path) is None:
+            return
+
+        with self.__lock:
+            self.__changed.add(path)
+
+            self.__last_change = monotonic()
+
+        if self.on_change is not None:
+            self.on_change()
+
+    def __module_name(self, path: str):
+        """The import path of a lane file, or None if it's not a lane file."""
+
+        for root, import_path in self.__roots.items():
+            if path == root:
+                return import_path
+
+            if not path.startswith(root + os.sep):
+                continue
+
+            parts = os.path.relpath(path, root)[: -len(".py")].split(os.sep)
+
+            if parts[-1] == "__init__":
+                parts.pop()
+
+            return ".".join([import_path, *parts])
+
+        return None
+
+    def __snapshot(self):
+        snapshot: Dict[str, int] = {}
+
+        for root in self.__roots:
+            if not os.path.isdir(root):
+                try:
+                    snapshot[root] = os.stat(root).st_mtime_ns
+
+                except OSError:
+                    pass
+
+                continue
+
+            for folder, _, files in os.walk(root):
+                for file in files:
+                    if not file.endswith(".py"):
+                        continue
+
+                    path = os.path.join(folder, file)
+
+                    try:
+                        snapshot[path] = os.stat(path).st_mtime_ns
+
+                    except OSError:
+                        pass
+
+        return snapshot
+
+    def __poll(self):
+        previous = self.__snapshot()
+
+        while not self.__stop.wait(self.poll_interval):
+            current = self.__snapshot()
+
+            for path in {*previous, *current}:
+                if previous.get(path) != current.get(path):
+                    self.__mark(path)
+
+            previous = current
+
+
+def reload_modules(names: Iterable[str], prefixes: Iterable[str]):
+    """
+    Re-imports modules, then the modules under ``prefixes`` that use them.
+
+    A lane module that did ``from .other import SomeLane`` keeps the old class
+    until it is reloaded too, so dependents are reloaded after the modules
+    themselves. The replaced lane classes are retired (see ``_retire``), so
+    they stop running even while something still refers to them.
+
+    Args:
+        names: The module names to reload (or to import, if new).
+        prefixes: The import paths whose modules may depend on them.
+
+    Returns:
+        List[str]: The names of the modules that were reloaded successfully.
+    """
+
+    # New files aren't seen by the import system's cached directory listings.
+    importlib.invalidate_caches()
+
+    prefixes = tuple(prefixes)
+    pending = [*names]
+    done: List[str] = []
+    reloaded: List[str] = []
+
+    while pending:
+        name = pending.pop(0)
+
+        if name in done:
+            continue
+
+        done.append(name)
+
+        if not _reload(name):
+            continue
+
+        reloaded.append(name)
+
+        for dependent in _dependents(name, prefixes):
+            if dependent not in done and dependent not in pending:
+                pending.append(dependent)
+
+    return reloaded
+
+
+def _reload(name: str):
+    """Reloads, imports or drops one module. Returns True on success."""
+
+    module = sys.modules.get(name)
+
+    try:
+        if module is None:
+            importlib.import_module(name)
+
+        elif module.__spec__ is not None and module.__spec__.origin is not None:
+            if not os.path.exists(module.__spec__.origin):
+                _drop(name)
+
+            else:
+                _reexecute(module)
+
+        return True
+
+    except Exception:
+        print(f"Failed to reload '{name}', keeping the previous version.")
+
+        traceback.print_exc()
+
+        return False
+
+
+def _reexecute(module: ModuleType):
+    """Reloads a module, forgetting the classes it no longer defines.
+
+    ``importlib.reload`` runs the new code over the old namespace, so a lane
+    deleted from the file would otherwise stay registered.
+    """
+
+    namespace = dict(vars(module))
+    classes = _own_classes(module)
+
+    for key in classes:
+        delattr(module, key)
+
+    try:
+        importlib.reload(module)
+
+    except BaseException:
+        vars(module).update(namespace)
+
+        raise
+
+    _retire(classes.values())
+
+
+def _drop(name: str):
+    """Forgets a module whose file was deleted."""
+
+    module = sys.modules.pop(name, None)
+
+    if module is not None:
+        _retire(_own_classes(module).values())
+
+    parent, _, child = name.rpartition(".")
+    parent_module = sys.modules.get(parent)
+
+    if parent_module is not None and getattr(parent_module, child, None) is not None:
+        delattr(parent_module, child)
+
+
+def _own_classes(module: ModuleType) -> Dict[str, type]:
+    """The classes a module defines, by their name in it."""
+
+    return {
+        key: value
+        for key, value in vars(module).items()
+        if isinstance(value, type) and value.__module__ == module.__name__
+    }
+
+
+class _Retired:
+    """The base of the lane classes a reload replaced."""
+
+
+def _retire(classes: Iterable[type]):
+    """
+    Takes replaced lane classes out of the l2l registries.
+
+    The registries are the lane bases' ``__subclasses__()``, which only forget
+    a class once it's garbage collected; one still held somewhere (by the dev
+    UI, a form, a lane module that failed to reload) would keep running next to
+    its replacement. Rebasing it onto ``_Retired`` unlists it right away.
+    """
+
+    for cls in classes:
+        if not issubclass(cls, (Lane, AsyncLane)):
+            continue
+
+        try:
+            cls.__bases__ = (_Retired,)
+
+        except TypeError:
+            # An incompatible layout (e.g. __slots__); left to the collector.
+            pass
+
+
+def _dependents(name: str, prefixes: Tuple[str, ...]):
+    """The loaded modules under ``prefixes`` referring to module ``name``."""
+
+    target = sys.modules.get(name)
+
+    for other_name, module in [*sys.modules.items()]:
+        # A parent package only refers to its submodules; it needn't reload.
+        if (
+            other_name == name
+            or name.startswith(other_name + ".")
+            or not isinstance(module, ModuleType)
+        ):
+            continue
+
+        if not any(
+            other_name == prefix or other_name.startswith(prefix + ".")
+            for prefix in prefixes
+        ):
+            continue
+
+        for value in [*vars(module).values()]:
+            if (target is not None and value is target) or (
+                getattr(value, "__module__", None) == name
+            ):
+                yield other_name
+
+                break
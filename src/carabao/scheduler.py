@@ -0,0 +1,209 @@
+"""Schedulers deciding how long the main loop idles between iterations.
+
+Selected with the ``SCHEDULER`` setting:
+
+- ``uniform`` (default) sleeps a random time between SLEEP_MIN and SLEEP_MAX
+  after every iteration.
+- ``adaptive`` loops again immediately after an iteration that did work, and
+  backs off exponentially from SLEEP_MIN up to SLEEP_MAX after empty ones.
+"""
+
+from abc import ABC, abstractmethod
+from random import Random, uniform
+from typing import Callable, Optional
+
+from .stats import RunStats
+
+# The first backoff step when SLEEP_MIN is 0, so idle queues don't busy-poll.
+MIN_BACKOFF_STEP = 0.1
+
+
+class Scheduler(ABC):
+    """
+    Decides the idle time after each main loop iteration.
+    """
+
+    def __init__(
+        self,
+        sleep_min: Callable[[], float],
+        sleep_max: Callable[[], float],
+    ):
+        """
+        Args:
+            sleep_min: Returns the current SLEEP_MIN, in seconds.
+            sleep_max: Returns the current SLEEP_MAX, in seconds.
+        """
+
+        self.sleep_min = sleep_min
+        self.sleep_max = sleep_max
+
+    @abstractmethod
+    def next_delay(self, worked: bool) -> float:
+        """
+        Returns how long to idle before the next iteration.
+
+        Args:
+            worked: Whether the iteration that just finished did any work.
+
+        Returns:
+            float: The idle time, in seconds.
+        """
+
+
+class UniformScheduler(Scheduler):
+    """
+    Sleeps a random time between SLEEP_MIN and SLEEP_MAX, regardless of work.
+    """
+
+    def next_delay(self, worked: bool) -> float:
+        return uniform(self.sleep_min(), self.sleep_max())
+
+
+class AdaptiveScheduler(Scheduler):
+    """
+    Loops immediately after work, backing off exponentially while idle.
+
+    The first empty iteration waits SLEEP_MIN (at least ``MIN_BACKOFF_STEP``),
+    each further one multiplies the wait by ``factor``, up to SLEEP_MAX. Every
+    wait is spread by up to ``jitter`` (a fraction of the wait) so pods polling
+    the same source drift apart; the jitter is seeded with the pod index to
+    differ between pods.
+    """
+
+    def __init__(
+        self,
+        sleep_min: Callable[[], float],
+        sleep_max: Callable[[], float],
+        seed: int = 0,
+        factor: float = 2,
+        jitter: float = 0.1,
+    ):
+        """
+        Args:
+            sleep_min: Returns the first backoff step, in seconds.
+            sleep_max: Returns the backoff ceiling, in seconds.
+            seed: Seeds the jitter, typically the pod index.
+            factor: The backoff multiplier per empty iteration.
+            jitter: The maximum spread, as a fraction of the wait.
+
+        Raises:
+            ValueError: If ``factor`` isn't above 1, or ``jitter`` isn't in
+                [0, 1).
+        """
+
+        if not factor > 1:
+            raise ValueError(f"Invalid backoff factor: {factor} (must be > 1)")
+
+        if not 0 <= jitter < 1:
+            raise ValueError(f"Invalid backoff jitter: {jitter} (must be in [0, 1))")
+
+        super().__init__(sleep_min, sleep_max)
+
+        self.factor = factor
+        self.jitter = jitter
+        self.__random = Random(seed)
+        self.__misses = 0
+
+    def next_delay(self, worked: bool) -> float:
+        if worked:
+            self.__misses = 0
+
+            return 0
+
+        ceiling = self.sleep_max()
+        delay = min(
+            max(self.sleep_min(), MIN_BACKOFF_STEP) * self.factor**self.__misses,
+            ceiling,
+        )
+
+        # Stop growing once capped, so the exponent can't overflow.
+        if delay < ceiling:
+            self.__misses += 1
+
+        delay *= 1 + self.__random.uniform(-self.jitter, self.jitter)
+
+        return max(min(delay, ceiling), 0)
+
+
+class QueueState:
+    """
+    Scheduling state of one queue served by the main loop.
+
+    Each queue keeps its own scheduler, so a busy queue runs back to back while
+    an idle one in the same process backs off.
+    """
+
+    def __init__(self, name: str, scheduler: Scheduler):
+        """
+        Args:
+            name: The queue name.
+            scheduler: Decides the queue's idle time between runs.
+        """
+
+        self.name = name
+        self.scheduler = scheduler
+        # When the queue should run next, on the time.monotonic clock.
+        self.due = 0.0
+        # The counters of the queue's last run.
+        self.stats: Optional[RunStats] = None
+        # Set once a lane terminates the queue; it never runs again.
+        self.finished = False
+
+    def reschedule(self, now: float):
+        """
+        Schedules the next run after the one that just finished.
+
+        Args:
+            now: The current ``time.monotonic`` time.
+        """
+
+        worked = self.stats is not None and self.stats.worked
+
+        self.due = now + self.scheduler.next_delay(worked)
+
+
+def get_scheduler(
+    kind: str,
+    sleep_min: Callable[[], float],
+    sleep_max: Callable[[], float],
+    seed: int = 0,
+    factor: float = 2,
+    jitter: float = 0.1,
+) -> Scheduler:
+    """
+    Builds the scheduler selected by the SCHEDULER setting.
+
+    Args:
+        kind: ``uniform`` or ``adaptive`` (case-insensitive).
+        sleep_min: Returns the current SLEEP_MIN, in seconds.
+        sleep_max: Returns the current SLEEP_MAX, in seconds.
+        seed: Seeds the adaptive jitter, typically the pod index.
+        factor: The adaptive backoff multiplier.
+        jitter: The adaptive backoff spread.
+
+    Returns:
+        Scheduler: The scheduler instance.
+
+    Raises:
+        ValueError: If ``kind`` is not a known scheduler, or the adaptive
+            ``factor``/``jitter`` are out of range.
+    """
+
+    kind = kind.strip().lower()
+
+    if kind == "uniform":
+        return UniformScheduler(
+            sleep_min,
+            sleep_max,
+        )
+
+    if kind == "adaptive":
+        return AdaptiveScheduler(
+            sleep_min,
+            sleep_max,
+            seed=seed,
+            factor=factor,
+            jitter=jitter,
+        )
+
+    raise ValueError(f"Invalid scheduler: {kind}")
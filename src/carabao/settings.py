@@ -1,12 +1,15 @@
 import os
 from importlib import import_module
-from typing import Any, Iterable, Optional, final
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple, final
 
 from fun_things import lazy
 
 from .cfg.public_cfg import PUBLIC_CFG
 from .constants import C
 
+if TYPE_CHECKING:
+    from .wake import WakeSource
+
 
 class Settings:
     """
@@ -29,6 +32,17 @@ class Settings:
     A value of None or 1 will run lanes sequentially.
     """
 
+    WORKERS: int
+
+    """
+    The number of worker processes to fork.
+    
+    The settings and lanes are loaded once, then this many child processes are
+    forked from the warmed-up interpreter. Each child runs the main loop with
+    its own C.WORKER_INDEX, and is restarted with a backoff if it crashes.
+    A value of 1 runs in the current process.
+    """
+
     LANE_DIRECTORIES: Iterable[str]
 
     """
@@ -74,6 +88,55 @@ class Settings:
     for new work, even if no work is available.
     """
 
+    SCHEDULER: str
+
+    """
+    How the sleep time between lane executions is chosen.
+    
+    `"uniform"` sleeps a random time between SLEEP_MIN and SLEEP_MAX after every
+    execution. `"adaptive"` runs again immediately after an execution that did
+    work, and backs off exponentially from SLEEP_MIN up to SLEEP_MAX while no
+    work is available (see BACKOFF_FACTOR and BACKOFF_JITTER).
+    """
+
+    BACKOFF_FACTOR: float
+
+    """
+    Multiplier applied to the sleep time after each empty execution.
+    
+    Only used when SCHEDULER is `"adaptive"`.
+    """
+
+    BACKOFF_JITTER: float
+
+    """
+    Random spread applied to each adaptive sleep, as a fraction of it.
+    
+    The spread is seeded with POD_INDEX, so pods polling the same source drift
+    apart instead of waking in lockstep.
+    """
+
+    PERSISTENT_LOOP: bool
+
+    """
+    Keeps the async event loop alive between loop iterations.
+    
+    If True, async lanes run on one long-lived event loop, and the async hubs
+    (`amongo`, `aredis`) keep their connections until the framework stops.
+    Otherwise, each iteration builds a new event loop and closes the async hubs
+    when it finishes.
+    """
+
+    HOT_RELOAD: bool
+
+    """
+    Reloads changed lanes in development mode.
+    
+    If True, `moo dev` watches the LANE_DIRECTORIES and, when a lane file
+    changes, re-imports only the changed modules and runs the queue again,
+    keeping the settings, the hub connections and the dev UI alive.
+    """
+
     EXIT_ON_FINISH: bool
 
     """
@@ -92,6 +155,16 @@ class Settings:
     before exiting, allowing any final operations to complete.
     """
 
+    SHUTDOWN_TIMEOUT: float
+
+    """
+    Deadline for a graceful shutdown.
+    
+    On SIGTERM/SIGINT no new iteration starts, and the running lanes stop at
+    the next result they yield. If that takes longer than this many seconds,
+    the iteration is interrupted. The hubs are closed either way.
+    """
+
     @classmethod
     def get_all_fields(cls):
         """
@@ -151,6 +224,62 @@ class Settings:
 
         raise ValueError(f"Invalid setting key: {key}")
 
+    @classmethod
+    def snapshot(cls) -> "SettingsSnapshot":
+        """
+        Gets the resolved settings, as an immutable snapshot.
+
+        Reading a snapshot's attribute is a plain attribute load, unlike
+        `value_of`, so the main loop and the lanes can read it as often as
+        they like. It's taken on first use (the framework takes it at
+        startup), and only changes through `refresh`.
+
+        Returns:
+            SettingsSnapshot: The current snapshot.
+        """
+
+        snapshot = _SNAPSHOTS.get(cls)
+
+        if snapshot is None:
+            snapshot = cls.refresh()
+
+        return snapshot
+
+    @classmethod
+    def refresh(cls) -> "SettingsSnapshot":
+        """
+        Resolves every setting again, and replaces the snapshot.
+
+        Call it after changing a setting at runtime (e.g. `C["SLEEP_MAX"] = 10`).
+
+        Returns:
+            SettingsSnapshot: The new snapshot.
+        """
+
+        values = {}
+
+        for key in dict.fromkeys(cls.get_all_fields()):
+            try:
+                values[key] = cls.value_of(key)
+
+            except ValueError:
+                # Declared, but without a value anywhere; stays unset.
+                pass
+
+        snapshot_type = _SNAPSHOT_TYPES.get(cls)
+
+        if snapshot_type is None:
+            snapshot_type = _SNAPSHOT_TYPES[cls] = type(
+                f"{cls.__name__}Snapshot",
+                (SettingsSnapshot,),
+                {"__slots__": tuple(dict.fromkeys(cls.get_all_fields()))},
+            )
+
+        snapshot: SettingsSnapshot = snapshot_type(values)
+        _SNAPSHOTS[cls] = snapshot
+
+        return snapshot
+
     @classmethod
     def before_start(cls) -> Any:
         """
@@ -165,6 +294,22 @@ class Settings:
 
         pass
 
+    @classmethod
+    def wake_source(cls) -> Optional["WakeSource"]:
+        """
+        Hook method returning what the main loop waits on between iterations.
+
+        When a wake source is returned, the framework blocks on it instead of
+        sleeping, and runs the next iteration as soon as it signals. The sleep
+        time (SLEEP_MIN to SLEEP_MAX) becomes the wait timeout. The default
+        implementation returns None, which just sleeps.
+
+        Returns:
+            Optional[WakeSource]: The wake source to block on, or None.
+        """
+
+        return None
+
     @classmethod
     def error_handler(cls, e: Exception) -> Any:
         """
@@ -225,3 +370,63 @@ class Settings:
                 return attr
 
         return Settings
+
+
+class SettingsSnapshot:
+    """
+    The resolved values of a Settings class, frozen at one point in time.
+
+    Get it with `Settings.snapshot()`. Each setting is a slot, so reads are
+    plain attribute loads; the snapshot can't be changed, only replaced with
+    `Settings.refresh()`.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    # The framework's settings, as declared on `Settings`; a subclass' own
+    # settings are there too, but only the snapshot type made for it knows.
+    PROCESSES: Optional[int]
+    WORKERS: int
+    LANE_DIRECTORIES: Iterable[str]
+    DEPLOY_SAFELY: bool
+    SINGLE_RUN: bool
+    SLEEP_MIN: float
+    SLEEP_MAX: float
+    SCHEDULER: str
+    BACKOFF_FACTOR: float
+    BACKOFF_JITTER: float
+    PERSISTENT_LOOP: bool
+    HOT_RELOAD: bool
+    EXIT_ON_FINISH: bool
+    EXIT_DELAY: float
+    SHUTDOWN_TIMEOUT: float
+
+    def __init__(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, key: str):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __repr__(self):
+        values = ", ".join(f"{key}={value!r}" for key, value in self.as_dict().items())
+
+        return f"{type(self).__name__}({values})"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the settings that have a value, by name.
+        """
+
+        return {
+            key: getattr(self, key)
+            for key in type(self).__slots__
+            if hasattr(self, key)
+        }
+
+
+_SNAPSHOTS: Dict[type, SettingsSnapshot] = {}
+_SNAPSHOT_TYPES: Dict[type, type] = {}
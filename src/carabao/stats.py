@@ -0,0 +1,83 @@
+"""Per-iteration counters for the main loop.
+
+Lane results are consumed as they are produced and only counted, so a long
+generator pipeline never keeps its outputs around just to tell whether an
+iteration did any work.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from lazy_main import Terminate
+
+
+@dataclass
+class RunStats:
+    """
+    Counters for one main loop iteration.
+    """
+
+    items: int = 0
+    """The number of results the primary lanes yielded."""
+
+    truthy: int = 0
+    """The number of truthy results, which count as work done."""
+
+    errors: int = 0
+    """The number of errors the lanes recorded."""
+
+    bytes: int = 0
+    """
+    The total size of the bytes-like (``bytes``, ``bytearray``,
+    ``memoryview``) results. Other results, ``str`` included, aren't measured.
+    """
+
+    terminated: bool = False
+    """Whether a lane yielded ``Terminate`` to stop the main loop."""
+
+    def add(self, value: Any):
+        """
+        Counts a result, then lets it go.
+
+        Args:
+            value: A result yielded by a primary lane.
+        """
+
+        self.items += 1
+
+        if value is Terminate:
+            self.terminated = True
+
+        if value:
+            self.truthy += 1
+
+        if isinstance(value, (bytes, bytearray)):
+            self.bytes += len(value)
+
+        elif isinstance(value, memoryview):
+            self.bytes += value.nbytes
+
+    def merge(self, other: "RunStats"):
+        """
+        Adds another iteration's counters to these.
+
+        Args:
+            other: The counters to add.
+        """
+
+        self.items += other.items
+        self.truthy += other.truthy
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.terminated = self.terminated or other.terminated
+
+    @property
+    def worked(self):
+        """
+        Whether any result was truthy, i.e. the iteration did some work.
+        """
+
+        return self.truthy > 0
+
+    def __str__(self):
+        return f"{self.items} items, {self.errors} errors, {self.bytes} bytes"
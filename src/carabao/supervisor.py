@@ -0,0 +1,209 @@
+"""Pre-fork worker supervisor for ``moo run --workers N``.
+
+The parent process loads the settings and lanes once, then forks N children
+that inherit the warmed-up interpreter (copy-on-write) instead of paying N cold
+starts. Each child gets its own ordinal (``C.WORKER_INDEX``). A crashed child is
+restarted with an exponential backoff; a child that exits cleanly (e.g. after a
+SINGLE_RUN) is not.
+"""
+
+import os
+import signal
+import sys
+import traceback
+from time import monotonic, sleep
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Supervisor:
+    """
+    Forks and babysits long-lived worker processes.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        target: Callable[[int], None],
+        backoff_min: float = 1,
+        backoff_max: float = 60,
+        on_started: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            workers: The number of child processes to keep running.
+            target: Runs inside each child, given the child's ordinal.
+            backoff_min: The delay before restarting a child that crashed once.
+            backoff_max: The ceiling of the restart delay; a child that stayed
+                up this long resets its backoff.
+            on_started: Runs in the parent once the first workers are forked,
+                before it starts supervising them.
+        """
+
+        self.workers = workers
+        self.target = target
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.on_started = on_started
+        self.__children: Dict[int, Tuple[int, float]] = {}
+        self.__backoffs: Dict[int, float] = {}
+        self.__restarts: List[Tuple[float, int]] = []
+        self.__stopping: Optional[int] = None
+
+    def run(self):
+        """
+        Forks the workers and supervises them until they all exit cleanly,
+        or until the supervisor is told to stop (SIGTERM/SIGINT), in which
+        case the signal is forwarded to every child.
+        """
+
+        previous = {
+            signum: signal.signal(signum, self.__on_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        if hasattr(signal, "SIGHUP"):
+            # The workers reload their configuration; see Core.
+            previous[signal.SIGHUP] = signal.signal(signal.SIGHUP, self.__forward)
+
+        try:
+            for index in range(self.workers):
+                self.__spawn(index)
+
+            if self.on_started is not None:
+                self.on_started()
+
+            while self.__children or self.__restarts:
+                self.__reap()
+                self.__restart_due()
+
+                if self.__stopping is not None and not self.__children:
+                    break
+
+                sleep(0.1)
+
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def __on_signal(self, signum, frame):
+        self.__stopping = signum
+        self.__restarts.clear()
+
+        self.__forward(signum, frame)
+
+    def __forward(self, signum, frame):
+        for pid in self.__children:
+            try:
+                os.kill(pid, signum)
+
+            except ProcessLookupError:
+                pass
+
+    def __spawn(self, index: int):
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+
+        if pid == 0:
+            self.__run_child(index)
+
+        self.__children[pid] = (index, monotonic())
+
+        print(f"Worker {index} started (pid {pid}).")
+
+    def __run_child(self, index: int):
+        code = 0
+
+        try:
+            # Signals reach the child only through the supervisor, so a Ctrl+C
+            # at the terminal isn't delivered twice (which forces a stop).
+            os.setpgid(0, 0)
+
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+
+            if hasattr(signal, "SIGHUP"):
+                # Not the supervisor's forwarding; Core installs its own.
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+            self.target(index)
+
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+        except BaseException:
+            traceback.print_exc()
+
+            code = 1
+
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+            # Skip the parent's atexit handlers and buffers inherited by fork.
+            os._exit(code)
+
+    def __reap(self):
+        while self.__children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+
+            except ChildProcessError:
+                self.__children.clear()
+
+                return
+
+            if pid == 0:
+                return
+
+            if pid not in self.__children:
+                continue
+
+            index, started = self.__children.pop(pid)
+            code = _exit_code(status)
+
+            if code == 0 or self.__stopping is not None:
+                print(f"Worker {index} exited ({code}).")
+
+                continue
+
+            uptime = monotonic() - started
+            backoff = (
+                self.backoff_min
+                if uptime >= self.backoff_max
+                else min(
+                    self.__backoffs.get(index, self.backoff_min / 2) * 2,
+                    self.backoff_max,
+                )
+            )
+
+            self.__backoffs[index] = backoff
+
+            print(f"Worker {index} crashed ({code}), restarting in {backoff:.2f}s...")
+
+            self.__restarts.append((monotonic() + backoff, index))
+
+    def __restart_due(self):
+        if self.__stopping is not None:
+            return
+
+        now = monotonic()
+
+        for restart in [*self.__restarts]:
+            due, index = restart
+
+            if due > now:
+                continue
+
+            self.__restarts.remove(restart)
+            self.__spawn(index)
+
+
+def _exit_code(status: int):
+    """The exit code of a waited-for child, negative if a signal killed it."""
+
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+
+    return os.WEXITSTATUS(status)
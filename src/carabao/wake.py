@@ -0,0 +1,328 @@
+"""Wake sources the main loop can block on between iterations.
+
+Instead of sleeping blindly for ``SLEEP_MIN``..``SLEEP_MAX`` seconds, ``Core``
+waits on the wake source returned by ``Settings.wake_source()``, using the
+sleep as a timeout. A producer signals new work and the idle worker picks it up
+right away; if nothing arrives, the sleep runs out as before::
+
+    from carabao import Settings as S
+    from carabao.wake import RedisListWakeSource
+
+
+    class Settings(S):
+        @classmethod
+        def wake_source(cls):
+            return RedisListWakeSource("wake:articles")
+
+The drivers are only imported when a wake source is used.
+"""
+
+import math
+import select
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+
+class WakeSource(ABC):
+    """
+    Something the main loop can block on until new work may be available.
+    """
+
+    interrupt: Optional[threading.Event] = None
+    """
+    Set by ``Core`` to the event it sets on a stop (or a reload); a wait
+    should return False once it's set. A signal handler can't run while a
+    driver blocks on a socket, so long waits block in steps and check it in
+    between (see ``_wait_in_steps``).
+    """
+
+    @abstractmethod
+    def wait(self, timeout: float) -> bool:
+        """
+        Blocks until a wake signal arrives or ``timeout`` seconds pass.
+
+        Args:
+            timeout: The maximum time to block, in seconds.
+
+        Returns:
+            bool: True if a signal arrived, False if the timeout ran out.
+        """
+
+    def close(self):
+        """
+        Releases anything held by this wake source.
+
+        Called once when the framework stops. Does nothing by default.
+        """
+
+        pass
+
+    def _interrupted(self) -> bool:
+        return self.interrupt is not None and self.interrupt.is_set()
+
+    def _wait_in_steps(
+        self,
+        timeout: float,
+        max_step: float,
+        wait_step: Callable[[float], bool],
+    ) -> bool:
+        """
+        Calls ``wait_step`` with at most ``max_step`` seconds at a time, until
+        it returns True, ``timeout`` seconds pass, or the wait is interrupted.
+        """
+
+        deadline = time.monotonic() + timeout
+
+        while not self._interrupted():
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return False
+
+            if wait_step(min(max_step, remaining)):
+                return True
+
+        return False
+
+
+class RedisListWakeSource(WakeSource):
+    """
+    Wakes on a push to a Redis list (``BLPOP``).
+
+    Producers ``LPUSH``/``RPUSH`` a token to ``key`` after enqueuing work. The
+    list is a dedicated wake channel: each token is consumed by one worker.
+    """
+
+    def __init__(self, key: str, hub: str = "", max_await: float = 1):
+        """
+        Args:
+            key: The Redis list to block on.
+            hub: The ``redis`` hub name to use.
+            max_await: The longest a single ``BLPOP`` may block, in seconds.
+                ``BLPOP`` takes whole seconds, so steps are rounded up to at
+                least 1.
+        """
+
+        self.key = key
+        self.hub = hub
+        self.max_await = max_await
+
+    def wait(self, timeout: float) -> bool:
+        from .constants import redis
+
+        client = redis(self.hub)
+
+        return self._wait_in_steps(
+            timeout,
+            self.max_await,
+            # Redis < 6 rejects a fractional timeout, and 0 blocks forever.
+            lambda step: (
+                client.blpop([self.key], timeout=max(math.ceil(step), 1))
+                is not None
+            ),
+        )
+
+
+class RedisStreamWakeSource(WakeSource):
+    """
+    Wakes on a new entry in a Redis stream (``XREAD BLOCK``).
+
+    Entries are only read, never consumed, so every worker sees every signal.
+    """
+
+    def __init__(self, stream: str, hub: str = "", max_await: float = 1):
+        """
+        Args:
+            stream: The Redis stream to block on.
+            hub: The ``redis`` hub name to use.
+            max_await: The longest a single ``XREAD`` may block, in seconds.
+        """
+
+        self.stream = stream
+        self.hub = hub
+        self.max_await = max_await
+        self.__last_id = "$"
+
+    def wait(self, timeout: float) -> bool:
+        return self._wait_in_steps(timeout, self.max_await, self.__read)
+
+    def __read(self, timeout: float) -> bool:
+        from .constants import redis
+
+        response = redis(self.hub).xread(
+            {self.stream: self.__last_id},
+            count=1,
+            block=max(int(timeout * 1000), 1),
+        )
+
+        if not response:
+            return False
+
+        # [[stream, [(id, fields)]]] — only new entries wake us next time.
+        self.__last_id = response[-1][1][-1][0]
+
+        return True
+
+
+class PGNotifyWakeSource(WakeSource):
+    """
+    Wakes on a PostgreSQL ``NOTIFY`` on ``channel``.
+
+    Uses its own connection (resolved like the ``pg`` hub), since ``LISTEN``
+    needs autocommit and would otherwise steal the hub's notifications.
+    """
+
+    def __init__(self, channel: str, hub: str = "", max_await: float = 1):
+        """
+        Args:
+            channel: The channel to ``LISTEN`` on.
+            hub: The ``pg`` hub name whose DSN to use.
+            max_await: The longest a single ``select`` may block, in seconds.
+        """
+
+        self.channel = channel
+        self.hub = hub
+        self.max_await = max_await
+        self.__connection: Any = None
+
+    def __connect(self):
+        if self.__connection is not None and not self.__connection.closed:
+            return self.__connection
+
+        import psycopg2
+        from psycopg2 import sql
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        from .constants import pg
+
+        connection = psycopg2.connect(pg.dsn(self.hub))
+
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)),
+            )
+
+        self.__connection = connection
+
+        return connection
+
+    def wait(self, timeout: float) -> bool:
+        connection = self.__connect()
+
+        def notified(step: float) -> bool:
+            connection.poll()
+
+            if not connection.notifies and step > 0:
+                readable, _, _ = select.select([connection], [], [], step)
+
+                if readable:
+                    connection.poll()
+
+            woken = bool(connection.notifies)
+
+            connection.notifies.clear()
+
+            return woken
+
+        if timeout <= 0:
+            return notified(0)
+
+        return self._wait_in_steps(timeout, self.max_await, notified)
+
+    def close(self):
+        if self.__connection is not None:
+            try:
+                self.__connection.close()
+
+            except Exception:
+                pass
+
+            self.__connection = None
+
+
+class MongoChangeStreamWakeSource(WakeSource):
+    """
+    Wakes on a MongoDB change stream event.
+
+    Watches a collection (or a whole database when ``collection`` is None). The
+    stream stays open between waits and resumes where it left off.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        collection: Optional[str] = None,
+        hub: str = "",
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+        max_await: float = 1,
+    ):
+        """
+        Args:
+            database: The database to watch.
+            collection: The collection to watch, or None for the whole database.
+            hub: The ``mongo`` hub name to use.
+            pipeline: An optional aggregation pipeline to filter events.
+            max_await: The longest a single server round trip may block, in
+                seconds. Waits longer than this poll in steps of ``max_await``;
+                the last step only blocks for what's left of the wait (the
+                stream is reopened, resuming where it left off, to change it).
+        """
+
+        self.database = database
+        self.collection = collection
+        self.hub = hub
+        self.pipeline = pipeline or []
+        self.max_await = max_await
+        self.__stream: Any = None
+        self.__resume_token: Any = None
+        # The maxAwaitTimeMS the stream was opened with.
+        self.__await_ms = 0
+
+    def __open(self, await_ms: int):
+        if self.__stream is not None and self.__stream.alive:
+            if self.__await_ms == await_ms:
+                return self.__stream
+
+            # pymongo only takes the getMore's wait in `watch()`.
+            self.close()
+
+        from .constants import mongo
+
+        target = mongo(self.hub)[self.database]
+
+        if self.collection is not None:
+            target = target[self.collection]
+
+        self.__stream = target.watch(
+            self.pipeline,
+            max_await_time_ms=await_ms,
+            resume_after=self.__resume_token,
+        )
+        self.__await_ms = await_ms
+
+        return self.__stream
+
+    def wait(self, timeout: float) -> bool:
+        return self._wait_in_steps(timeout, self.max_await, self.__next)
+
+    def __next(self, timeout: float) -> bool:
+        stream = self.__open(max(int(timeout * 1000), 1))
+        change = stream.try_next()
+
+        self.__resume_token = stream.resume_token
+
+        return change is not None
+
+    def close(self):
+        if self.__stream is not None:
+            try:
+                self.__stream.close()
+
+            except Exception:
+                pass
+
+            self.__stream = None
@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+from l2l import AsyncLane, Lane
+
+from carabao.batch import AsyncBatchLane, BatchLane, abatched, batched
+
+
+def slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+
+        yield item
+
+
+def test_batched_without_max_wait_only_yields_full_lists():
+    assert [*batched(range(7), 3)] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batched_size_is_at_least_one():
+    assert [*batched("ab", 0)] == [["a"], ["b"]]
+
+
+def test_batched_with_max_wait_keeps_every_item_in_order():
+    assert [*batched(range(7), 3, max_wait=5)] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batched_hands_over_a_partial_list_after_max_wait():
+    batches = [*batched(slow(range(4), 0.15), 10, max_wait=0.05)]
+
+    assert [item for batch in batches for item in batch] == [0, 1, 2, 3]
+    assert len(batches) > 1
+
+
+def collect(iterable, size, max_wait=None):
+    async def run():
+        return [batch async for batch in abatched(iterable, size, max_wait)]
+
+    return asyncio.run(run())
+
+
+def test_abatched_reads_sync_iterables():
+    assert collect(range(5), 2) == [[0, 1], [2, 3], [4]]
+
+
+def test_abatched_hands_over_a_partial_list_after_max_wait():
+    async def trickle():
+        for item in range(4):
+            await asyncio.sleep(0.1)
+
+            yield item
+
+    batches = collect(trickle(), 10, max_wait=0.03)
+
+    assert [item for batch in batches for item in batch] == [0, 1, 2, 3]
+    assert len(batches) > 1
+
+
+class BatchTestSource(Lane):
+    def process(self, value):
+        yield from range(7)
+
+
+class BatchTestLists(BatchLane):
+    @classmethod
+    def batch_size(cls):
+        return 3
+
+    @classmethod
+    def max_wait(cls):
+        return 0
+
+
+class BatchTestMain(Lane):
+    lanes = {1: BatchTestSource, 2: BatchTestLists}
+
+
+def test_batch_lane_hands_over_lists_and_the_rest():
+    assert [*BatchTestMain().run()] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+class BatchTestTrickle(Lane):
+    def process(self, value):
+        for item in range(4):
+            time.sleep(0.15)
+
+            yield item
+
+
+class BatchTestTimedLists(BatchLane):
+    @classmethod
+    def batch_size(cls):
+        return 10
+
+    @classmethod
+    def max_wait(cls):
+        return 0.05
+
+
+class BatchTestTimedMain(Lane):
+    lanes = {1: BatchTestTrickle, 2: BatchTestTimedLists}
+
+
+def test_batch_lane_hands_over_a_partial_list_after_max_wait():
+    # Each item arrives after the list's first one has waited too long.
+    assert [*BatchTestTimedMain().run()] == [[0, 1], [2, 3]]
+
+
+class AsyncBatchTestSource(AsyncLane):
+    async def process(self, value):
+        for item in range(5):
+            yield item
+
+
+class AsyncBatchTestLists(AsyncBatchLane):
+    @classmethod
+    def batch_size(cls):
+        return 2
+
+    @classmethod
+    def max_wait(cls):
+        return 0
+
+
+class AsyncBatchTestMain(AsyncLane):
+    lanes = {1: AsyncBatchTestSource, 2: AsyncBatchTestLists}
+
+
+def test_async_batch_lane_hands_over_lists_and_the_rest():
+    async def run():
+        return [batch async for batch in await AsyncBatchTestMain().run()]
+
+    assert asyncio.run(run()) == [[0, 1], [2, 3], [4]]
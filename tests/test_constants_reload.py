@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from carabao.constants import C
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    for key in ("RELOAD_A", "RELOAD_B", "QUEUE_NAME", "POD_NAME"):
+        monkeypatch.delenv(key, raising=False)
+
+    C.reload_env()
+
+    yield tmp_path
+
+    for filepath in C.env_files():
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+    C.reload_env()
+    # What the tests cached from the process environment.
+    C._Constants__values.clear()
+
+
+def write(path, **values):
+    path.write_text("".join(f"{key}={value}\n" for key, value in values.items()))
+
+
+def test_reload_returns_only_the_changed_keys(env_dir):
+    write(env_dir / ".env", RELOAD_A="1", RELOAD_B="2")
+
+    assert C.reload_env() == {"RELOAD_A", "RELOAD_B"}
+
+    write(env_dir / ".env", RELOAD_A="1", RELOAD_B="3")
+
+    assert C.reload_env() == {"RELOAD_B"}
+    assert os.environ["RELOAD_B"] == "3"
+
+
+def test_reload_removes_what_the_files_no_longer_set(env_dir):
+    write(env_dir / ".env", RELOAD_A="1")
+    C.reload_env()
+
+    write(env_dir / ".env")
+
+    assert C.reload_env() == {"RELOAD_A"}
+    assert "RELOAD_A" not in os.environ
+
+
+def test_reload_keeps_the_process_environment(env_dir, monkeypatch):
+    monkeypatch.setenv("RELOAD_A", "process")
+    write(env_dir / ".env", RELOAD_A="file")
+
+    assert C.reload_env() == set()
+    assert os.environ["RELOAD_A"] == "process"
+
+
+def test_the_first_file_wins(env_dir):
+    write(env_dir / ".env.release", RELOAD_A="release")
+    write(env_dir / ".env", RELOAD_A="fallback", RELOAD_B="fallback")
+
+    C.reload_env()
+
+    assert os.environ["RELOAD_A"] == "release"
+    assert os.environ["RELOAD_B"] == "fallback"
+    assert C.loaded_env_files == [".env.release", ".env"]
+
+
+def test_reload_keeps_the_unchanged_cached_values(env_dir, monkeypatch):
+    monkeypatch.setenv("POD_NAME", "worker-2")
+    write(env_dir / ".env", RELOAD_A="1")
+    C.reload_env()
+
+    assert C.POD_INDEX == 2
+
+    # Not set by a file, so the reload doesn't read it again.
+    monkeypatch.setenv("POD_NAME", "worker-5")
+    write(env_dir / ".env", RELOAD_A="2")
+
+    assert C.reload_env() == {"RELOAD_A"}
+    assert C.POD_NAME == "worker-2"
+    assert C.POD_INDEX == 2
+
+
+def test_reload_forgets_the_derived_values(env_dir):
+    write(env_dir / ".env", QUEUE_NAME="A,B", POD_NAME="worker-1")
+    C.reload_env()
+
+    assert C.QUEUE_NAMES == ["A", "B"]
+    assert C.POD_INDEX == 1
+
+    write(env_dir / ".env", QUEUE_NAME="C", POD_NAME="worker-3")
+    C.reload_env()
+
+    assert C.QUEUE_NAMES == ["C"]
+    assert C.POD_INDEX == 3
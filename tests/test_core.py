@@ -0,0 +1,204 @@
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+LANES = """
+    import asyncio
+    import itertools
+    import sys
+
+    from l2l import AsyncLane, Lane
+
+    from carabao import Core
+
+    LOOPS = itertools.count()
+
+
+    class LoopId(AsyncLane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        async def process(self, value):
+            loop = asyncio.get_running_loop()
+
+            if not hasattr(loop, "test_id"):
+                loop.test_id = next(LOOPS)
+
+            print("loop", loop.test_id, flush=True)
+
+            yield
+
+
+    class Planned(Lane):
+        runs = 0
+
+        @classmethod
+        def primary(cls):
+            return True
+
+        @classmethod
+        def condition(cls, name):
+            if "match_primaries" in sys._getframe(1).f_code.co_name:
+                print("plan", flush=True)
+
+            return super().condition(name)
+
+        def process(self, value):
+            Planned.runs += 1
+
+            print("run", flush=True)
+
+            if Planned.runs == 2:
+                Core.clear_lane_cache()
+
+            yield
+
+
+    class CountA(Lane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        def process(self, value):
+            print("count a", flush=True)
+
+            yield
+
+
+    class CountB(Lane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        def process(self, value):
+            print("count b", flush=True)
+
+            yield
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "carabao.cfg").write_text("[directories]\nsettings = settings\n")
+    (tmp_path / "settings.py").write_text(
+        textwrap.dedent(
+            """
+            from carabao import Settings as S
+
+
+            class Settings(S):
+                LANE_DIRECTORIES = ["lanes"]
+            """
+        )
+    )
+    (tmp_path / "lanes").mkdir()
+    (tmp_path / "lanes" / "__init__.py").write_text("")
+    (tmp_path / "lanes" / "lanes.py").write_text(textwrap.dedent(LANES))
+
+    return tmp_path
+
+
+def serve(
+    project: Path,
+    queue: str,
+    stop_after: Optional[Tuple[str, int]] = None,
+    **env: str,
+):
+    """
+    Runs the queue; with ``stop_after=(prefix, count)``, it's stopped once it
+    printed ``count`` lines starting with ``prefix``.
+    """
+
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-c", "from carabao import Core; Core.start()"],
+        cwd=project,
+        env={
+            **os.environ,
+            "PYTHONPATH": str(SRC),
+            "QUEUE_NAME": queue,
+            "SINGLE_RUN": "False" if stop_after else "True",
+            "SLEEP_MIN": "0",
+            "SLEEP_MAX": "0",
+            "EXIT_DELAY": "0",
+            **env,
+        },
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+    assert process.stdout is not None
+
+    # Never hangs the suite.
+    deadline = threading.Timer(20, process.kill)
+    deadline.start()
+
+    try:
+        lines = []
+
+        if stop_after is not None:
+            prefix, count = stop_after
+
+            for line in process.stdout:
+                lines.append(line.strip())
+
+                if sum(line.startswith(prefix) for line in lines) >= count:
+                    process.send_signal(signal.SIGTERM)
+                    break
+
+        output, _ = process.communicate()
+
+    finally:
+        deadline.cancel()
+        process.kill()
+
+    return lines + output.splitlines()
+
+
+@pytest.mark.parametrize(
+    "persistent, loops",
+    [("True", 1), ("False", 3)],
+)
+def test_persistent_loop_is_kept_across_iterations(project, persistent, loops):
+    output = serve(
+        project,
+        "LOOP_ID",
+        stop_after=("loop", 3),
+        PERSISTENT_LOOP=persistent,
+    )
+    ids = [line for line in output if line.startswith("loop")]
+
+    assert len(set(ids[:3])) == loops
+
+
+@pytest.mark.parametrize("queue", ["COUNT_*", "COUNT_A, COUNT_B"])
+def test_one_process_serves_several_queues(project, queue):
+    output = serve(project, queue)
+
+    assert "count a" in output
+    assert "count b" in output
+    assert "loop 0" not in output
+
+
+def test_a_queue_pattern_without_matches_fails(project):
+    output = serve(project, "NOPE_*")
+
+    assert "ValueError: No lanes found for 'NOPE_*'!" in output
+
+
+def test_queue_plan_is_resolved_once_until_cleared(project):
+    output = serve(project, "PLANNED", stop_after=("run", 3))
+    events = [line for line in output if line in ("plan", "run")]
+
+    # Planned clears the lane cache on its second run.
+    assert events[:5] == ["plan", "run", "run", "plan", "run"]
@@ -0,0 +1,21 @@
+import threading
+
+from carabao import constants
+from carabao.constants import _fork
+
+
+def test_child_gets_a_fresh_pool_lock(monkeypatch):
+    pgpool = constants.pgpool
+    held = threading.Lock()
+
+    held.acquire()
+    monkeypatch.setattr(pgpool, "_PGPoolMeta__lock", held)
+
+    _fork._after_fork_in_child()
+
+    lock = pgpool._PGPoolMeta__lock
+
+    assert lock is not held
+    assert lock.acquire(blocking=False)
+
+    lock.release()
@@ -0,0 +1,76 @@
+import pytest
+
+from carabao.helpers.health import ClientProbe, HealthMonitor
+
+
+class FakeClient:
+    def __init__(self, up=True):
+        self.up = up
+        self.closed = False
+
+    def ping(self):
+        if not self.up:
+            raise ConnectionError("down")
+
+    def close(self):
+        self.closed = True
+
+
+def probe_of(clients):
+    return ClientProbe(
+        lambda: clients.append(FakeClient()) or clients[-1],
+        lambda client: client.ping(),
+    )
+
+
+def test_the_probe_client_is_kept_between_probes():
+    clients = []
+    probe = probe_of(clients)
+
+    probe()
+    probe()
+
+    assert len(clients) == 1
+    assert not clients[0].closed
+
+
+def test_a_failed_probe_reconnects_next_time():
+    clients = []
+    probe = probe_of(clients)
+
+    probe()
+    clients[0].up = False
+
+    with pytest.raises(ConnectionError):
+        probe()
+
+    probe()
+
+    assert clients[0].closed
+    assert len(clients) == 2
+
+
+def test_stopping_the_monitor_closes_the_probe_clients():
+    clients = []
+    monitor = HealthMonitor()
+    probe = probe_of(clients)
+
+    monitor.watch("Test", "localhost:1", probe)
+    monitor.probe("localhost:1")
+    monitor.stop()
+
+    assert clients[0].closed
+    assert monitor.state("localhost:1").up
+
+
+def test_a_replaced_probe_is_closed():
+    clients = []
+    monitor = HealthMonitor()
+    replaced = probe_of(clients)
+
+    monitor.watch("Test", "localhost:1", replaced)
+    monitor.probe("localhost:1")
+    monitor.watch("Test", "localhost:1", probe_of(clients))
+    monitor.stop()
+
+    assert clients[0].closed
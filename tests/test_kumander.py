@@ -0,0 +1,63 @@
+import threading
+from time import monotonic
+
+import pytest
+
+from carabao.helpers.kumander import Kumander
+
+
+@pytest.fixture
+def kumander(monkeypatch):
+    monkeypatch.setenv("UPTIME_KUMA_MIN_INTERVAL", "0.3")
+    monkeypatch.setenv("UPTIME_KUMA_COALESCE", "0")
+    monkeypatch.setattr(
+        "carabao.helpers.kumander.LOGGER_ERROR",
+        lambda message: None,
+    )
+
+    pushes = []
+    lock = threading.Lock()
+
+    def send(url, kind, addresses):
+        with lock:
+            pushes.append((url, addresses, monotonic()))
+
+    kumander = Kumander(send)
+    kumander.pushes = pushes
+
+    return kumander
+
+
+def test_a_held_back_push_does_not_block_other_urls(kumander):
+    kumander.ping("http://a", "MongoDB", "first")
+    kumander.ping("http://a", "MongoDB", "second")
+    kumander.ping("http://b", "MongoDB", "other")
+
+    assert kumander.flush(timeout=5)
+
+    assert [addresses for _, addresses, _ in kumander.pushes] == [
+        "first",
+        "other",
+        "second",
+    ]
+
+
+def test_pushes_to_one_url_keep_the_min_interval(kumander):
+    for index in range(3):
+        kumander.ping("http://a", "MongoDB", str(index))
+
+    assert kumander.flush(timeout=5)
+
+    times = [at for _, _, at in kumander.pushes]
+
+    assert [addresses for _, addresses, _ in kumander.pushes] == ["0", "1", "2"]
+    assert all(later - earlier >= 0.29 for earlier, later in zip(times, times[1:]))
+
+
+def test_identical_pings_are_coalesced(kumander, monkeypatch):
+    monkeypatch.setenv("UPTIME_KUMA_COALESCE", "60")
+
+    assert kumander.ping("http://a", "MongoDB", "host") is True
+    assert kumander.ping("http://a", "MongoDB", "host") is False
+    assert kumander.flush(timeout=5)
+    assert len(kumander.pushes) == 1
@@ -0,0 +1,87 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def run(code: str):
+    """Runs ``code`` in a fresh interpreter, where nothing was imported yet."""
+
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        env={"PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_import_does_not_load_the_drivers():
+    run(
+        """
+        import sys
+
+        import carabao
+        from carabao import constants
+
+        assert "pymongo" not in sys.modules
+        assert "redis" not in sys.modules
+        assert constants.loaded("mongo") is None
+        assert constants.loaded("redis") is None
+        """
+    )
+
+
+def test_first_access_loads_the_hub():
+    pytest.importorskip("pymongo")
+
+    run(
+        """
+        import sys
+
+        import carabao
+        from carabao import constants
+
+        hub = carabao.mongo
+
+        assert "pymongo" in sys.modules
+        assert constants.loaded("mongo") is hub
+        assert constants.mongo is hub
+        assert constants.loaded("redis") is None
+        """
+    )
+
+
+def test_importing_a_submodule_binds_its_hub():
+    pytest.importorskip("redis")
+
+    run(
+        """
+        import sys
+
+        import carabao.constants.redis
+        from carabao import constants
+
+        hub = constants.loaded("redis")
+
+        assert hub is sys.modules["carabao.constants.redis"].redis
+        assert constants.redis is hub
+        """
+    )
+
+
+def test_unknown_names_are_missing():
+    run(
+        """
+        from carabao import constants
+
+        assert getattr(constants, "nope", None) is None
+        assert constants.loaded("nope") is None
+        """
+    )
@@ -0,0 +1,148 @@
+import gc
+import json
+import sys
+import textwrap
+
+import pytest
+
+from carabao.manifest import LaneManifest
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "manifest_lanes"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+
+    files = {
+        "alpha.py": """
+            from l2l import Lane
+
+
+            class ManifestAlpha(Lane):
+                lanes = {1: "MANIFEST_HELPER"}
+
+                @classmethod
+                def primary(cls):
+                    return True
+
+                def process(self, value):
+                    yield value
+        """,
+        "helper.py": """
+            from l2l import Lane
+
+
+            class ManifestHelper(Lane):
+                def process(self, value):
+                    yield value
+        """,
+        "gamma.py": """
+            from l2l import Lane
+
+
+            class ManifestGamma(Lane):
+                @classmethod
+                def primary(cls):
+                    return True
+
+                def process(self, value):
+                    yield value
+        """,
+    }
+
+    for name, source in files.items():
+        (root / name).write_text(textwrap.dedent(source))
+
+    # Lane.load lists the folders relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    yield root
+
+    for name in [*sys.modules]:
+        if name.startswith("manifest_lanes"):
+            del sys.modules[name]
+
+    # The lane registry only holds weak references to the subclasses.
+    gc.collect()
+
+
+def manifest(tmp_path):
+    return LaneManifest(["manifest_lanes"], path=str(tmp_path / "manifest.json"))
+
+
+def test_load_is_false_without_a_manifest(package, tmp_path):
+    assert manifest(tmp_path).load(["MANIFEST_ALPHA"]) is False
+
+
+def test_build_records_the_lanes_of_each_module(package, tmp_path):
+    built = manifest(tmp_path).build()
+    modules = built["modules"]
+
+    assert modules["manifest_lanes.alpha"]["names"] == ["MANIFEST_ALPHA"]
+    assert modules["manifest_lanes.alpha"]["requires"] == ["manifest_lanes.helper"]
+    assert modules["manifest_lanes.helper"]["names"] == []
+    assert modules["manifest_lanes.gamma"]["always"] is False
+
+    with open(tmp_path / "manifest.json", encoding="utf-8") as file:
+        assert json.load(file) == built
+
+
+def test_load_imports_only_what_the_queues_need(package, tmp_path):
+    manifest(tmp_path).build()
+
+    for name in ("alpha", "helper", "gamma"):
+        sys.modules.pop(f"manifest_lanes.{name}", None)
+
+    assert manifest(tmp_path).load(["MANIFEST_A*"]) is True
+
+    assert "manifest_lanes.alpha" in sys.modules
+    assert "manifest_lanes.helper" in sys.modules
+    assert "manifest_lanes.gamma" not in sys.modules
+
+
+def test_an_edited_module_makes_the_manifest_stale(package, tmp_path):
+    manifest(tmp_path).build()
+
+    with open(package / "gamma.py", "a", encoding="utf-8") as file:
+        file.write("\n# edited\n")
+
+    assert manifest(tmp_path).load(["MANIFEST_ALPHA"]) is False
+
+
+def test_an_added_module_makes_the_manifest_stale(package, tmp_path):
+    manifest(tmp_path).build()
+
+    (package / "delta.py").write_text("")
+
+    assert manifest(tmp_path).load(["MANIFEST_ALPHA"]) is False
+
+
+def test_other_lane_directories_make_the_manifest_stale(package, tmp_path):
+    manifest(tmp_path).build()
+
+    other = LaneManifest(["elsewhere"], path=str(tmp_path / "manifest.json"))
+
+    assert other.load(["MANIFEST_ALPHA"]) is False
+
+
+def test_build_replaces_the_manifest_in_one_step(package, tmp_path, monkeypatch):
+    lanes = manifest(tmp_path)
+    built = lanes.build()
+
+    def failing(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json, "dump", failing)
+
+    lanes.build()
+
+    # The failed write neither truncated the manifest nor left a file behind.
+    with open(tmp_path / "manifest.json", encoding="utf-8") as file:
+        assert json.load(file) == built
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "manifest.json",
+        "manifest_lanes",
+    ]
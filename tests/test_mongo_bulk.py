@@ -0,0 +1,221 @@
+import importlib
+import threading
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo.errors import AutoReconnect, BulkWriteError  # noqa: E402
+
+from carabao.constants import MongoBulkWriter  # noqa: E402
+
+
+class FakeCollection:
+    def __init__(self, error=None):
+        self.error = error
+        self.written = []
+
+    def bulk_write(self, operations, ordered=True):
+        if self.error is not None:
+            raise self.error
+
+        self.written.extend(operations)
+
+
+class FakeClient:
+    def __init__(self, collections):
+        self.collections = collections
+
+    def __call__(self, name=""):
+        return self
+
+    def __getitem__(self, database):
+        return {
+            name.partition(".")[2]: collection
+            for name, collection in self.collections.items()
+            if name.partition(".")[0] == database
+        }
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    collections = {}
+    module = importlib.import_module("carabao.constants.mongo")
+
+    monkeypatch.setattr(module, "mongo", FakeClient(collections))
+
+    return collections
+
+
+def writer(**kwargs):
+    return MongoBulkWriter(size=100, max_wait=100, **kwargs)
+
+
+def rejected(*indexes):
+    return BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": index, "code": 11000, "errmsg": "duplicate key"}
+                for index in indexes
+            ]
+        }
+    )
+
+
+def test_flush_sends_each_collection(collections):
+    collections["db.a"] = FakeCollection()
+    collections["db.b"] = FakeCollection()
+    bulk = writer()
+
+    bulk.add("db.a", 1)
+    bulk.add("db.b", 2)
+    bulk.add("db.a", 3)
+
+    assert bulk.flush() == []
+    assert collections["db.a"].written == [1, 3]
+    assert collections["db.b"].written == [2]
+    assert len(bulk) == 0
+
+
+def test_add_flushes_a_full_collection(collections):
+    collections["db.a"] = FakeCollection()
+    bulk = MongoBulkWriter(size=2, max_wait=100)
+
+    bulk.add("db.a", 1)
+
+    assert collections["db.a"].written == []
+
+    bulk.add("db.a", 2)
+
+    assert collections["db.a"].written == [1, 2]
+
+
+def test_rejected_operations_are_reported(collections):
+    collections["db.a"] = FakeCollection(rejected(1))
+    reported = []
+    bulk = writer(on_error=reported.append)
+
+    bulk.add("db.a", "first")
+    bulk.add("db.a", "second")
+
+    errors = bulk.flush()
+
+    assert [error.operation for error in errors] == ["second"]
+    assert reported == errors
+    assert errors[0].code == 11000
+
+
+def test_a_failed_collection_is_requeued_and_raised_after_the_rest(collections):
+    collections["db.a"] = FakeCollection(rejected(0))
+    collections["db.b"] = FakeCollection(AutoReconnect("down"))
+    collections["db.c"] = FakeCollection()
+    reported = []
+    bulk = writer(on_error=reported.append)
+
+    bulk.add("db.a", "rejected")
+    bulk.add("db.b", "retried")
+    bulk.add("db.c", "sent")
+
+    with pytest.raises(AutoReconnect):
+        bulk.flush()
+
+    # Neither the rejection before the failure nor the write after it is lost.
+    assert [error.operation for error in reported] == ["rejected"]
+    assert collections["db.c"].written == ["sent"]
+    assert len(bulk) == 1
+
+    collections["db.b"].error = None
+
+    assert bulk.flush() == []
+    assert collections["db.b"].written == ["retried"]
+
+
+def test_collection_names_need_a_database():
+    with pytest.raises(ValueError):
+        writer().add("articles", 1)
+
+
+def test_write_concern_errors_are_reported(collections):
+    collections["db.a"] = FakeCollection(
+        BulkWriteError(
+            {
+                "writeErrors": [],
+                "writeConcernErrors": [
+                    {"code": 64, "errmsg": "waiting for replication"}
+                ],
+            }
+        )
+    )
+    bulk = writer()
+
+    bulk.add("db.a", 1)
+
+    errors = bulk.flush()
+
+    assert [(error.operation, error.code) for error in errors] == [(None, 64)]
+
+
+def test_the_lock_is_not_held_while_writing(collections):
+    bulk = writer()
+    added = []
+
+    class Slow(FakeCollection):
+        def bulk_write(self, operations, ordered=True):
+            # Another lane queues meanwhile; it would block on a held lock.
+            thread = threading.Thread(target=lambda: bulk.add("db.a", "newer"))
+            thread.start()
+            thread.join(1)
+            added.append(not thread.is_alive())
+            super().bulk_write(operations, ordered)
+
+    collections["db.a"] = Slow()
+
+    bulk.add("db.a", "first")
+    bulk.flush()
+
+    assert added == [True]
+    assert collections["db.a"].written == ["first"]
+    assert len(bulk) == 1
+
+
+def test_add_backs_off_a_failing_collection(collections):
+    calls = []
+
+    class Down(FakeCollection):
+        def bulk_write(self, operations, ordered=True):
+            calls.append(operations)
+            raise AutoReconnect("down")
+
+    collections["db.a"] = Down()
+    bulk = MongoBulkWriter(size=1, max_wait=100)
+
+    with pytest.raises(AutoReconnect):
+        bulk.add("db.a", 1)
+
+    # Full, but not retried until the backoff has passed.
+    bulk.add("db.a", 2)
+
+    assert len(calls) == 1
+    assert len(bulk) == 2
+
+
+def test_the_oldest_queued_operations_are_dropped(collections):
+    collections["db.a"] = FakeCollection(AutoReconnect("down"))
+    reported = []
+    bulk = MongoBulkWriter(size=2, max_wait=100, max_queued=3, on_error=reported.append)
+
+    bulk.add("db.a", 1)
+
+    with pytest.raises(AutoReconnect):
+        bulk.add("db.a", 2)
+
+    bulk.add("db.a", 3)
+    bulk.add("db.a", 4)
+
+    assert [error.operation for error in reported] == [1]
+    assert len(bulk) == 3
+
+    collections["db.a"].error = None
+    bulk.flush()
+
+    assert collections["db.a"].written == [2, 3, 4]
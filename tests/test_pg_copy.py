@@ -0,0 +1,149 @@
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from carabao.constants.pg_copy import (  # noqa: E402
+    CopyReader,
+    _chunks,
+    _encode,
+    copy_rows,
+)
+
+
+@pytest.mark.parametrize(
+    "value, encoded",
+    [
+        (None, "\\N"),
+        (True, "t"),
+        (False, "f"),
+        (12, "12"),
+        ("a\tb\nc\\d\re", "a\\tb\\nc\\\\d\\re"),
+        (b"\x00\xff", "\\\\x00ff"),
+        (memoryview(b"\x01"), "\\\\x01"),
+        ({"a": [1, "x"]}, '{"a": [1, "x"]}'),
+        (date(2024, 1, 2), "2024-01-02"),
+        (datetime(2024, 1, 2, 3, 4, 5), "2024-01-02T03:04:05"),
+    ],
+)
+def test_encode(value, encoded):
+    assert _encode(value) == encoded
+
+
+def test_reader_encodes_one_line_per_row():
+    reader = CopyReader([(1, "a"), (2, None)])
+
+    assert reader.read() == "1\ta\n2\t\\N\n"
+    assert reader.count == 2
+    assert reader.read() == ""
+
+
+def test_reader_reads_dict_rows_in_column_order():
+    reader = CopyReader([{"b": 2, "a": 1}, {"a": 3}], columns=["a", "b"])
+
+    assert reader.read() == "1\t2\n3\t\\N\n"
+
+
+def test_reader_does_not_stop_at_a_none_row():
+    reader = CopyReader([(1,), None, (3,)])
+
+    assert reader.readline() == "1\n"
+
+    with pytest.raises(TypeError):
+        reader.readline()
+
+
+def test_reader_needs_columns_for_dict_rows():
+    with pytest.raises(ValueError):
+        CopyReader([{"a": 1}]).read()
+
+
+def test_reader_sized_reads_lose_nothing():
+    rows = [(index, "x" * index) for index in range(20)]
+    expected = CopyReader(rows).read()
+    reader = CopyReader(rows)
+    parts = []
+
+    while True:
+        part = reader.read(7)
+
+        if not part:
+            break
+
+        assert len(part) <= 7
+
+        parts.append(part)
+
+    assert "".join(parts) == expected
+
+
+def test_chunks_are_lazy_slices():
+    consumed = []
+
+    def rows():
+        for index in range(5):
+            consumed.append(index)
+
+            yield (index,)
+
+    chunks = _chunks(iter(rows()), 2)
+    first = next(chunks)
+
+    assert consumed == [0]
+    assert [*first] == [(0,), (1,)]
+    assert [[*chunk] for chunk in chunks] == [[(2,), (3,)], [(4,)]]
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def copy_expert(self, statement, file):
+        data = ""
+
+        while True:
+            part = file.read(5)
+
+            if not part:
+                break
+
+            data += part
+
+        self.connection.copied.append(data)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    closed = False
+
+    def __init__(self):
+        self.copied = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_copy_rows_copies_and_commits_each_chunk():
+    connection = FakeConnection()
+    rows = ({"id": index, "name": f"n{index}"} for index in range(5))
+
+    assert copy_rows(connection, "articles", rows, chunk_size=2) == 5
+    assert connection.copied == ["0\tn0\n1\tn1\n", "2\tn2\n3\tn3\n", "4\tn4\n"]
+    assert connection.commits == 3
+
+
+def test_copy_rows_without_rows_copies_nothing():
+    connection = FakeConnection()
+
+    assert copy_rows(connection, "articles", []) == 0
+    assert connection.copied == []
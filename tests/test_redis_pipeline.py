@@ -0,0 +1,201 @@
+import asyncio
+
+import pytest
+
+from carabao.constants.redis_pipeline import AsyncAutoPipeline, AutoPipeline
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args))
+
+        return command
+
+    def reset(self):
+        self.commands = []
+
+    def execute(self, raise_on_error=True):
+        commands, self.commands = self.commands, []
+
+        self.client.sent.append(commands)
+
+        if self.client.fail is not None:
+            raise self.client.fail
+
+        return [self.client.reply(name, args) for name, args in commands]
+
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+        self.fail = None
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def reply(self, name, args):
+        if name == "boom":
+            return ValueError("WRONGTYPE")
+
+        return f"{name}:{args[0]}"
+
+    def get(self, key):
+        raise AssertionError("should be pipelined")
+
+    def boom(self, key):
+        raise AssertionError("should be pipelined")
+
+    def pubsub(self):
+        return "pubsub"
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self, raise_on_error=True):
+        return FakePipeline.execute(self, raise_on_error)
+
+
+class FakeAsyncClient(FakeClient):
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self)
+
+
+def test_results_are_read_after_one_round_trip():
+    client = FakeClient()
+    pipeline = AutoPipeline(client, max_commands=10)
+    first = pipeline.get("a")
+    second = pipeline.get("b")
+
+    assert not first.done
+    assert client.sent == []
+    assert first.value == "get:a"
+    assert second.done and second.value == "get:b"
+    assert len(client.sent) == 1
+
+
+def test_sends_once_max_commands_are_queued():
+    client = FakeClient()
+    pipeline = AutoPipeline(client, max_commands=2)
+
+    pipeline.get("a")
+    pipeline.get("b")
+    pipeline.get("c")
+
+    assert len(client.sent) == 1
+    assert len(pipeline) == 1
+
+
+def test_a_command_error_stays_in_its_result():
+    pipeline = AutoPipeline(FakeClient(), max_commands=10)
+    good = pipeline.get("a")
+    bad = pipeline.boom("b")
+
+    pipeline.flush()
+
+    assert good.value == "get:a"
+
+    with pytest.raises(ValueError):
+        bad.value
+
+
+def test_a_failed_send_fails_every_result():
+    client = FakeClient()
+    client.fail = ConnectionError("down")
+    pipeline = AutoPipeline(client, max_commands=10)
+    result = pipeline.get("a")
+
+    with pytest.raises(ConnectionError):
+        pipeline.flush()
+
+    with pytest.raises(ConnectionError):
+        result.value
+
+
+def test_with_block_sends_on_exit():
+    client = FakeClient()
+
+    with AutoPipeline(client, max_commands=10) as pipeline:
+        result = pipeline.get("a")
+
+    assert result.done and result.value == "get:a"
+
+
+def test_with_block_error_drops_the_commands_visibly():
+    client = FakeClient()
+
+    with pytest.raises(KeyError):
+        with AutoPipeline(client, max_commands=10) as pipeline:
+            result = pipeline.get("a")
+
+            raise KeyError("lane failed")
+
+    assert client.sent == []
+    assert result.done
+
+    with pytest.raises(RuntimeError):
+        result.value
+
+
+def test_passthrough_commands_flush_first():
+    client = FakeClient()
+    pipeline = AutoPipeline(client, max_commands=10)
+
+    pipeline.get("a")
+
+    assert pipeline.pubsub() == "pubsub"
+    assert len(client.sent) == 1
+
+
+def test_async_commands_are_coalesced():
+    client = FakeAsyncClient()
+
+    async def main():
+        pipeline = AsyncAutoPipeline(client, max_commands=10, window=0)
+
+        return await asyncio.gather(
+            pipeline.get("a"),
+            pipeline.get("b"),
+        )
+
+    assert asyncio.run(main()) == ["get:a", "get:b"]
+    assert len(client.sent) == 1
+
+
+def test_async_command_error_is_raised():
+    client = FakeAsyncClient()
+
+    async def main():
+        pipeline = AsyncAutoPipeline(client, max_commands=10, window=0)
+
+        return await pipeline.boom("a")
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_pipelined_returns_a_new_proxy_per_call(monkeypatch):
+    pytest.importorskip("redis")
+
+    from carabao.constants.async_redis import aredis
+    from carabao.constants.redis import redis
+
+    for hub, client in ((redis, FakeClient()), (aredis, FakeAsyncClient())):
+        monkeypatch.setattr(hub, "get", classmethod(lambda cls, name="": client))
+
+        first = hub.pipelined("cache", max_commands=5)
+
+        assert first is not hub.pipelined("cache")
+        assert first.client is client
+        assert first.max_commands == 5
+
+
+def test_hub_helpers_do_not_shadow_client_methods():
+    redis_py = pytest.importorskip("redis")
+
+    for name in ("pipelined", "bulk", "flush_bulk"):
+        assert not hasattr(redis_py.Redis, name)
+        assert not hasattr(redis_py.asyncio.Redis, name)
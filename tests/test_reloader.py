@@ -0,0 +1,93 @@
+import gc
+import sys
+import textwrap
+
+import pytest
+from l2l import Lane
+
+from carabao.reloader import reload_modules
+
+LANE = """
+    from l2l import Lane
+
+
+    class ReloadedLane(Lane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        def process(self, value):
+            yield {value!r}
+"""
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "reloader_lanes"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+
+    # Same-size rewrites within a second would reuse the stale bytecode.
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    yield root
+
+    for name in [*sys.modules]:
+        if name.startswith("reloader_lanes"):
+            del sys.modules[name]
+
+    # The lane registry only holds weak references to the subclasses.
+    gc.collect()
+
+
+def write(package, version):
+    (package / "lane.py").write_text(textwrap.dedent(LANE.format(value=version)))
+
+
+def run():
+    return [*Lane.start("RELOADED_LANE", print_lanes=False)]
+
+
+def test_a_held_old_class_stops_running_after_a_reload(package):
+    write(package, "v1")
+
+    from reloader_lanes.lane import ReloadedLane
+
+    old = ReloadedLane
+
+    assert run() == ["v1"]
+
+    write(package, "v2")
+
+    assert reload_modules(["reloader_lanes.lane"], ["reloader_lanes"]) == [
+        "reloader_lanes.lane"
+    ]
+    assert run() == ["v2"]
+    assert old not in Lane.all_lanes()
+
+
+def test_a_failed_reload_keeps_the_previous_version(package, capsys):
+    write(package, "v1")
+
+    import reloader_lanes.lane  # noqa: F401
+
+    (package / "lane.py").write_text("this is not python\n")
+
+    assert reload_modules(["reloader_lanes.lane"], ["reloader_lanes"]) == []
+    assert run() == ["v1"]
+
+
+def test_a_deleted_module_stops_running(package):
+    write(package, "v1")
+
+    from reloader_lanes.lane import ReloadedLane
+
+    old = ReloadedLane
+
+    (package / "lane.py").unlink()
+
+    reload_modules(["reloader_lanes.lane"], ["reloader_lanes"])
+
+    assert old not in Lane.all_lanes()
+    assert "reloader_lanes.lane" not in sys.modules
@@ -0,0 +1,98 @@
+import pytest
+
+from carabao.scheduler import (
+    MIN_BACKOFF_STEP,
+    AdaptiveScheduler,
+    QueueState,
+    UniformScheduler,
+    get_scheduler,
+)
+from carabao.stats import RunStats
+
+
+def adaptive(sleep_min: float, sleep_max: float, **kwargs):
+    return AdaptiveScheduler(
+        lambda: sleep_min,
+        lambda: sleep_max,
+        jitter=kwargs.pop("jitter", 0),
+        **kwargs,
+    )
+
+
+def test_adaptive_loops_right_away_after_work():
+    scheduler = adaptive(1, 8)
+
+    assert scheduler.next_delay(True) == 0
+
+
+def test_adaptive_backs_off_up_to_sleep_max():
+    scheduler = adaptive(1, 8)
+
+    assert [scheduler.next_delay(False) for _ in range(6)] == [1, 2, 4, 8, 8, 8]
+
+
+def test_adaptive_resets_after_work():
+    scheduler = adaptive(1, 8)
+
+    scheduler.next_delay(False)
+    scheduler.next_delay(False)
+    scheduler.next_delay(True)
+
+    assert scheduler.next_delay(False) == 1
+
+
+def test_adaptive_backs_off_with_zero_sleep_min():
+    scheduler = adaptive(0, 1)
+    delays = [scheduler.next_delay(False) for _ in range(6)]
+
+    assert delays[0] == MIN_BACKOFF_STEP
+    assert all(delay > 0 for delay in delays)
+    assert delays[-1] == 1
+
+
+def test_adaptive_jitter_stays_within_bounds():
+    scheduler = adaptive(1, 100, jitter=0.5, seed=3)
+
+    for step in range(6):
+        delay = scheduler.next_delay(False)
+
+        assert 2**step * 0.5 <= delay <= 2**step * 1.5
+
+
+def test_uniform_stays_between_sleep_min_and_max():
+    scheduler = UniformScheduler(lambda: 1, lambda: 2)
+
+    assert all(1 <= scheduler.next_delay(False) <= 2 for _ in range(20))
+
+
+def test_get_scheduler():
+    assert isinstance(
+        get_scheduler(" Adaptive ", lambda: 0, lambda: 1), AdaptiveScheduler
+    )
+    assert isinstance(get_scheduler("uniform", lambda: 0, lambda: 1), UniformScheduler)
+
+    with pytest.raises(ValueError):
+        get_scheduler("eager", lambda: 0, lambda: 1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"factor": 1}, {"factor": 0.5}, {"jitter": -0.1}, {"jitter": 1}],
+)
+def test_adaptive_rejects_out_of_range_settings(kwargs):
+    with pytest.raises(ValueError):
+        adaptive(1, 8, **kwargs)
+
+
+def test_queue_reschedules_from_its_stats():
+    queue = QueueState("Q", adaptive(1, 8))
+
+    queue.reschedule(10)
+
+    assert queue.due == 11
+
+    queue.stats = RunStats(items=1, truthy=1)
+
+    queue.reschedule(20)
+
+    assert queue.due == 20
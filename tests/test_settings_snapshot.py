@@ -0,0 +1,49 @@
+import pytest
+
+from carabao.settings import Settings
+
+
+class Custom(Settings):
+    SLEEP_MAX = 5
+    GREETING: str = "hi"
+
+
+@pytest.fixture(autouse=True)
+def no_env(monkeypatch):
+    monkeypatch.delenv("SLEEP_MAX", raising=False)
+
+
+def test_snapshot_holds_the_resolved_settings():
+    snapshot = Custom.refresh()
+
+    assert snapshot.SLEEP_MAX == 5
+    assert snapshot.GREETING == "hi"
+    assert Custom.snapshot() is snapshot
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_snapshot_is_read_only():
+    snapshot = Custom.snapshot()
+
+    with pytest.raises(AttributeError):
+        snapshot.SLEEP_MAX = 10
+
+    with pytest.raises(AttributeError):
+        del snapshot.GREETING
+
+    assert snapshot.SLEEP_MAX == 5
+
+
+def test_refresh_replaces_the_snapshot(monkeypatch):
+    snapshot = Custom.refresh()
+
+    monkeypatch.setattr(Custom, "SLEEP_MAX", 7)
+
+    assert Custom.snapshot() is snapshot
+    assert snapshot.SLEEP_MAX == 5
+
+    refreshed = Custom.refresh()
+
+    assert refreshed is not snapshot
+    assert refreshed.SLEEP_MAX == 7
+    assert Custom.snapshot() is refreshed
@@ -0,0 +1,149 @@
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="Sends POSIX signals.",
+)
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+LANES = """
+    import asyncio
+    import time
+
+    from l2l import AsyncLane, Lane
+
+
+    class Stepper(Lane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        def process(self, value):
+            try:
+                for i in range(3):
+                    print("item", i, flush=True)
+                    time.sleep(0.3)
+                    yield i
+
+            finally:
+                print("closed", flush=True)
+
+
+    class AStepper(AsyncLane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        async def process(self, value):
+            try:
+                for i in range(3):
+                    print("item", i, flush=True)
+                    await asyncio.sleep(0.3)
+                    yield i
+
+            finally:
+                print("closed", flush=True)
+
+
+    class Stuck(Lane):
+        @classmethod
+        def primary(cls):
+            return True
+
+        def process(self, value):
+            print("item", 0, flush=True)
+            time.sleep(60)
+            yield 0
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "carabao.cfg").write_text("[directories]\nsettings = settings\n")
+    (tmp_path / "settings.py").write_text(
+        textwrap.dedent(
+            """
+            from carabao import Settings as S
+
+
+            class Settings(S):
+                LANE_DIRECTORIES = ["lanes"]
+            """
+        )
+    )
+    (tmp_path / "lanes").mkdir()
+    (tmp_path / "lanes" / "__init__.py").write_text("")
+    (tmp_path / "lanes" / "steps.py").write_text(textwrap.dedent(LANES))
+
+    return tmp_path
+
+
+def serve(project: Path, queue: str, **env: str):
+    """Starts the queue, signals it once it is on its first item and waits."""
+
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-c", "from carabao import Core; Core.start()"],
+        cwd=project,
+        env={
+            **os.environ,
+            "PYTHONPATH": str(SRC),
+            "QUEUE_NAME": queue,
+            "SINGLE_RUN": "False",
+            "SLEEP_MIN": "0",
+            "SLEEP_MAX": "0",
+            **env,
+        },
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+    assert process.stdout is not None
+
+    # Never hangs the suite, even if the item never starts.
+    deadline = threading.Timer(20, process.kill)
+    deadline.start()
+
+    try:
+        lines = []
+
+        for line in process.stdout:
+            lines.append(line.strip())
+
+            if line.startswith("item 0"):
+                process.send_signal(signal.SIGTERM)
+                break
+
+        output, _ = process.communicate()
+
+    finally:
+        deadline.cancel()
+        process.kill()
+
+    return lines + output.splitlines()
+
+
+@pytest.mark.parametrize("queue", ["STEPPER", "A_STEPPER"])
+def test_a_stop_drains_at_the_next_item(project, queue):
+    output = serve(project, queue)
+
+    # The item it was on finishes; the rest, and any new iteration, don't run.
+    assert "item 1" not in output
+    assert "closed" in output
+    assert "Stopped." in output
+
+
+def test_a_stuck_item_is_interrupted_at_the_deadline(project):
+    output = serve(project, "STUCK", SHUTDOWN_TIMEOUT="0.5")
+
+    assert "Shutdown deadline exceeded, interrupting the iteration." in output
+    assert "Stopped." in output
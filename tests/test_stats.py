@@ -0,0 +1,52 @@
+from lazy_main import Terminate
+
+from carabao.stats import RunStats
+
+
+def test_add_counts_items_and_truthy_results():
+    stats = RunStats()
+
+    for value in (1, 0, None, "x", []):
+        stats.add(value)
+
+    assert stats.items == 5
+    assert stats.truthy == 2
+    assert stats.worked
+
+
+def test_falsy_results_are_not_work():
+    stats = RunStats()
+
+    stats.add(None)
+    stats.add(False)
+
+    assert not stats.worked
+
+
+def test_only_bytes_like_results_are_measured():
+    stats = RunStats()
+
+    stats.add(b"abc")
+    stats.add(bytearray(b"de"))
+    stats.add(memoryview(b"\x00" * 8).cast("I"))
+    stats.add("héllo")
+
+    assert stats.bytes == 3 + 2 + 8
+
+
+def test_terminate_is_recorded():
+    stats = RunStats()
+
+    stats.add(Terminate)
+
+    assert stats.terminated
+
+
+def test_merge_adds_up():
+    first = RunStats(items=1, truthy=1, errors=2, bytes=3)
+    second = RunStats(items=4, truthy=0, errors=1, bytes=5, terminated=True)
+
+    first.merge(second)
+
+    assert first == RunStats(items=5, truthy=1, errors=3, bytes=8, terminated=True)
+    assert str(first) == "5 items, 3 errors, 8 bytes"
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from carabao.supervisor import Supervisor
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"),
+    reason="Forks the workers.",
+)
+
+
+def test_on_started_runs_in_the_parent_after_forking(tmp_path):
+    marks = tmp_path / "marks"
+
+    def target(index):
+        with open(marks, "a") as file:
+            file.write(f"worker {index}\n")
+
+    def on_started():
+        with open(marks, "a") as file:
+            file.write(f"started {os.getpid()}\n")
+
+    Supervisor(2, target, on_started=on_started).run()
+
+    lines = marks.read_text().splitlines()
+
+    assert f"started {os.getpid()}" in lines
+    assert sorted(line for line in lines if line.startswith("worker")) == [
+        "worker 0",
+        "worker 1",
+    ]
@@ -0,0 +1,166 @@
+import threading
+import time
+
+import pytest
+
+from carabao import constants
+from carabao.wake import MongoChangeStreamWakeSource, RedisListWakeSource, WakeSource
+
+
+class StepSource(WakeSource):
+    def __init__(self, wake_at=None):
+        self.steps = []
+        self.wake_at = wake_at
+
+    def wait(self, timeout):
+        return self._wait_in_steps(timeout, 0.05, self.step)
+
+    def step(self, timeout):
+        self.steps.append(timeout)
+
+        if self.wake_at is not None and len(self.steps) >= self.wake_at:
+            return True
+
+        time.sleep(timeout)
+
+        return False
+
+
+def test_steps_never_exceed_max_step_or_the_time_left():
+    source = StepSource()
+
+    assert source.wait(0.12) is False
+    assert all(0 < step <= 0.05 for step in source.steps)
+    assert source.steps[-1] < 0.05
+    assert sum(source.steps) <= 0.12 + 0.01
+
+
+def test_a_step_that_wakes_ends_the_wait():
+    source = StepSource(wake_at=2)
+
+    assert source.wait(10) is True
+    assert len(source.steps) == 2
+
+
+def test_the_interrupt_ends_the_wait_between_steps():
+    source = StepSource()
+    source.interrupt = threading.Event()
+
+    threading.Timer(0.1, source.interrupt.set).start()
+
+    started = time.monotonic()
+
+    assert source.wait(10) is False
+    assert time.monotonic() - started < 1
+
+
+def test_no_wait_once_interrupted():
+    source = StepSource()
+    source.interrupt = threading.Event()
+    source.interrupt.set()
+
+    assert source.wait(10) is False
+    assert source.steps == []
+
+
+class FakeStream:
+    resume_token = "token"
+
+    def __init__(self, max_await_time_ms, resume_after):
+        self.max_await_time_ms = max_await_time_ms
+        self.resume_after = resume_after
+        self.alive = True
+
+    def try_next(self):
+        time.sleep(self.max_await_time_ms / 1000)
+
+        return None
+
+    def close(self):
+        self.alive = False
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.streams = []
+
+    def watch(self, pipeline, max_await_time_ms, resume_after):
+        stream = FakeStream(max_await_time_ms, resume_after)
+
+        self.streams.append(stream)
+
+        return stream
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+
+    monkeypatch.setattr(
+        constants,
+        "mongo",
+        lambda name="": {"db": database},
+        raising=False,
+    )
+
+    return database
+
+
+def test_change_stream_round_trips_are_capped_at_the_time_left(database):
+    source = MongoChangeStreamWakeSource("db", max_await=0.2)
+
+    assert source.wait(0.25) is False
+
+    awaits = [stream.max_await_time_ms for stream in database.streams]
+
+    assert awaits[0] == 200
+    assert all(ms <= 200 for ms in awaits)
+    assert sum(awaits) <= 260
+
+
+def test_change_stream_reopens_where_it_left_off(database):
+    source = MongoChangeStreamWakeSource("db", max_await=0.2)
+
+    source.wait(0.25)
+
+    first, *reopened = database.streams
+
+    # A shorter last step needs a new stream, resumed from the old one.
+    assert reopened
+    assert first.resume_after is None
+    assert all(stream.resume_after == "token" for stream in reopened)
+    assert not any(stream.alive for stream in database.streams[:-1])
+
+
+class FakeRedis:
+    def __init__(self):
+        self.timeouts = []
+
+    def blpop(self, keys, timeout):
+        self.timeouts.append(timeout)
+
+        return (keys[0], b"token")
+
+
+@pytest.mark.parametrize(
+    ("max_await", "timeout"),
+    [(0.05, 1), (2.5, 3)],
+)
+def test_blpop_timeouts_are_whole_seconds(monkeypatch, max_await, timeout):
+    client = FakeRedis()
+
+    monkeypatch.setattr(constants, "redis", lambda name="": client, raising=False)
+
+    assert RedisListWakeSource("wake", max_await=max_await).wait(10) is True
+    assert client.timeouts == [timeout]
+    assert isinstance(client.timeouts[0], int)
+
+
+def test_pg_resolves_the_dsn_without_connecting(monkeypatch):
+    pytest.importorskip("psycopg2")
+
+    from carabao.constants import pg
+
+    monkeypatch.setenv("PG_WAKE_TEST", "postgresql://localhost/wake")
+
+    assert pg.dsn("WAKE_TEST") == "postgresql://localhost/wake"